@@ -3,6 +3,7 @@
 set -e
 
 JSON_MODE=false
+FETCH=true
 SHORT_NAME=""
 BRANCH_NUMBER=""
 ARGS=()
@@ -40,13 +41,17 @@ while [ $i -le $# ]; do
             fi
             BRANCH_NUMBER="$next_arg"
             ;;
+        --no-fetch)
+            FETCH=false
+            ;;
         --help|-h) 
-            echo "Usage: $0 [--json] [--short-name <name>] [--number N] <feature_description>"
+            echo "Usage: $0 [--json] [--short-name <name>] [--number N] [--no-fetch] <feature_description>"
             echo ""
             echo "Options:"
             echo "  --json              Output in JSON format"
             echo "  --short-name <name> Provide a custom short name (2-4 words) for the branch"
             echo "  --number N          Specify branch number manually (overrides auto-detection)"
+            echo "  --no-fetch          Number from the remote branches of the last fetch instead of fetching"
             echo "  --help, -h          Show this help message"
             echo ""
             echo "Examples:"
@@ -63,7 +68,7 @@ done
 
 FEATURE_DESCRIPTION="${ARGS[*]}"
 if [ -z "$FEATURE_DESCRIPTION" ]; then
-    echo "Usage: $0 [--json] [--short-name <name>] [--number N] <feature_description>" >&2
+    echo "Usage: $0 [--json] [--short-name <name>] [--number N] [--no-fetch] <feature_description>" >&2
     exit 1
 fi
 
@@ -84,9 +89,6 @@ find_repo_root() {
 check_existing_branches() {
     local short_name="$1"
     
-    # Fetch all remotes to get latest branch info (suppress errors if no remotes)
-    git fetch --all --prune 2>/dev/null || true
-    
     # Find all branches matching the pattern using git ls-remote (more reliable)
     local remote_branches=$(git ls-remote --heads origin 2>/dev/null | grep -E "refs/heads/[0-9]+-${short_name}$" | sed 's/.*\/\([0-9]*\)-.*/\1/' | sort -n)
     
@@ -189,53 +191,68 @@ else
     BRANCH_SUFFIX=$(generate_branch_name "$FEATURE_DESCRIPTION")
 fi
 
-# Determine branch number
-if [ -z "$BRANCH_NUMBER" ]; then
-    if [ "$HAS_GIT" = true ]; then
-        # Check existing branches on remotes
-        BRANCH_NUMBER=$(check_existing_branches "$BRANCH_SUFFIX")
-    else
-        # Fall back to local directory check
-        HIGHEST=0
-        if [ -d "$SPECS_DIR" ]; then
-            for dir in "$SPECS_DIR"/*; do
-                [ -d "$dir" ] || continue
-                dirname=$(basename "$dir")
-                number=$(echo "$dirname" | grep -o '^[0-9]\+' || echo "0")
-                number=$((10#$number))
-                if [ "$number" -gt "$HIGHEST" ]; then HIGHEST=$number; fi
-            done
-        fi
-        BRANCH_NUMBER=$((HIGHEST + 1))
-    fi
-fi
-
-FEATURE_NUM=$(printf "%03d" "$BRANCH_NUMBER")
-BRANCH_NAME="${FEATURE_NUM}-${BRANCH_SUFFIX}"
-
 # GitHub enforces a 244-byte limit on branch names
-# Validate and truncate if necessary
+# Validate and truncate the suffix if necessary
+# Account for: feature number (3) + hyphen (1) = 4 chars
 MAX_BRANCH_LENGTH=244
-if [ ${#BRANCH_NAME} -gt $MAX_BRANCH_LENGTH ]; then
-    # Calculate how much we need to trim from suffix
-    # Account for: feature number (3) + hyphen (1) = 4 chars
-    MAX_SUFFIX_LENGTH=$((MAX_BRANCH_LENGTH - 4))
-    
+MAX_SUFFIX_LENGTH=$((MAX_BRANCH_LENGTH - 4))
+if [ ${#BRANCH_SUFFIX} -gt $MAX_SUFFIX_LENGTH ]; then
     # Truncate suffix at word boundary if possible
     TRUNCATED_SUFFIX=$(echo "$BRANCH_SUFFIX" | cut -c1-$MAX_SUFFIX_LENGTH)
     # Remove trailing hyphen if truncation created one
     TRUNCATED_SUFFIX=$(echo "$TRUNCATED_SUFFIX" | sed 's/-$//')
-    
-    ORIGINAL_BRANCH_NAME="$BRANCH_NAME"
-    BRANCH_NAME="${FEATURE_NUM}-${TRUNCATED_SUFFIX}"
-    
+
     >&2 echo "[specify] Warning: Branch name exceeded GitHub's 244-byte limit"
-    >&2 echo "[specify] Original: $ORIGINAL_BRANCH_NAME (${#ORIGINAL_BRANCH_NAME} bytes)"
-    >&2 echo "[specify] Truncated to: $BRANCH_NAME (${#BRANCH_NAME} bytes)"
+    >&2 echo "[specify] Original suffix: $BRANCH_SUFFIX (${#BRANCH_SUFFIX} bytes)"
+    >&2 echo "[specify] Truncated to: $TRUNCATED_SUFFIX (${#TRUNCATED_SUFFIX} bytes)"
+    BRANCH_SUFFIX="$TRUNCATED_SUFFIX"
+fi
+
+# Fetch all remotes to get latest branch info (suppress errors if no remotes),
+# so a number taken on a branch pushed from elsewhere is not handed out again
+if [ "$HAS_GIT" = true ] && [ -z "$BRANCH_NUMBER" ] && [ "$FETCH" = true ]; then
+    git fetch --all --prune 2>/dev/null || true
+fi
+
+ALLOCATOR="$REPO_ROOT/.specify/scripts/generate_all_docs.py"
+if command -v python3 >/dev/null 2>&1 && [ -f "$ALLOCATOR" ]; then
+    # Claims the next number not used by specs/ or any branch and creates specs/NNN-suffix/
+    # under a lock, so features created at the same time never share a number
+    BRANCH_NAME=$(python3 "$ALLOCATOR" allocate "$BRANCH_SUFFIX" ${BRANCH_NUMBER:+--number "$BRANCH_NUMBER"})
+    FEATURE_NUM="${BRANCH_NAME%%-*}"
+    ALLOCATED=true
+else
+    # Determine branch number
+    if [ -z "$BRANCH_NUMBER" ]; then
+        if [ "$HAS_GIT" = true ]; then
+            # Check existing branches on remotes
+            BRANCH_NUMBER=$(check_existing_branches "$BRANCH_SUFFIX")
+        else
+            # Fall back to local directory check
+            HIGHEST=0
+            if [ -d "$SPECS_DIR" ]; then
+                for dir in "$SPECS_DIR"/*; do
+                    [ -d "$dir" ] || continue
+                    dirname=$(basename "$dir")
+                    number=$(echo "$dirname" | grep -o '^[0-9]\+' || echo "0")
+                    number=$((10#$number))
+                    if [ "$number" -gt "$HIGHEST" ]; then HIGHEST=$number; fi
+                done
+            fi
+            BRANCH_NUMBER=$((HIGHEST + 1))
+        fi
+    fi
+
+    FEATURE_NUM=$(printf "%03d" "$BRANCH_NUMBER")
+    BRANCH_NAME="${FEATURE_NUM}-${BRANCH_SUFFIX}"
 fi
 
 if [ "$HAS_GIT" = true ]; then
-    git checkout -b "$BRANCH_NAME"
+    if ! git checkout -b "$BRANCH_NAME"; then
+        # Give back the number the allocator claimed
+        if [ "${ALLOCATED:-false}" = true ]; then rmdir "$SPECS_DIR/$BRANCH_NAME" 2>/dev/null || true; fi
+        exit 1
+    fi
 else
     >&2 echo "[specify] Warning: Git repository not detected; skipped branch creation for $BRANCH_NAME"
 fi
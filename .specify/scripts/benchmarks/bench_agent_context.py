@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Benchmark: `generate_all_docs.py agent-context` vs update-agent-context.sh
+
+Every scenario (a plan.md plus a set of pre-existing agent files) is run in
+two identical throwaway git repositories, once through the shell script and
+once through the Python subcommand. All agent files must come out
+byte-identical and both must exit with the same status. Scenarios cover
+new files from the template, updates of existing files (including the
+double AGENTS.md update), sed/grep special characters in plan values,
+missing or unclear fields, CRLF lines and files without a final newline.
+
+Then both are timed on a typical update of all agent files, plus the
+Python port called in process (what remains once interpreter startup is
+paid elsewhere, e.g. by a long-running caller). Processes are counted from
+the kernel's last allocated PID (/proc/loadavg), so fork()s of bash
+subshells are counted as well as exec()s; other activity on the machine
+adds noise, and the lowest count over the repeats is kept. --fork-ms adds
+a modelled cost per process, for systems where process creation is slow
+(macOS, WSL, antivirus hooks).
+
+Usage:
+    python3 .specify/scripts/benchmarks/bench_agent_context.py [--repeat N] [--fork-ms MS]
+"""
+
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+SPECIFY_DIR = SCRIPTS_DIR.parent
+GENERATOR = SCRIPTS_DIR / "generate_all_docs.py"
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+from speckit.agent_context import update_agent_context  # noqa: E402
+
+FEATURE = "007-agent-context"
+
+AGENT_FILES = (
+    "CLAUDE.md", "GEMINI.md", ".github/copilot-instructions.md", ".cursor/rules/specify-rules.mdc",
+    "QWEN.md", "AGENTS.md", ".windsurf/rules/specify-rules.md", ".kilocode/rules/specify-rules.md",
+    ".augment/rules/specify-rules.md", ".roo/rules/specify-rules.md", "CODEBUDDY.md",
+)
+
+EXISTING = """# demo Development Guidelines
+
+Auto-generated from all feature plans. **Last updated**: 2024-01-02 (was 2023-12-31)
+
+## Active Technologies
+- Python 3.10 (001-first)
+
+## Project Structure
+src/
+
+## Recent Changes
+- 003-third: Added Go
+- 002-second: Added Rust
+- 001-first: Added Python 3.10
+-n
+
+<!-- MANUAL ADDITIONS START -->
+<!-- MANUAL ADDITIONS END -->
+"""
+
+# Recent Changes right after Active Technologies, CRLF lines, no final newline
+QUIRKY = ("## Active Technologies\r\n## Active Technologies\n- Go 1.22 (002-x)\n## Recent Changes\n"
+          "- 002-x: Added Go\n-e\n\n## Recent Changes\n- a\n- b\n- c\n## Other\ntext")
+
+NO_SECTIONS = "# Guidelines\n\nNothing generated here yet.\n"
+
+def plan_text(lang: Optional[str], framework: Optional[str], db: Optional[str], project_type: Optional[str]) -> str:
+    """A plan.md with the Technical Context fields the agent files are built from"""
+    lines = ["# Implementation Plan: Agent context", "", "## Technical Context", ""]
+    for field, value in (("Language/Version", lang), ("Primary Dependencies", framework),
+                         ("Storage", db), ("Project Type", project_type)):
+        if value is not None:
+            lines.append(f"**{field}**: {value}")
+    return "\n".join(lines) + "\n"
+
+# (name, plan fields, agent argument, {agent file: content})
+SCENARIOS: List[Tuple[str, Tuple, Optional[str], Dict[str, str]]] = [
+    ("new default file", ("Python 3.11", "FastAPI", "PostgreSQL 15", "web"), None, {}),
+    ("new file, TypeScript", ("TypeScript 5.3 / Node.js 20", "NestJS 10.3+ (Express)", "N/A", "single"),
+     "copilot", {}),
+    ("new file, Rust, no framework", ("Rust 1.75", None, None, None), "gemini", {}),
+    ("new file, sed specials", ("C++ [gcc 13] & friends", "Qt*6.{5} $HOME ^x", "SQLite\\n3", "web app"),
+     "cursor-agent", {}),
+    ("new file, case escapes", ("Go \\Upper \\lx", "chi", None, None), "qwen", {}),
+    ("new file, unescaped pipe", ("Go 1.22 | TinyGo", "chi", None, None), "windsurf", {}),
+    ("new file, unclear fields", ("NEEDS CLARIFICATION", "N/A", "NEEDS CLARIFICATION", None), "roo", {}),
+    ("update all existing", ("Python 3.11", "FastAPI", "PostgreSQL 15", "web"), None,
+     {"CLAUDE.md": EXISTING, "AGENTS.md": EXISTING, ".roo/rules/specify-rules.md": EXISTING}),
+    ("update, already listed", ("Python 3.10", None, "Redis 7", None), "claude",
+     {"CLAUDE.md": EXISTING.replace("Python 3.10 (001", "Python 3.10 (001-first)\n- Redis 7 (001")}),
+    ("update, regex stack", ("Python 3.1.", "a[b", "C*", None), None, {"GEMINI.md": EXISTING}),
+    ("update, quirky file", ("Kotlin 2.0", "Ktor", "MongoDB", None), "codebuddy", {"CODEBUDDY.md": QUIRKY}),
+    ("update, no sections", ("Elixir 1.16", "Phoenix", "N/A", None), "auggie",
+     {".augment/rules/specify-rules.md": NO_SECTIONS}),
+    ("db only", (None, None, "DynamoDB", None), None, {"QWEN.md": EXISTING}),
+    ("unknown agent", ("Python 3.11", None, None, None), "nope", {}),
+]
+
+def make_repo(root: Path, plan: str, files: Dict[str, str]) -> Path:
+    """A git repository with the script, the agent template, one feature and agent files"""
+    bash_dir = root / ".specify" / "scripts" / "bash"
+    bash_dir.mkdir(parents=True)
+    for name in ("update-agent-context.sh", "common.sh"):
+        shutil.copy2(SPECIFY_DIR / "scripts" / "bash" / name, bash_dir / name)
+    templates = root / ".specify" / "templates"
+    templates.mkdir()
+    shutil.copy2(SPECIFY_DIR / "templates" / "agent-file-template.md", templates)
+    feature_dir = root / "specs" / FEATURE
+    feature_dir.mkdir(parents=True)
+    (feature_dir / "plan.md").write_text(plan)
+    for relative, content in files.items():
+        path = root / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', newline='') as f:
+            f.write(content)
+    subprocess.run(["git", "init", "-q", "-b", FEATURE], cwd=root, check=True)
+    return root
+
+def snapshot(root: Path) -> Dict[str, bytes]:
+    """Contents of every agent file in the repository"""
+    return {relative: (root / relative).read_bytes() for relative in AGENT_FILES if (root / relative).exists()}
+
+def last_pid() -> int:
+    with open("/proc/loadavg") as f:
+        return int(f.read().split()[-1])
+
+def run(command: List[str], cwd: Path) -> Tuple[int, float, int]:
+    """Run a command, returning (exit status, wall ms, processes created)"""
+    env = dict(os.environ, SPECIFY_FEATURE=FEATURE)
+    before = last_pid()
+    start = time.perf_counter()
+    proc = subprocess.run(command, cwd=cwd, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    elapsed = time.perf_counter() - start
+    # The benchmark's own fork of the command is not counted
+    return proc.returncode, elapsed * 1000, max(0, last_pid() - before - 1)
+
+def run_in_process(root: Path) -> Tuple[int, float, int]:
+    """update_agent_context() in this interpreter, with the same environment as run()"""
+    cwd, feature = os.getcwd(), os.environ.get("SPECIFY_FEATURE")
+    os.chdir(root)
+    os.environ["SPECIFY_FEATURE"] = FEATURE
+    try:
+        before = last_pid()
+        start = time.perf_counter()
+        code = update_agent_context(None, root, out=lambda line: None, err=lambda line: None)
+        elapsed = time.perf_counter() - start
+        return code, elapsed * 1000, last_pid() - before
+    finally:
+        os.chdir(cwd)
+        if feature is None:
+            del os.environ["SPECIFY_FEATURE"]
+        else:
+            os.environ["SPECIFY_FEATURE"] = feature
+
+def commands(agent: Optional[str]) -> Tuple[List[str], List[str]]:
+    """The shell and Python command lines for an agent argument"""
+    args = [agent] if agent else []
+    return (["bash", ".specify/scripts/bash/update-agent-context.sh", *args],
+            [sys.executable, str(GENERATOR), "agent-context", *args])
+
+def check_scenarios(tmp: Path) -> int:
+    """Run every scenario both ways and report differences"""
+    failures = 0
+    for i, (name, fields, agent, files) in enumerate(SCENARIOS):
+        shell_cmd, python_cmd = commands(agent)
+        results = []
+        for label, command in (("shell", shell_cmd), ("python", python_cmd)):
+            # Same directory name on both sides: it becomes the project name
+            root = make_repo(tmp / label / str(i) / "demo", plan_text(*fields), files)
+            code, _, _ = run(command, root)
+            results.append((code, snapshot(root)))
+        if results[0] == results[1]:
+            print(f"✅ {name} (exit {results[0][0]}, {len(results[0][1])} file(s))")
+            continue
+        failures += 1
+        print(f"❌ {name}: exit {results[0][0]} vs {results[1][0]}")
+        for relative in sorted(set(results[0][1]) | set(results[1][1])):
+            shell, python = results[0][1].get(relative), results[1][1].get(relative)
+            if shell != python:
+                print(f"   {relative}:\n     shell:  {shell!r}\n     python: {python!r}")
+    return failures
+
+def main(argv: List[str] = None) -> int:
+    """Check equivalence, then compare latency and process counts"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=10, help="timed runs per implementation (best is kept)")
+    parser.add_argument("--fork-ms", type=float, default=1.0,
+                        help="modelled cost per process on a system with slow process creation (default: 1)")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix="speckit-agent-context-") as tmp:
+        failures = check_scenarios(Path(tmp))
+        if failures:
+            print(f"\n❌ {failures} scenario(s) differ")
+            return 1
+        print(f"\n✅ Byte-identical agent files in all {len(SCENARIOS)} scenarios\n")
+
+        # A typical run: three existing agent files (AGENTS.md updated twice)
+        fields = ("Python 3.11", "FastAPI", "PostgreSQL 15", "web")
+        files = {"CLAUDE.md": EXISTING, "AGENTS.md": EXISTING, ".github/copilot-instructions.md": EXISTING}
+        shell_cmd, python_cmd = commands(None)
+        runners = (
+            ("shell", lambda root: run(shell_cmd, root)),
+            ("python", lambda root: run(python_cmd, root)),
+            ("in process", run_in_process),
+        )
+        print(f"{'Implementation':<16} {'best ms':>10} {'median ms':>10} {'processes':>10} "
+              f"{f'@{args.fork_ms:g}ms/proc':>14}")
+        print("-" * 65)
+        for label, runner in runners:
+            timings, processes = [], []
+            for n in range(args.repeat):
+                root = make_repo(Path(tmp) / f"bench-{label}-{n}" / "demo", plan_text(*fields), files)
+                _, ms, forks = runner(root)
+                timings.append(ms)
+                processes.append(forks)
+            timings.sort()
+            best, forks = timings[0], min(processes)
+            print(f"{label:<16} {best:>10.1f} {timings[len(timings) // 2]:>10.1f} {forks:>10} "
+                  f"{best + forks * args.fork_ms:>14.1f}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
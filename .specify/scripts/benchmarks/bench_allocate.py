@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Benchmark: `generate_all_docs.py allocate` vs the scan in create-new-feature.sh
+
+In a temporary repository with --features spec directories and as many
+branches, times:
+
+    scan       the script's old pipeline: find specs/ | xargs basename | sed |
+               sort -n plus `git branch` (without its git fetch/ls-remote,
+               which add a network round trip on top)
+    rebuild    an allocation that has to list specs/ and the branches
+    cached     an allocation from the index (the usual case)
+    command    `generate_all_docs.py allocate` as the script runs it
+
+then starts --concurrent allocations at once, as agents creating features
+in parallel would, and checks they all got different numbers. The old scan
+is run the same way to show how many of its concurrent runs pick the same
+number.
+
+Usage:
+    python3 .specify/scripts/benchmarks/bench_allocate.py [--features 1000,10000] [--concurrent 16]
+"""
+
+import argparse
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+from speckit.allocate import allocate  # noqa: E402
+
+OLD_SCAN = r"""
+spec_dirs=$(find specs -maxdepth 1 -type d -name "[0-9]*-*" 2>/dev/null | xargs -n1 basename 2>/dev/null \
+    | sed 's/-.*//' | sort -n)
+local_branches=$(git branch 2>/dev/null | grep -E "^[* ]*[0-9]+-" | sed 's/^[* ]*//' | sed 's/-.*//' | sort -n)
+max_num=0
+for num in $local_branches $spec_dirs; do
+    num=$((10#$num))
+    if [ "$num" -gt "$max_num" ]; then max_num=$num; fi
+done
+echo $((max_num + 1))
+"""
+
+def make_repo(root: Path, features: int):
+    """A git repository with `features` spec directories and one branch per feature"""
+    subprocess.run(["git", "init", "-q", str(root)], check=True)
+    git = ["git", "-C", str(root), "-c", "user.name=bench", "-c", "user.email=bench@example.com"]
+    subprocess.run(git + ["commit", "-q", "--allow-empty", "-m", "init"], check=True)
+    head = subprocess.run(git + ["rev-parse", "HEAD"], check=True, stdout=subprocess.PIPE).stdout.decode().strip()
+    refs = "".join(f"create refs/heads/{n:03d}-branch-{n} {head}\n" for n in range(1, features + 1))
+    subprocess.run(git + ["update-ref", "--stdin"], input=refs.encode(), check=True)
+    subprocess.run(git + ["pack-refs", "--all"], check=True)
+    specs = root / "specs"
+    specs.mkdir()
+    for n in range(1, features + 1):
+        (specs / f"{n:03d}-feature-{n}").mkdir()
+    shutil.copytree(SCRIPTS_DIR, root / ".specify" / "scripts", ignore=shutil.ignore_patterns("__pycache__"))
+
+def best_ms(func, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, (time.perf_counter() - start) * 1000)
+    return best
+
+def run_size(features: int, concurrent: int, repeat: int) -> bool:
+    with tempfile.TemporaryDirectory(prefix="speckit-allocate-") as tmp:
+        root = Path(tmp)
+        make_repo(root, features)
+        specs, cache = root / "specs", root / ".specify" / "cache"
+
+        scan_ms = best_ms(lambda: subprocess.run(["bash", "-c", OLD_SCAN], cwd=root, check=True,
+                                                 stdout=subprocess.DEVNULL), repeat)
+
+        def rebuild():
+            (cache / "features.json").unlink(missing_ok=True)
+            allocate(specs, cache, "bench", root=root)
+        rebuild_ms = best_ms(rebuild, repeat)
+        cached_ms = best_ms(lambda: allocate(specs, cache, "bench", root=root), repeat)
+        command = [sys.executable, str(root / ".specify/scripts/generate_all_docs.py"), "allocate", "bench"]
+        command_ms = best_ms(lambda: subprocess.run(command, cwd=root, check=True, stdout=subprocess.DEVNULL), repeat)
+
+        # Everyone starts together; each prints the number it got
+        procs = [subprocess.Popen(command, cwd=root, stdout=subprocess.PIPE) for _ in range(concurrent)]
+        names = [proc.communicate()[0].decode().strip() for proc in procs]
+        numbers = [name.split("-", 1)[0] for name in names]
+        procs = [subprocess.Popen(["bash", "-c", OLD_SCAN], cwd=root, stdout=subprocess.PIPE)
+                 for _ in range(concurrent)]
+        old_numbers = [proc.communicate()[0].decode().strip() for proc in procs]
+
+    unique = len(set(numbers)) == concurrent
+    print(f"{features:>8} {scan_ms:>9.1f} {rebuild_ms:>9.1f} {cached_ms:>8.2f} {command_ms:>9.1f}  "
+          f"{len(set(numbers)):>3}/{concurrent} distinct {'✅' if unique else '❌'}  "
+          f"(old scan: {len(set(old_numbers))}/{concurrent})")
+    return unique
+
+def main(argv: List[str] = None) -> int:
+    """Compare number allocation time with the old scan and check concurrent allocations never collide"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--features", default="1000,10000", help="comma-separated numbers of features/branches")
+    parser.add_argument("--concurrent", type=int, default=16, help="allocations started at once")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per measurement (best is kept)")
+    args = parser.parse_args(argv)
+
+    print(f"{'Features':>8} {'scan ms':>9} {'rebuild':>9} {'cached':>8} {'command':>9}  concurrent allocations")
+    print("-" * 86)
+    ok = True
+    for features in (int(value) for value in args.features.split(",") if value):
+        ok &= run_size(features, args.concurrent, args.repeat)
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
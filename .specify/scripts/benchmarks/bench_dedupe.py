@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Benchmark: MinHash/LSH dedupe vs comparing every pair of features
+
+Builds synthetic FeatureInfo corpora in memory: every feature draws its
+slug, title, stories, entities and requirements from a topic vocabulary
+plus shared boilerplate words, and a fraction of features are near copies
+of another one (a share of their words replaced). For each size, times
+find_duplicates() and an exact all-pairs Jaccard scan over the same
+filtered shingle sets, and reports how many of the all-pairs duplicate
+pairs LSH found (recall) and how many candidate pairs it had to verify.
+The all-pairs scan is skipped above --exact-max features.
+
+Also checks on specs/ that the known duplicates are reported.
+
+Usage:
+    python3 .specify/scripts/benchmarks/bench_dedupe.py [--features 1000,10000] [--threshold J]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Sequence, Set, Tuple
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+from speckit.dedupe import DEFAULT_THRESHOLD, NEAR_THRESHOLD, find_duplicates, shingles, stop_shingles  # noqa: E402
+from speckit.parser import FeatureInfo, UserStory, parse_feature  # noqa: E402
+from speckit.scan import list_feature_dirs  # noqa: E402
+
+SPECS_DIR = SCRIPTS_DIR.parent.parent / "specs"
+
+KNOWN_DUPLICATES = (
+    ("032-first-party-data-enrichment", "087-first-party-data-enrichment-hub"),
+    ("055-voice-search-optimization", "076-voice-search-ad-optimizer"),
+)
+
+BOILERPLATE = ("system must provide support configuration data feature user campaign performance "
+               "real time export reporting audit workspace dashboard settings rules history").split()
+
+def _vocabulary(rng: random.Random, size: int) -> List[str]:
+    syllables = ("ka", "lo", "mi", "ne", "ru", "sa", "ti", "vo", "xe", "zu", "pa", "do", "fi", "gu")
+    words = set()
+    while len(words) < size:
+        words.add("".join(rng.choice(syllables) for _ in range(rng.randint(2, 5))))
+    return sorted(words)
+
+def _feature(rng: random.Random, number: int, topic: List[str]) -> FeatureInfo:
+    def phrase(count: int) -> str:
+        return " ".join(rng.choice(topic) if rng.random() < 0.5 else rng.choice(BOILERPLATE) for _ in range(count))
+    slug_words = rng.sample(topic, 3)
+    return FeatureInfo(
+        feature=f"{number:05d}-{'-'.join(slug_words)}",
+        name=" ".join(word.title() for word in slug_words),
+        number=f"{number:05d}",
+        status="Draft",
+        user_stories=tuple(UserStory(phrase(4), f"P{i}") for i in (1, 2, 3)),
+        entities=tuple("".join(word.title() for word in rng.sample(topic, 2)) for _ in range(3)),
+        requirements=tuple(f"System MUST {phrase(8)}" for _ in range(8)),
+    )
+
+def _near_copy(rng: random.Random, number: int, info: FeatureInfo, vocabulary: List[str]) -> FeatureInfo:
+    """info with about a quarter of its words swapped for random ones"""
+    def mutate(text: str) -> str:
+        return " ".join(rng.choice(vocabulary) if rng.random() < 0.25 else word for word in text.split())
+    slug = info.feature.split("-", 1)[1].replace("-", " ")
+    return info._replace(
+        feature=f"{number:05d}-{mutate(slug).replace(' ', '-')}",
+        name=mutate(info.name),
+        number=f"{number:05d}",
+        user_stories=tuple(story._replace(title=mutate(story.title)) for story in info.user_stories),
+        requirements=tuple(mutate(text) for text in info.requirements),
+    )
+
+def build_corpus(count: int, duplicates: float, seed: int) -> Dict[str, List[int]]:
+    """Shingle sets of count synthetic features, a fraction of them near copies"""
+    rng = random.Random(seed)
+    vocabulary = _vocabulary(rng, max(2000, count * 4))
+    infos: List[FeatureInfo] = []
+    for number in range(1, count + 1):
+        if infos and rng.random() < duplicates:
+            infos.append(_near_copy(rng, number, rng.choice(infos), vocabulary))
+        else:
+            infos.append(_feature(rng, number, rng.sample(vocabulary, 25)))
+    return {info.feature: shingles(info) for info in infos}
+
+def all_pairs(shingle_sets: Dict[str, Sequence[int]], threshold: float) -> Set[Tuple[str, str]]:
+    """Every pair above threshold, by comparing each feature with every other"""
+    stop = stop_shingles(shingle_sets)
+    sets = [(name, frozenset(h for h in hashes if h not in stop)) for name, hashes in sorted(shingle_sets.items())]
+    found = set()
+    for i, (a, set_a) in enumerate(sets):
+        for b, set_b in sets[i + 1:]:
+            union = len(set_a | set_b)
+            if union and len(set_a & set_b) / union >= threshold:
+                found.add((a, b))
+    return found
+
+def check_repository(threshold: float) -> bool:
+    """The known duplicate pairs in specs/ must be reported"""
+    shingle_sets = {}
+    for spec_dir in list_feature_dirs(SPECS_DIR):
+        spec = spec_dir / "spec.md"
+        if spec.exists():
+            shingle_sets[spec_dir.name] = shingles(parse_feature(spec_dir.name, spec.read_text()))
+    clusters, near, counts = find_duplicates(shingle_sets, threshold, near=NEAR_THRESHOLD)
+    reported = {(a, b) for cluster in clusters for a, b, _ in cluster.pairs}
+    possible = {(a, b) for a, b, _ in near}
+    ok = True
+    for pair in KNOWN_DUPLICATES:
+        found = pair in reported or pair in possible
+        ok = ok and found
+        print(f"{'✅' if found else '❌'} specs/: {pair[0]} ~ {pair[1]}{'' if pair in reported else ' (possible)'}")
+    print(f"   {len(clusters)} cluster(s), {counts['candidates']} candidate pair(s) "
+          f"among {counts['features']} features\n")
+    return ok
+
+def main(argv: List[str] = None) -> int:
+    """Compare LSH against all pairs on growing corpora"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--features", default="1000,5000,20000", help="comma-separated corpus sizes")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Jaccard threshold")
+    parser.add_argument("--duplicates", type=float, default=0.05, help="fraction of near-copy features")
+    parser.add_argument("--exact-max", type=int, default=5000, help="largest corpus to compare all pairs on")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    ok = check_repository(args.threshold)
+
+    print(f"{'Features':>9} {'LSH ms':>10} {'candidates':>11} {'found':>7} {'all-pairs ms':>13} "
+          f"{'pairs':>7} {'recall':>7}")
+    print("-" * 70)
+    for count in (int(n) for n in args.features.split(",")):
+        shingle_sets = build_corpus(count, args.duplicates, args.seed)
+        start = time.perf_counter()
+        clusters, _, counts = find_duplicates(shingle_sets, args.threshold)
+        lsh_ms = (time.perf_counter() - start) * 1000
+        found = {(a, b) for cluster in clusters for a, b, _ in cluster.pairs}
+
+        exact_ms, pairs, recall = "-", "-", "-"
+        if count <= args.exact_max:
+            start = time.perf_counter()
+            expected = all_pairs(shingle_sets, args.threshold)
+            exact_ms = f"{(time.perf_counter() - start) * 1000:.0f}"
+            pairs = str(len(expected))
+            recall = f"{len(found & expected) / len(expected):.1%}" if expected else "-"
+        print(f"{count:>9} {lsh_ms:>10.0f} {counts['candidates']:>11} {len(found):>7} {exact_ms:>13} "
+              f"{pairs:>7} {recall:>7}")
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
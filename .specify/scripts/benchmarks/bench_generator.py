@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmark for generate_all_docs.py on synthetic spec corpora
+
+For each corpus size this builds a synthetic project (see corpus.py), times
+the generator's phases in process (scan, read, parse, render, write) and
+then runs the real generate_all_docs.py end to end twice in a subprocess:
+a cold run that generates every plan.md/tasks.md and a warm rerun that
+should skip everything via the manifest. Results are written as JSON and
+can be compared against a previous run.
+
+Usage:
+    python3 .specify/scripts/benchmarks/bench_generator.py --features 100,1000
+    python3 .specify/scripts/benchmarks/bench_generator.py --output new.json \\
+        --baseline old.json --threshold 0.2
+
+Exits 1 when any timing or peak RSS is worse than the baseline by more
+than the threshold.
+"""
+
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SCRIPTS_DIR))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import generate_all_docs  # noqa: E402
+from corpus import CorpusShape, build_corpus  # noqa: E402
+from speckit.output import write_if_changed  # noqa: E402
+
+RESULTS_VERSION = 1
+
+def best_of(func: Callable[[], Any], repeat: int) -> Tuple[float, Any]:
+    """Return (best wall seconds, last result) over repeat calls"""
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+def phase(seconds: float, features: int, **extra: Any) -> Dict[str, Any]:
+    """Build one phase record"""
+    record = {
+        "seconds": round(seconds, 6),
+        "features_per_sec": round(features / seconds, 1) if seconds else None,
+    }
+    record.update(extra)
+    return record
+
+def run_pipeline(root: Path, jobs: int) -> Dict[str, Any]:
+    """Run the corpus copy of generate_all_docs.py and measure it with wait4()"""
+    script = root / ".specify" / "scripts" / "generate_all_docs.py"
+    with tempfile.TemporaryFile() as stderr:
+        start = time.perf_counter()
+        proc = subprocess.Popen(
+            [sys.executable, str(script), "--jobs", str(jobs)],
+            stdout=subprocess.DEVNULL,
+            stderr=stderr,
+        )
+        _, status, usage = os.wait4(proc.pid, 0)
+        seconds = time.perf_counter() - start
+        proc.returncode = os.waitstatus_to_exitcode(status)
+        if proc.returncode != 0:
+            stderr.seek(0)
+            message = stderr.read().decode(errors="replace").strip()
+            raise RuntimeError(f"generate_all_docs.py exited {proc.returncode}: {message}")
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    rss_kb = usage.ru_maxrss // 1024 if sys.platform == "darwin" else usage.ru_maxrss
+    return {"seconds": seconds, "peak_rss_kb": rss_kb, "cpu_seconds": usage.ru_utime + usage.ru_stime}
+
+def bench_case(shape: CorpusShape, jobs: int, repeat: int, keep: Optional[Path]) -> Dict[str, Any]:
+    """Build one corpus and measure every phase plus the end-to-end pipeline"""
+    tmp = None
+    if keep:
+        root = keep / shape.label()
+        root.mkdir(parents=True, exist_ok=False)
+    else:
+        tmp = tempfile.TemporaryDirectory(prefix="speckit-bench-")
+        root = Path(tmp.name)
+
+    try:
+        start = time.perf_counter()
+        specs_dir = build_corpus(root, shape)
+        build_seconds = time.perf_counter() - start
+        n = shape.features
+
+        scan_s, spec_dirs = best_of(lambda: sorted(d for d in specs_dir.iterdir() if d.is_dir()), repeat)
+        spec_files = [d / "spec.md" for d in spec_dirs]
+        read_s, contents = best_of(lambda: [p.read_bytes() for p in spec_files], repeat)
+        parse_s, infos = best_of(lambda: [generate_all_docs.extract_feature_info(p) for p in spec_files], repeat)
+
+        def render():
+            return [
+                (generate_all_docs.generate_plan_md(info, str(d)), generate_all_docs.generate_tasks_md(info, str(d)))
+                for info, d in zip(infos, spec_dirs)
+            ]
+        render_s, docs = best_of(render, repeat)
+
+        out_dir = root / "write-bench"
+        out_dirs = [out_dir / d.name for d in spec_dirs]
+        for d in out_dirs:
+            d.mkdir(parents=True)
+
+        def write():
+            for d, (plan, tasks) in zip(out_dirs, docs):
+                write_if_changed(d / "plan.md", plan)
+                write_if_changed(d / "tasks.md", tasks)
+        # First pass writes, later passes measure the unchanged fast path
+        write_s, _ = best_of(write, 1)
+        rewrite_s, _ = best_of(write, repeat)
+
+        cold = run_pipeline(root, jobs)
+        warm = run_pipeline(root, jobs)
+
+        return {
+            "shape": vars(shape),
+            "corpus": {
+                "build_seconds": round(build_seconds, 3),
+                "spec_bytes": sum(len(c) for c in contents),
+            },
+            "phases": {
+                "scan": phase(scan_s, n),
+                "read": phase(read_s, n),
+                "parse": phase(parse_s, n),
+                "render": phase(render_s, n, bytes=sum(len(p) + len(t) for p, t in docs)),
+                "write": phase(write_s, n),
+                "rewrite_unchanged": phase(rewrite_s, n),
+            },
+            "pipeline": {
+                "cold": phase(cold["seconds"], n, peak_rss_kb=cold["peak_rss_kb"],
+                              cpu_seconds=round(cold["cpu_seconds"], 3)),
+                "warm": phase(warm["seconds"], n, peak_rss_kb=warm["peak_rss_kb"],
+                              cpu_seconds=round(warm["cpu_seconds"], 3)),
+            },
+        }
+    finally:
+        if tmp:
+            tmp.cleanup()
+
+def iter_metrics(case: Dict[str, Any]):
+    """Yield (metric name, value) pairs for baseline comparison; lower is better for all"""
+    for name, record in case["phases"].items():
+        yield f"phases.{name}.seconds", record["seconds"]
+    for name, record in case["pipeline"].items():
+        yield f"pipeline.{name}.seconds", record["seconds"]
+        yield f"pipeline.{name}.peak_rss_kb", record["peak_rss_kb"]
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """Return a description of every metric that regressed beyond threshold"""
+    regressions = []
+    for label, case in results["cases"].items():
+        base_case = baseline.get("cases", {}).get(label)
+        if not base_case:
+            print(f"ℹ️  {label}: not in baseline, skipping comparison")
+            continue
+        base_metrics = dict(iter_metrics(base_case))
+        for metric, value in iter_metrics(case):
+            base = base_metrics.get(metric)
+            if not base:
+                continue
+            change = (value - base) / base
+            marker = "❌" if change > threshold else "✅"
+            print(f"   {marker} {label} {metric}: {base:g} → {value:g} ({change:+.1%})")
+            if change > threshold:
+                regressions.append(f"{label} {metric} {change:+.1%}")
+    return regressions
+
+def print_case(label: str, case: Dict[str, Any]):
+    """Print a human-readable breakdown of one case"""
+    print(f"\n📦 {label} ({case['corpus']['spec_bytes'] / 1e6:.1f} MB of specs)")
+    for name, record in list(case["phases"].items()) + [(f"pipeline {k}", v) for k, v in case["pipeline"].items()]:
+        rss = f"  peak RSS {record['peak_rss_kb'] / 1024:.1f} MiB" if "peak_rss_kb" in record else ""
+        print(f"   {name:<22} {record['seconds'] * 1000:>10.1f} ms {record['features_per_sec'] or 0:>12.0f} features/s{rss}")
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the generator benchmark"""
+    parser = argparse.ArgumentParser(description="Benchmark generate_all_docs.py on synthetic spec corpora")
+    parser.add_argument("--features", default="100,1000", help="comma-separated corpus sizes (default: 100,1000)")
+    parser.add_argument("--stories", type=int, default=3, help="user stories per spec")
+    parser.add_argument("--entities", type=int, default=6, help="Key Entities per spec")
+    parser.add_argument("--requirements", type=int, default=12, help="functional requirements per spec")
+    parser.add_argument("--prose", type=int, default=2, help="filler paragraphs per user story")
+    parser.add_argument("--pathological", type=float, default=0.0, help="fraction of worst-case specs (e.g. 0.01)")
+    parser.add_argument("--seed", type=int, default=1, help="corpus random seed")
+    parser.add_argument("--jobs", type=int, default=1, help="--jobs passed to generate_all_docs.py")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per in-process phase (best is kept)")
+    parser.add_argument("--output", type=Path, help="write results JSON here")
+    parser.add_argument("--baseline", type=Path, help="results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown vs baseline (default: 0.2)")
+    parser.add_argument("--keep", type=Path, help="build corpora under this directory and keep them")
+    args = parser.parse_args(argv)
+
+    results = {
+        "version": RESULTS_VERSION,
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "jobs": args.jobs,
+        "cases": {},
+    }
+
+    for size in (int(s) for s in args.features.split(",")):
+        shape = CorpusShape(
+            features=size,
+            stories=args.stories,
+            entities=args.entities,
+            requirements=args.requirements,
+            prose=args.prose,
+            pathological=args.pathological,
+            seed=args.seed,
+        )
+        case = bench_case(shape, args.jobs, args.repeat, args.keep)
+        results["cases"][shape.label()] = case
+        print_case(shape.label(), case)
+
+    results["harness_peak_rss_kb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2) + "\n")
+        print(f"\n💾 Results written to {args.output}")
+
+    if args.baseline:
+        print(f"\n📊 Comparing against {args.baseline} (threshold {args.threshold:.0%})")
+        regressions = compare(results, json.loads(args.baseline.read_text()), args.threshold)
+        if regressions:
+            print(f"\n❌ {len(regressions)} regression(s) beyond threshold")
+            return 1
+        print("\n✅ No regressions beyond threshold")
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Benchmark: `impact` test selection vs running the full suites
+
+Builds the import graph of backend/src and frontend/src cold (no cache)
+and warm (cached in a temporary file), then pretends each non-test source
+file was the only staged change and counts the test files `impact` would
+run against the full suite the pre-commit hook used to run.
+
+Usage:
+    python3 .specify/scripts/benchmarks/bench_impact.py [--repeat N]
+"""
+
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+PROJECT_ROOT = SCRIPTS_DIR.parent.parent
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+from speckit.impact import PROJECTS, ImportGraph, find_impact, is_source  # noqa: E402
+
+def main(argv: List[str] = None) -> int:
+    """Time the graph build and compare targeted test counts with the full suites"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5, help="runs per measurement (best is kept)")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix="speckit-impact-") as tmp:
+        cache = Path(tmp) / "impact.json"
+        cold = warm = float("inf")
+        for _ in range(args.repeat):
+            cache.unlink(missing_ok=True)
+            start = time.perf_counter()
+            graph = ImportGraph.load(cache)
+            counts = graph.refresh(PROJECT_ROOT)
+            graph.save()
+            cold = min(cold, time.perf_counter() - start)
+            start = time.perf_counter()
+            graph = ImportGraph.load(cache)
+            graph.refresh(PROJECT_ROOT)
+            warm = min(warm, time.perf_counter() - start)
+    print(f"Import graph of {counts['files']} files: cold {cold * 1000:.1f} ms, warm {warm * 1000:.1f} ms\n")
+
+    print(f"{'Project':<10} {'changes':>8} {'suite':>6} {'median':>7} {'p90':>5} {'max':>5} {'none':>6}  ms/change")
+    print("-" * 62)
+    for number, project in enumerate(PROJECTS):
+        suite = sorted(path for path in graph.files if path.startswith(f"{project.name}/")
+                       and project.tests.search(path))
+        changes = [path for path in graph.files if path.startswith(f"{project.name}/")
+                   and is_source(path) and not project.tests.search(path)]
+        if not changes:
+            continue
+        selected = []
+        start = time.perf_counter()
+        for path in changes:
+            result = find_impact(graph, [path], PROJECT_ROOT / "specs").projects[number]
+            selected.append(len(suite) if result.full else len(result.tests))
+        per_change = (time.perf_counter() - start) * 1000 / len(changes)
+        deciles = statistics.quantiles(selected, n=10) if len(selected) > 1 else selected * 9
+        print(f"{project.name:<10} {len(changes):>8} {len(suite):>6} {statistics.median(selected):>7g} "
+              f"{deciles[-1]:>5g} {max(selected):>5} {selected.count(0):>6}  {per_change:.2f}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
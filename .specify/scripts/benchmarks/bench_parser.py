@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Benchmark: single-pass spec parser vs the original regex extract_feature_info()
+
+Checks that both implementations agree on every spec in specs/, then times
+them on the real corpus, on header-only lookups and on a pathological spec
+with many "### Key Entities" headings and no blank line before the bullets,
+where the original DOTALL search degrades quadratically.
+
+Usage:
+    python3 .specify/scripts/benchmarks/bench_parser.py [--repeat N]
+"""
+
+import argparse
+import re
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+from speckit.parser import parse_spec  # noqa: E402
+
+SPECS_DIR = SCRIPTS_DIR.parent.parent / "specs"
+
+def legacy_extract_feature_info(spec_path: Path) -> Dict[str, Any]:
+    """The regex implementation extract_feature_info() used before speckit.parser"""
+    with open(spec_path, 'r') as f:
+        content = f.read()
+
+    info = {
+        "name": "",
+        "number": "",
+        "status": "Pending",
+        "user_stories": [],
+        "entities": [],
+        "requirements": [],
+    }
+
+    title_match = re.search(r'# Feature Specification: (.+)', content)
+    if title_match:
+        info["name"] = title_match.group(1)
+
+    branch_match = re.search(r'\*\*Feature Branch\*\*: `\[(\d+)-', content)
+    if branch_match:
+        info["number"] = branch_match.group(1)
+
+    status_match = re.search(r'\*\*Status\*\*: (.+)', content)
+    if status_match:
+        info["status"] = status_match.group(1).strip()
+
+    user_story_pattern = r'### User Story \d+ - (.+?) \(Priority: (P\d)\)'
+    for match in re.finditer(user_story_pattern, content):
+        info["user_stories"].append({
+            "title": match.group(1),
+            "priority": match.group(2)
+        })
+
+    entity_section = re.search(r'### Key Entities.*?\n\n((?:- \*\*\w+\*\*:.+\n?)+)', content, re.DOTALL)
+    if entity_section:
+        entity_lines = entity_section.group(1).strip().split('\n')
+        for line in entity_lines:
+            entity_match = re.match(r'- \*\*(\w+)\*\*:', line)
+            if entity_match:
+                info["entities"].append(entity_match.group(1))
+
+    fr_pattern = r'- \*\*FR-\d+\*\*: (.+)'
+    info["requirements"] = re.findall(fr_pattern, content)
+
+    return info
+
+def time_call(func: Callable[[], Any], repeat: int) -> float:
+    """Return the best wall time of func() over repeat runs, in milliseconds"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+def pathological_spec(headings: int) -> str:
+    """Build a spec whose entity bullets never follow a blank line"""
+    body = "".join(f"### Key Entities\n- **Entity{i}**: description\n" for i in range(headings))
+    return "# Feature Specification: Pathological\n\n" + body
+
+def report(label: str, legacy_ms: float, new_ms: float):
+    """Print one comparison row"""
+    speedup = legacy_ms / new_ms if new_ms else float("inf")
+    print(f"{label:<38} {legacy_ms:>10.2f} {new_ms:>10.2f} {speedup:>8.1f}x")
+
+def main(argv: List[str] = None) -> int:
+    """Run the parser benchmark"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5, help="runs per measurement (best is kept)")
+    args = parser.parse_args(argv)
+
+    spec_files = sorted(SPECS_DIR.glob("*/spec.md"))
+    mismatches = [p.parent.name for p in spec_files if legacy_extract_feature_info(p) != parse_spec(p)]
+    if mismatches:
+        print(f"❌ Parsers disagree on {len(mismatches)} specs: {', '.join(mismatches[:10])}")
+        return 1
+    print(f"✅ Identical results on {len(spec_files)} specs\n")
+
+    print(f"{'Case':<38} {'regex ms':>10} {'1-pass ms':>10} {'speedup':>9}")
+    print("-" * 70)
+    report(
+        f"corpus, all fields ({len(spec_files)} specs)",
+        time_call(lambda: [legacy_extract_feature_info(p) for p in spec_files], args.repeat),
+        time_call(lambda: [parse_spec(p) for p in spec_files], args.repeat),
+    )
+    report(
+        "corpus, name/number/status",
+        time_call(lambda: [legacy_extract_feature_info(p) for p in spec_files], args.repeat),
+        time_call(lambda: [parse_spec(p, ("name", "number", "status")) for p in spec_files], args.repeat),
+    )
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for headings in (500, 1000, 2000, 4000):
+            path = Path(tmp) / f"pathological-{headings}.md"
+            path.write_text(pathological_spec(headings))
+            report(
+                f"pathological, {headings} headings",
+                time_call(lambda: legacy_extract_feature_info(path), 1),
+                time_call(lambda: parse_spec(path), args.repeat),
+            )
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
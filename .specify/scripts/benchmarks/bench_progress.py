@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Benchmark: `generate_all_docs.py progress` vs re-reading every tasks.md
+
+Times, on specs/ (or a synthetic corpus with --features N):
+
+    build     indexing every tasks.md from scratch
+    refresh   the no-op refresh every `progress` starts with
+    one       a refresh after one tasks.md had a box checked
+    totals    ProgressIndex.features() for the whole tree
+    rescan    reading and parsing every tasks.md, the baseline
+
+The totals from the index are checked against the rescan.
+
+Usage:
+    python3 .specify/scripts/benchmarks/bench_progress.py [--features N] [--repeat N]
+"""
+
+import argparse
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, List
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+from corpus import CorpusShape, build_corpus  # noqa: E402
+from speckit.progress import ProgressIndex, parse_progress  # noqa: E402
+from speckit.scan import list_feature_dirs  # noqa: E402
+
+SPECS_DIR = SCRIPTS_DIR.parent.parent / "specs"
+
+def best_ms(func: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, (time.perf_counter() - start) * 1000)
+    return best
+
+def rescan(dirs: List[Path]) -> List[int]:
+    """Tree totals (done, tasks, checked, boxes) by parsing every tasks.md"""
+    totals = [0, 0, 0, 0]
+    for spec_dir in dirs:
+        try:
+            text = (spec_dir / "tasks.md").read_text(encoding="utf-8", errors="replace")
+        except FileNotFoundError:
+            continue
+        for phase, _ in parse_progress(text):
+            for i, value in enumerate((phase.done, phase.tasks, phase.checked, phase.boxes)):
+                totals[i] += value
+    return totals
+
+def main(argv: List[str] = None) -> int:
+    """Build the index, then compare refresh and query time with a full rescan"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--features", type=int, default=0, help="synthetic corpus size (default: specs/)")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per measurement (best is kept)")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix="speckit-progress-") as tmp:
+        root = Path(tmp)
+        if args.features:
+            specs_dir = build_corpus(root, CorpusShape(features=args.features))
+            subprocess.run([sys.executable, str(root / ".specify/scripts/generate_all_docs.py")],
+                           cwd=root, stdout=subprocess.DEVNULL, check=True)
+        else:
+            specs_dir = SPECS_DIR
+        dirs = list_feature_dirs(specs_dir)
+        index_path = root / "progress.sqlite"
+
+        def build():
+            index_path.unlink(missing_ok=True)
+            with ProgressIndex(index_path) as index:
+                index.refresh(dirs)
+
+        build_ms = best_ms(build, max(1, args.repeat // 2))
+        with ProgressIndex(index_path) as index:
+            refresh_ms = best_ms(lambda: index.refresh(dirs), args.repeat)
+            totals_ms = best_ms(index.features, args.repeat)
+            features = index.features()
+            indexed = [sum(getattr(f, field) for f in features) for field in ("done", "tasks", "checked", "boxes")]
+            one_ms = None
+            if args.features:
+                # Check one more box each time, so every refresh sees a changed file
+                tasks_md = dirs[0] / "tasks.md"
+
+                def check_one():
+                    tasks_md.write_text(tasks_md.read_text().replace("- [ ]", "- [x]", 1))
+                    index.refresh(dirs)
+                one_ms = best_ms(check_one, args.repeat)
+                indexed = [sum(getattr(f, field) for f in index.features())
+                           for field in ("done", "tasks", "checked", "boxes")]
+        rescan_ms = best_ms(lambda: rescan(dirs), args.repeat)
+        expected = rescan(dirs)
+
+    one = f", one changed {one_ms:.1f} ms" if one_ms is not None else ""
+    print(f"{len(dirs)} features, {expected[1]} tasks, {expected[3]} boxes")
+    print(f"   build {build_ms:.1f} ms, no-op refresh {refresh_ms:.1f} ms{one}, totals {totals_ms:.2f} ms")
+    print(f"   full rescan {rescan_ms:.1f} ms")
+    same = indexed == expected
+    print(f"   index totals {'match' if same else 'differ from'} the rescan {'✅' if same else '❌'}")
+    return 0 if same else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Benchmark: os.scandir feature scanner vs the original iterdir()/exists() loop
+
+Builds a synthetic specs/ tree (a mix of complete features, missing plan.md
+or tasks.md and directories without spec.md), checks that both scanners
+classify every feature the same way, then compares wall time and the
+filesystem syscalls each one issues per run:
+
+    legacy        is_dir() per entry, exists() for spec/plan/tasks, then the
+                  manifest's stat of spec.md: 5 stats per feature
+    scandir cold  d_type for directories, one listing per feature
+                  (openat + getdents64 x2 + close) + stat(dir) + stat(spec.md)
+    scandir warm  listings cached by directory mtime: stat(dir) + stat(spec.md)
+
+Syscalls are counted by wrapping os.stat/os.scandir/os.listdir; a listing
+is counted as 4 syscalls. --latency-us adds a modelled per-syscall cost to
+show what the difference means on network filesystems or slow overlays.
+
+Usage:
+    python3 .specify/scripts/benchmarks/bench_scan.py [--features N] [--repeat N] [--latency-us US]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+from speckit.scan import scan_features  # noqa: E402
+
+# openat + getdents64 (entries) + getdents64 (end of directory) + close
+LISTING_SYSCALLS = 4
+
+def build_tree(root: Path, features: int, seed: int) -> Path:
+    """Create specs/ with a realistic mix of complete and incomplete features"""
+    rng = random.Random(seed)
+    specs_dir = root / "specs"
+    for number in range(1, features + 1):
+        feature_dir = specs_dir / f"{number:05d}-feature"
+        feature_dir.mkdir(parents=True)
+        roll = rng.random()
+        if roll > 0.01:
+            (feature_dir / "spec.md").write_text("# Feature Specification: Synthetic\n")
+        if roll > 0.05:
+            (feature_dir / "plan.md").write_text("# Implementation Plan\n")
+        if roll > 0.08 or 0.01 < roll <= 0.05:
+            (feature_dir / "tasks.md").write_text("# Tasks\n")
+        (feature_dir / "checklists").mkdir()
+    # Backdate every directory so the scanner's racy-mtime guard allows caching
+    old = time.time_ns() - 3600 * 10**9
+    for feature_dir in specs_dir.iterdir():
+        os.utime(feature_dir, ns=(old, old))
+    return specs_dir
+
+def legacy_scan(specs_dir: Path) -> List[Tuple[str, bool, bool, bool]]:
+    """The loop main() used before speckit.scan, plus the manifest's spec.md stat"""
+    result = []
+    for spec_dir in sorted([d for d in specs_dir.iterdir() if d.is_dir()]):
+        spec_file = spec_dir / "spec.md"
+        has_spec = spec_file.exists()
+        has_plan = (spec_dir / "plan.md").exists()
+        has_tasks = (spec_dir / "tasks.md").exists()
+        if has_spec:
+            spec_file.stat()
+        result.append((spec_dir.name, has_spec, has_plan, has_tasks))
+    return result
+
+def scandir_scan(specs_dir: Path, cache: Dict[str, Any]) -> List[Tuple[str, bool, bool, bool]]:
+    """speckit.scan.scan_features() plus the manifest's spec.md stat"""
+    features, _ = scan_features(specs_dir, cache)
+    for feature in features:
+        if feature.has_spec:
+            os.stat(feature.path / "spec.md")
+    return [(f.name, f.has_spec, f.has_plan, f.has_tasks) for f in features]
+
+@contextmanager
+def count_syscalls() -> Iterator[Dict[str, int]]:
+    """Count stat() calls and directory listings made through the os module"""
+    counts = {"stat": 0, "listings": 0}
+    real_stat, real_scandir, real_listdir = os.stat, os.scandir, os.listdir
+
+    def stat(*args, **kwargs):
+        counts["stat"] += 1
+        return real_stat(*args, **kwargs)
+
+    def scandir(*args, **kwargs):
+        counts["listings"] += 1
+        return real_scandir(*args, **kwargs)
+
+    def listdir(*args, **kwargs):
+        counts["listings"] += 1
+        return real_listdir(*args, **kwargs)
+
+    os.stat, os.scandir, os.listdir = stat, scandir, listdir
+    try:
+        yield counts
+    finally:
+        os.stat, os.scandir, os.listdir = real_stat, real_scandir, real_listdir
+
+def measure(func: Callable[[], Any], repeat: int) -> Tuple[float, int, Any]:
+    """Return (best wall ms, syscalls of one run, result)"""
+    with count_syscalls() as counts:
+        result = func()
+    syscalls = counts["stat"] + counts["listings"] * LISTING_SYSCALLS
+
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, syscalls, result
+
+def report(label: str, ms: float, syscalls: int, features: int, latency_us: float):
+    """Print one row"""
+    modelled = ms + syscalls * latency_us / 1000
+    print(f"{label:<16} {ms:>10.2f} {syscalls:>10,} {syscalls / features:>8.2f} {modelled:>14.1f}")
+
+def main(argv: List[str] = None) -> int:
+    """Run the scanner benchmark"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--features", type=int, default=2000, help="feature directories to create")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per measurement (best is kept)")
+    parser.add_argument("--latency-us", type=float, default=200.0,
+                        help="modelled cost per syscall on a slow filesystem (default: 200)")
+    parser.add_argument("--seed", type=int, default=1, help="random seed for the feature mix")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix="speckit-scan-") as tmp:
+        specs_dir = build_tree(Path(tmp), args.features, args.seed)
+
+        legacy = measure(lambda: legacy_scan(specs_dir), args.repeat)
+        # Every cold run starts from an empty cache; warm runs reuse a filled one
+        cold = measure(lambda: scandir_scan(specs_dir, {}), args.repeat)
+        _, cache = scan_features(specs_dir)
+        warm = measure(lambda: scandir_scan(specs_dir, cache), args.repeat)
+
+        for label, (_, _, result) in (("scandir cold", cold), ("scandir warm", warm)):
+            if result != legacy[2]:
+                print(f"❌ {label} disagrees with the legacy scan")
+                return 1
+        print(f"✅ Identical classification of {args.features} features\n")
+
+        print(f"{'Scanner':<16} {'wall ms':>10} {'syscalls':>10} {'/feature':>8} "
+              f"{f'@{args.latency_us:g}us ms':>14}")
+        print("-" * 62)
+        for label, (ms, syscalls, _) in (("legacy", legacy), ("scandir cold", cold), ("scandir warm", warm)):
+            report(label, ms, syscalls, args.features, args.latency_us)
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Benchmark: `generate_all_docs.py schedule` on specs/ and synthetic task graphs
+
+For specs/ and for synthetic trees of --tasks tasks (tasks.md text in the
+generated layout, 20 tasks per feature, dependencies on up to three earlier
+tasks and one in ten features depending on a task of an earlier feature),
+times:
+
+    parse      parsing every tasks.md and resolving dependencies
+    analyze    topological order, earliest/latest starts and ranks
+    schedule   list scheduling on each --workers count
+
+and reports the makespan against the lower bound max(critical path, work / N)
+and against FIFO list scheduling (document order instead of rank). Every
+schedule is checked: no task starts before its dependencies end and no
+worker runs two tasks at once.
+
+Usage:
+    python3 .specify/scripts/benchmarks/bench_schedule.py [--tasks 1000,10000,100000] [--workers 1,4,16,256]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+from typing import List, Tuple
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+from speckit.scan import list_feature_dirs  # noqa: E402
+from speckit.schedule import Analysis, Schedule, TaskGraph, analyze, build_graph, list_schedule  # noqa: E402
+
+SPECS_DIR = SCRIPTS_DIR.parent.parent / "specs"
+TASKS_PER_FEATURE = 20
+ESTIMATES = ("0.5 days", "1 day", "1.5 days", "2 days", "4 hours")
+
+def synthetic(tasks: int, seed: int = 0) -> List[Tuple[str, str]]:
+    """(feature, tasks.md text) pairs with about `tasks` tasks"""
+    rng = random.Random(seed)
+    documents = []
+    for feature in range(max(1, tasks // TASKS_PER_FEATURE)):
+        lines = ["# Tasks", "", "## Phase 1: Implementation", ""]
+        for number in range(1, TASKS_PER_FEATURE + 1):
+            lines += [f"### T{number:03d}: Task {number}", f"**Time Estimate**: {rng.choice(ESTIMATES)}"]
+            earlier = rng.sample(range(1, number), min(number - 1, rng.randint(0, 3)))
+            if feature and number == 1 and rng.random() < 0.1:
+                lines.append(f"**Dependencies**: {rng.randrange(feature) + 1:03d}:T{TASKS_PER_FEATURE:03d}")
+            elif earlier:
+                lines.append(f"**Dependencies**: {', '.join(f'T{e:03d}' for e in sorted(earlier))}")
+            lines += ["- [ ] Acceptance", ""]
+        documents.append((f"{feature + 1:03d}-feature-{feature + 1}", "\n".join(lines)))
+    return documents
+
+def fifo_rank(graph: TaskGraph, analysis: Analysis) -> Analysis:
+    """The same analysis, with every rank replaced by document order so scheduling becomes FIFO"""
+    return analysis._replace(rank=[-float(task) for task in range(len(graph.tasks))])
+
+def check(graph: TaskGraph, schedule: Schedule) -> bool:
+    """No task starts before its dependencies end; no worker runs two tasks at once"""
+    end = {assignment.task: assignment.end for assignment in schedule.assignments}
+    for assignment in schedule.assignments:
+        if any(end.get(pred, float("inf")) > assignment.start + 1e-9 for pred in graph.preds[assignment.task]):
+            return False
+    busy = {}
+    for assignment in sorted(schedule.assignments, key=lambda a: (a.worker, a.start)):
+        if busy.get(assignment.worker, 0.0) > assignment.start + 1e-9:
+            return False
+        busy[assignment.worker] = assignment.end
+    return True
+
+def run(name: str, documents: List[Tuple[str, str]], workers: List[int]) -> bool:
+    start = time.perf_counter()
+    graph = build_graph(documents)
+    parse_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    analysis = analyze(graph)
+    analyze_ms = (time.perf_counter() - start) * 1000
+    print(f"\n{name}: {len(graph.tasks)} tasks, {sum(map(len, graph.preds))} dependencies, "
+          f"critical path {analysis.length:g} days")
+    print(f"   parse {parse_ms:.1f} ms, analyze {analyze_ms:.1f} ms")
+    print(f"   {'workers':>7} {'ms':>8} {'makespan':>9} {'bound':>8} {'vs bound':>8} {'fifo':>8}  valid")
+    ok = True
+    fifo_analysis = fifo_rank(graph, analysis)
+    for count in workers:
+        start = time.perf_counter()
+        schedule = list_schedule(graph, analysis, count)
+        schedule_ms = (time.perf_counter() - start) * 1000
+        fifo = list_schedule(graph, fifo_analysis, count)
+        valid = check(graph, schedule) and len(schedule.assignments) == len(analysis.order)
+        ok &= valid
+        ratio = schedule.makespan / schedule.lower_bound if schedule.lower_bound else 1.0
+        print(f"   {count:>7} {schedule_ms:>8.1f} {schedule.makespan:>9g} {schedule.lower_bound:>8g} "
+              f"{ratio:>8.3f} {fifo.makespan:>8g}  {'✅' if valid else '❌'}")
+    return ok
+
+def main(argv: List[str] = None) -> int:
+    """Time graph building, analysis and scheduling, and check every schedule"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tasks", default="1000,10000,100000", help="comma-separated synthetic graph sizes")
+    parser.add_argument("--workers", default="1,4,16,256", help="comma-separated worker counts")
+    args = parser.parse_args(argv)
+    workers = [int(value) for value in args.workers.split(",")]
+
+    documents = []
+    for spec_dir in list_feature_dirs(SPECS_DIR):
+        try:
+            documents.append((spec_dir.name, (spec_dir / "tasks.md").read_text(encoding="utf-8", errors="replace")))
+        except FileNotFoundError:
+            continue
+    ok = run("specs/", documents, workers)
+    for size in (int(value) for value in args.tasks.split(",") if value):
+        ok &= run(f"synthetic {size}", synthetic(size), workers)
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Benchmark: `generate_all_docs.py search` vs grepping every document
+
+Times, on specs/ (or a synthetic corpus with --features N):
+
+    build     indexing every spec.md/plan.md/tasks.md from scratch
+    refresh   the no-op refresh every search starts with
+    query     SearchIndex.search() per query, in process
+    cli       a whole `search` command (interpreter start, refresh, query)
+    grep      `grep -rlie TERM specs/`, the baseline, per query
+
+Each query's matching features are checked against grep's: a feature
+grep finds but search misses is reported (stemming makes search find a
+few more, e.g. "paced" for "pacing").
+
+Usage:
+    python3 .specify/scripts/benchmarks/bench_search.py [--features N] [--repeat N] [QUERY ...]
+"""
+
+import argparse
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, List
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+from corpus import CorpusShape, build_corpus  # noqa: E402
+from speckit.scan import list_feature_dirs  # noqa: E402
+from speckit.search import SearchIndex, template_lines  # noqa: E402
+
+SPECS_DIR = SCRIPTS_DIR.parent.parent / "specs"
+TEMPLATES_DIR = SCRIPTS_DIR.parent / "templates"
+
+QUERIES = ("pacing", "attribution", "budget forecast", "fraud")
+
+def best_ms(func: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, (time.perf_counter() - start) * 1000)
+    return best
+
+def grep_features(specs_dir: Path, query: str) -> set:
+    """Features with a document containing every word of query (case-insensitive substring)"""
+    found = None
+    for word in query.split():
+        proc = subprocess.run(["grep", "-rlie", word, str(specs_dir)], capture_output=True, text=True)
+        paths = [Path(line).relative_to(specs_dir).parts for line in proc.stdout.splitlines()]
+        features = {parts[0] for parts in paths if len(parts) > 1}
+        found = features if found is None else found & features
+    return found or set()
+
+def main(argv: List[str] = None) -> int:
+    """Build the index, then compare query latency with grep"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("queries", nargs="*", default=list(QUERIES), metavar="QUERY")
+    parser.add_argument("--features", type=int, default=0, help="synthetic corpus size (default: specs/)")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per measurement (best is kept)")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix="speckit-search-") as tmp:
+        root = Path(tmp)
+        if args.features:
+            specs_dir = build_corpus(root, CorpusShape(features=args.features))
+            subprocess.run([sys.executable, str(root / ".specify/scripts/generate_all_docs.py")],
+                           cwd=root, stdout=subprocess.DEVNULL, check=True)
+        else:
+            # The CLI runs from a copy so the repository's own cache is not touched
+            specs_dir = SPECS_DIR
+            shutil.copytree(SCRIPTS_DIR, root / ".specify" / "scripts",
+                            ignore=shutil.ignore_patterns("__pycache__", "benchmarks"))
+            (root / "specs").symlink_to(SPECS_DIR)
+            (root / ".specify" / "templates").symlink_to(TEMPLATES_DIR)
+        generator = root / ".specify" / "scripts" / "generate_all_docs.py"
+        dirs = list_feature_dirs(specs_dir)
+        index_path = root / "search.sqlite"
+        # Left out of plans and tasks, as by the CLI
+        skip = template_lines([TEMPLATES_DIR / "generated-plan-template.md",
+                               TEMPLATES_DIR / "generated-tasks-template.md"])
+
+        def build():
+            index_path.unlink(missing_ok=True)
+            with SearchIndex(index_path, skip) as index:
+                index.refresh(dirs)
+
+        build_ms = best_ms(build, max(1, args.repeat // 2))
+        with SearchIndex(index_path, skip) as index:
+            refresh_ms = best_ms(lambda: index.refresh(dirs), args.repeat)
+        size = index_path.stat().st_size / 1024 / 1024
+        print(f"{len(dirs)} features: build {build_ms:.0f} ms ({size:.1f} MB), no-op refresh {refresh_ms:.1f} ms\n")
+
+        print(f"{'Query':<20} {'matches':>8} {'query ms':>9} {'cli ms':>8} {'grep ms':>8}  missed")
+        print("-" * 70)
+        missed_total = 0
+        for query in args.queries:
+            with SearchIndex(index_path, skip) as index:
+                hits, matched = index.search(query, limit=10 ** 6)
+                query_ms = best_ms(lambda: index.search(query), args.repeat)
+            # The CLI keeps its index in the copy's cache directory; warm it first
+            cli = [sys.executable, str(generator), "search", *query.split()]
+            subprocess.run(cli, cwd=root, stdout=subprocess.DEVNULL, check=True)
+            cli_ms = best_ms(lambda: subprocess.run(cli, cwd=root, stdout=subprocess.DEVNULL), args.repeat)
+            grep_ms = best_ms(lambda: grep_features(specs_dir, query), args.repeat)
+            missed = grep_features(specs_dir, query) - {hit.feature for hit in hits}
+            missed_total += len(missed)
+            print(f"{query:<20} {matched:>8} {query_ms:>9.2f} {cli_ms:>8.1f} {grep_ms:>8.1f}  "
+                  f"{', '.join(sorted(missed)[:3]) or '-'}")
+    return 0 if missed_total == 0 else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
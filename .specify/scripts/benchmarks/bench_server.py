@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Benchmark: requests through `generate_all_docs.py serve` vs one process per call
+
+Starts a server on a copy of the scripts (specs/ is symlinked, and only
+read-only methods are called) and times each request three ways:
+
+    cold      speckit_client.py --in-process: interpreter start-up, imports,
+              scan, template compilation and parsing on every call
+    client    speckit_client.py talking to the server (start-up of the thin
+              client plus the request)
+    call      speckit.server.call() from a caller that is already running,
+              e.g. an editor plugin: the request alone
+
+Every result from the server is checked against the in-process one.
+
+Usage:
+    python3 .specify/scripts/benchmarks/bench_server.py [--repeat N] [--feature N]
+"""
+
+import argparse
+import json
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+SPECIFY_DIR = SCRIPTS_DIR.parent
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+from speckit.server import call, is_listening  # noqa: E402
+
+SPECS_DIR = SPECIFY_DIR.parent / "specs"
+
+def best_ms(func: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, (time.perf_counter() - start) * 1000)
+    return best
+
+def main(argv: List[str] = None) -> int:
+    """Time parse/render/validate requests with and without the server"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5, help="runs per measurement (best is kept)")
+    parser.add_argument("--feature", default="001", help="feature the requests are about")
+    args = parser.parse_args(argv)
+
+    requests: List[Dict[str, Any]] = [
+        {"method": "parse", "params": {"feature": args.feature}, "argv": ["parse", args.feature]},
+        {"method": "render", "params": {"feature": args.feature, "output": "tasks"},
+         "argv": ["render", args.feature, "--output", "tasks"]},
+        {"method": "validate", "params": {"features": [args.feature], "strict": False},
+         "argv": ["validate", args.feature]},
+    ]
+
+    with tempfile.TemporaryDirectory(prefix="speckit-serve-") as tmp:
+        root = Path(tmp)
+        shutil.copytree(SCRIPTS_DIR, root / ".specify" / "scripts",
+                        ignore=shutil.ignore_patterns("__pycache__", "benchmarks"))
+        shutil.copytree(SPECIFY_DIR / "templates", root / ".specify" / "templates")
+        (root / "specs").symlink_to(SPECS_DIR)
+        client = [sys.executable, str(root / ".specify" / "scripts" / "speckit_client.py")]
+        socket_path = root / ".specify" / "cache" / "speckit.sock"
+
+        start = time.perf_counter()
+        server = subprocess.Popen([sys.executable, str(root / ".specify" / "scripts" / "generate_all_docs.py"),
+                                   "serve"], cwd=root, stdout=subprocess.DEVNULL)
+        try:
+            while not is_listening(socket_path):
+                if server.poll() is not None or time.perf_counter() - start > 30:
+                    print("❌ The server did not start")
+                    return 1
+                time.sleep(0.01)
+            print(f"Server ready in {(time.perf_counter() - start) * 1000:.0f} ms\n")
+
+            print(f"{'Request':<10} {'cold ms':>9} {'client ms':>10} {'call ms':>8}  same")
+            print("-" * 46)
+            ok = True
+            for request in requests:
+                def run(*extra: str) -> bytes:
+                    return subprocess.run([*client, *request["argv"], *extra], cwd=root,
+                                          capture_output=True).stdout
+                same = json.loads(run()) == json.loads(run("--in-process"))
+                ok = ok and same
+                cold_ms = best_ms(lambda: run("--in-process"), args.repeat)
+                client_ms = best_ms(run, args.repeat)
+                call_ms = best_ms(lambda: call(socket_path, request["method"], request["params"]), args.repeat)
+                print(f"{request['method']:<10} {cold_ms:>9.1f} {client_ms:>10.1f} {call_ms:>8.2f}  "
+                      f"{'✅' if same else '❌'}")
+        finally:
+            server.terminate()
+            server.wait()
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Benchmark: peak memory of generate_all_docs.py with and without --stream
+
+For each corpus size this builds a synthetic project (see corpus.py) and
+runs the generator twice per mode, a cold run that writes every
+plan.md/tasks.md and a warm rerun that skips everything. Between modes the
+generated docs and .specify/cache are removed, and the docs written by both
+modes are checked to be identical. Peak RSS comes from wait4().
+
+A default run should grow with the corpus; a --stream run should stay
+about flat from 1k to 100k features.
+
+Usage:
+    python3 .specify/scripts/benchmarks/bench_stream.py [--features 1000,10000,100000] [--jobs N]
+
+100k features need about 5 GB of temporary disk space. Exits 1 if the
+two modes write different docs.
+"""
+
+import argparse
+import hashlib
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from corpus import CorpusShape, build_corpus  # noqa: E402
+
+GENERATED = ("plan.md", "tasks.md")
+
+def run(root: Path, *extra: str) -> Dict[str, float]:
+    """Run the corpus copy of generate_all_docs.py; seconds and peak RSS in MiB"""
+    script = root / ".specify" / "scripts" / "generate_all_docs.py"
+    start = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, str(script), *extra], cwd=root, stdout=subprocess.DEVNULL)
+    _, status, usage = os.wait4(proc.pid, 0)
+    seconds = time.perf_counter() - start
+    if os.waitstatus_to_exitcode(status) != 0:
+        raise RuntimeError(f"generate_all_docs.py {' '.join(extra)} exited {os.waitstatus_to_exitcode(status)}")
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    rss_kb = usage.ru_maxrss // 1024 if sys.platform == "darwin" else usage.ru_maxrss
+    return {"seconds": seconds, "rss_mib": rss_kb / 1024}
+
+def digest_and_reset(root: Path) -> str:
+    """Hash every generated doc, then remove them and the caches for the next mode"""
+    digest = hashlib.blake2b()
+    with os.scandir(root / "specs") as entries:
+        for entry in sorted(entries, key=lambda e: e.name):
+            for name in GENERATED:
+                path = Path(entry.path) / name
+                if path.exists():
+                    digest.update(f"{entry.name}/{name}\0".encode())
+                    digest.update(path.read_bytes())
+                    path.unlink()
+    shutil.rmtree(root / ".specify" / "cache", ignore_errors=True)
+    return digest.hexdigest()
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Compare peak RSS and time of default and --stream runs across corpus sizes"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--features", default="1000,10000,100000", help="comma-separated corpus sizes")
+    parser.add_argument("--jobs", type=int, default=1, help="--jobs passed to generate_all_docs.py")
+    args = parser.parse_args(argv)
+    jobs = ["--jobs", str(args.jobs)]
+
+    print(f"{'Features':>9} {'mode':<9} {'cold s':>8} {'cold MiB':>9} {'warm s':>8} {'warm MiB':>9}  same")
+    print("-" * 64)
+    ok = True
+    for size in (int(s) for s in args.features.split(",")):
+        with tempfile.TemporaryDirectory(prefix="speckit-stream-") as tmp:
+            root = Path(tmp)
+            build_corpus(root, CorpusShape(features=size))
+            digests = {}
+            for mode, extra in (("default", jobs), ("--stream", [*jobs, "--stream"])):
+                cold = run(root, *extra)
+                warm = run(root, *extra)
+                digests[mode] = digest_and_reset(root)
+                same = len(set(digests.values())) == 1
+                ok = ok and same
+                print(f"{size:>9} {mode:<9} {cold['seconds']:>8.1f} {cold['rss_mib']:>9.1f} "
+                      f"{warm['seconds']:>8.1f} {warm['rss_mib']:>9.1f}  {'✅' if same else '❌'}", flush=True)
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
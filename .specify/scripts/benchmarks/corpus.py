@@ -0,0 +1,115 @@
+"""
+Synthetic spec corpora for generator benchmarks
+
+Builds a throwaway project root shaped like this repository (specs/ plus a
+copy of .specify/scripts and .specify/templates) filled with generated
+spec.md files, so the real generate_all_docs.py can be run against it end
+to end without touching the repository's own specs/.
+"""
+
+import random
+import shutil
+from dataclasses import dataclass
+from pathlib import Path
+
+SPECIFY_DIR = Path(__file__).resolve().parent.parent.parent
+
+WORDS = (
+    "campaign budget creative audience attribution pacing bid keyword feed "
+    "product report alert anomaly forecast segment cohort insight workflow "
+    "approval dashboard export sync channel conversion revenue margin signal "
+    "journey device currency influencer catalog experiment lift score"
+).split()
+
+STATUSES = ("Draft", "Pending", "In Progress", "Implemented")
+
+@dataclass
+class CorpusShape:
+    """Size and shape of a synthetic corpus"""
+    features: int = 100
+    stories: int = 3
+    entities: int = 6
+    requirements: int = 12
+    # Extra paragraphs of filler prose per user story
+    prose: int = 2
+    # Fraction of specs built to hit worst cases (repeated Key Entities
+    # headings without a blank line, very long lines)
+    pathological: float = 0.0
+    seed: int = 1
+
+    def label(self) -> str:
+        return (f"{self.features}f-{self.stories}s-{self.entities}e-{self.requirements}r"
+                f"{'-path' if self.pathological else ''}")
+
+def _words(rng: random.Random, count: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(count))
+
+def _entity_name(rng: random.Random, index: int) -> str:
+    return "".join(w.title() for w in (rng.choice(WORDS), rng.choice(WORDS))) + str(index)
+
+def render_spec(number: int, slug: str, shape: CorpusShape, rng: random.Random, pathological: bool = False) -> str:
+    """Return the text of one synthetic spec.md"""
+    title = slug.split("-", 1)[1].replace("-", " ").title()
+    parts = [
+        f"# Feature Specification: {title}\n\n",
+        f"**Feature Branch**: `[{slug}]`\n",
+        "**Created**: 2025-01-01\n",
+        f"**Status**: {rng.choice(STATUSES)}\n",
+        f"**Input**: User description: \"{_words(rng, 20)}\"\n\n",
+        "## User Scenarios & Testing *(mandatory)*\n\n",
+    ]
+    for story in range(1, shape.stories + 1):
+        parts.append(f"### User Story {story} - {_words(rng, 4)} (Priority: P{min(story, 3)})\n\n")
+        for _ in range(shape.prose):
+            parts.append(_words(rng, 40) + ".\n\n")
+        parts.append("**Acceptance Scenarios**:\n\n")
+        for scenario in range(1, 4):
+            parts.append(f"{scenario}. **Given** {_words(rng, 6)}, **When** {_words(rng, 6)}, "
+                         f"**Then** {_words(rng, 10)}.\n")
+        parts.append("\n---\n\n")
+
+    parts.append("## Requirements *(mandatory)*\n\n### Functional Requirements\n\n")
+    for fr in range(1, shape.requirements + 1):
+        parts.append(f"- **FR-{fr:03d}**: System MUST {_words(rng, 12)}\n")
+
+    entities = [_entity_name(rng, i) for i in range(shape.entities)]
+    if pathological:
+        # Bullets directly under each heading: the worst case for the old
+        # DOTALL entity search, plus one very long line
+        parts.append("\n")
+        for entity in entities * 50:
+            parts.append(f"### Key Entities\n- **{entity}**: {_words(rng, 8)}\n")
+        parts.append("\n" + _words(rng, 20000) + "\n")
+    else:
+        parts.append("\n### Key Entities\n\n")
+        for entity in entities:
+            parts.append(f"- **{entity}**: {_words(rng, 10)}\n")
+
+    parts.append("\n## Success Criteria *(mandatory)*\n\n")
+    for sc in range(1, 4):
+        parts.append(f"- **SC-{sc:03d}**: {_words(rng, 10)}\n")
+    return "".join(parts)
+
+def build_corpus(root: Path, shape: CorpusShape) -> Path:
+    """Create a project root with a synthetic specs/ tree and return its specs dir"""
+    rng = random.Random(shape.seed)
+    specs_dir = root / "specs"
+    specs_dir.mkdir(parents=True, exist_ok=True)
+
+    specify = root / ".specify"
+    for sub in ("scripts", "templates", "memory"):
+        if (SPECIFY_DIR / sub).is_dir() and not (specify / sub).exists():
+            shutil.copytree(
+                SPECIFY_DIR / sub,
+                specify / sub,
+                ignore=shutil.ignore_patterns("__pycache__", "benchmarks"),
+            )
+
+    every = int(1 / shape.pathological) if shape.pathological else 0
+    for number in range(1, shape.features + 1):
+        slug = f"{number:03d}-{rng.choice(WORDS)}-{rng.choice(WORDS)}"
+        feature_dir = specs_dir / slug
+        feature_dir.mkdir()
+        pathological = bool(every) and number % every == 0
+        (feature_dir / "spec.md").write_text(render_spec(number, slug, shape, rng, pathological))
+    return specs_dir
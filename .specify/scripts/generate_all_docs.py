@@ -1,981 +1,1827 @@
 #!/usr/bin/env python3
 """
 Automated Plan and Tasks Generator for OmniAds Features
-Generates plan.md and tasks.md files for all features missing documentation
+Generates plan.md and tasks.md files for all features missing documentation,
+and regenerates previously generated ones whose spec.md has changed
+(tracked in .specify/cache/manifest.json), and keeps a queryable index of
+every spec in .specify/cache/specs.sqlite
+
+Usage:
+    python3 .specify/scripts/generate_all_docs.py [--jobs N] [--force] [--adopt] [--watch [--poll]]
+        [--since REF | --staged] [--export FORMAT[,FORMAT]] [--export-dir DIR]
+        [--timings] [--metrics-json FILE] [--profile FILE] [--shard I/N] [--stream]
+    python3 .specify/scripts/generate_all_docs.py query [--priority P1] [--entity NAME]
+        [--status STATUS] [--requirement TEXT] [--sql QUERY] [--json]
+    python3 .specify/scripts/generate_all_docs.py validate [--feature N] [--since REF | --staged]
+        [--jobs N] [--strict] [--json]
+    python3 .specify/scripts/generate_all_docs.py search QUERY... [--limit N] [--any] [--json]
+    python3 .specify/scripts/generate_all_docs.py dedupe [--threshold J] [--near J] [--json]
+    python3 .specify/scripts/generate_all_docs.py agent-context [AGENT]
+    python3 .specify/scripts/generate_all_docs.py merge-results FILE... [--timings] [--metrics-json FILE]
+    python3 .specify/scripts/generate_all_docs.py serve [--socket PATH]
+    python3 .specify/scripts/generate_all_docs.py impact [FILE... | --since REF | --staged] [--project NAME] [--json]
+    python3 .specify/scripts/generate_all_docs.py progress [--feature N] [--incomplete] [--json]
+    python3 .specify/scripts/generate_all_docs.py schedule [--workers N] [--feature N] [--limit N] [--json]
+    python3 .specify/scripts/generate_all_docs.py allocate SLUG [--number N] [--json]
 """
 
+import argparse
+import json
 import os
-import re
+import sys
+import time
+from itertools import repeat
 from pathlib import Path
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import TYPE_CHECKING, List, Dict, Any, Iterator, Optional, Set, Tuple
+
+# Only the light modules most commands share are imported here. The others
+# (SQLite indexes, the constitution, templates, pools, and each command's own
+# module) are imported where they are used, so a command like agent-context
+# or allocate starts without them; the types annotations name from those
+# modules are imported for type checkers only
+from speckit.changes import GitError, changed_features, changed_paths, staged_specs
+from speckit.dedupe import DEFAULT_THRESHOLD, NEAR_THRESHOLD
+from speckit.output import output_digest, write_chunks_if_changed, write_if_changed
+from speckit.metrics import FeatureTimer, RunMetrics
+from speckit.parser import FeatureInfo, parse_feature, parse_lines, parse_spec
+from speckit.renderers import (
+    DOC, FILE, RENDERERS, ROW, Renderer, doc_renderers, export_names, export_renderers, output_name,
+    register_renderer,
+)
+from speckit.scan import (
+    STATUSES, FeatureScan, count_statuses, iter_feature_scans, list_feature_dirs, scan_feature, scan_features,
+)
+
+if TYPE_CHECKING:
+    from speckit.manifest import Manifest
+    from speckit.validate import SpecCheck
 
 # Project root
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 SPECS_DIR = PROJECT_ROOT / "specs"
 CONSTITUTION_PATH = PROJECT_ROOT / ".specify" / "memory" / "constitution.md"
-
-# Tech stack from constitution
-TECH_STACK = {
-    "backend": {
-        "framework": "NestJS 10.3.0+",
-        "database": "PostgreSQL 14+ with TypeORM 0.3.19+",
-        "auth": "JWT + Passport.js + bcrypt",
-        "ai": "Anthropic Claude API or OpenAI API",
-        "testing": "Jest 30.2.0+",
-    },
-    "frontend": {
-        "framework": "React 18.2.0+ with TypeScript 5.3.3+",
-        "build": "Vite 5.0.11+",
-        "ui": "shadcn/ui (Radix UI) + Tailwind CSS 3.4.1+",
-        "charts": "Recharts 2.10.3+",
-        "state": "Zustand 4.4.7+",
-        "routing": "React Router v6.21.1+",
-        "testing": "Vitest 4.0.7+ + React Testing Library 16.3.0+",
-    }
-}
+TEMPLATES_DIR = PROJECT_ROOT / ".specify" / "templates"
+CACHE_DIR = PROJECT_ROOT / ".specify" / "cache"
+MANIFEST_PATH = CACHE_DIR / "manifest.json"
+MANIFEST_DB_PATH = CACHE_DIR / "manifest.sqlite"
+INDEX_PATH = CACHE_DIR / "specs.sqlite"
+SEARCH_INDEX_PATH = CACHE_DIR / "search.sqlite"
+PROGRESS_PATH = CACHE_DIR / "progress.sqlite"
+SOCKET_PATH = CACHE_DIR / "speckit.sock"
+IMPACT_PATH = CACHE_DIR / "impact.json"
+CONSTITUTION_CACHE_PATH = CACHE_DIR / "constitution.json"
+EXPORT_DIR = CACHE_DIR / "export"
+
+PLAN_TEMPLATE = TEMPLATES_DIR / "generated-plan-template.md"
+TASKS_TEMPLATE = TEMPLATES_DIR / "generated-tasks-template.md"
+HTML_TEMPLATE = TEMPLATES_DIR / "generated-feature-template.html"
+
+# Bump whenever the render context or template syntax changes, so previously
+# generated docs are detected as stale and regenerated; template edits are
+# picked up through TEMPLATE_INPUTS, and changes to the constitution values
+# a renderer's template uses through generator_inputs()
+GENERATOR_VERSION = "1.2.0"
+TEMPLATE_INPUTS = [PLAN_TEMPLATE, TASKS_TEMPLATE, HTML_TEMPLATE]
+# The template of each template-backed renderer, by renderer name
+RENDERER_TEMPLATES = {"plan": PLAN_TEMPLATE, "tasks": TASKS_TEMPLATE, "html": HTML_TEMPLATE}
+
+# Features recorded in the manifest and spec index per commit with --stream
+STREAM_BATCH = 256
 
 def extract_feature_info(spec_path: Path) -> Dict[str, Any]:
     """Extract key information from spec.md"""
-    with open(spec_path, 'r') as f:
-        content = f.read()
-
-    info = {
-        "name": "",
-        "number": "",
-        "status": "Pending",
-        "user_stories": [],
-        "entities": [],
-        "requirements": [],
+    return parse_spec(spec_path)
+
+def doc_context(spec_info: Dict[str, Any], feature_dir: str) -> Dict[str, Any]:
+    """Build the template context for a feature's generated docs"""
+    from speckit.constitution import load_constitution
+
+    context = dict(spec_info)
+    context["slug"] = feature_dir.split('/')[-1]
+    context["today"] = datetime.now().strftime('%Y-%m-%d')
+    context["constitution"] = load_constitution(CONSTITUTION_PATH, CONSTITUTION_CACHE_PATH)
+    return context
+
+def constitution_values() -> Dict[str, Any]:
+    """The constitution values the templates use; raises ConstitutionError"""
+    from speckit.constitution import load_constitution, template_references, used_values
+
+    config = load_constitution(CONSTITUTION_PATH, CONSTITUTION_CACHE_PATH)
+    return used_values(config, template_references(TEMPLATE_INPUTS))
+
+def generator_inputs(values: Optional[Dict[str, Any]] = None) -> Dict[str, str]:
+    """Fingerprints of everything but spec.md that shapes the generated docs.
+
+    "" covers the generator version and the templates, which every output
+    depends on; each template-backed renderer's name covers the
+    constitution values its own template uses, so a changed value only
+    makes the outputs that show it stale.
+    """
+    from speckit.constitution import template_references
+    from speckit.manifest import inputs_fingerprint
+
+    values = constitution_values() if values is None else values
+    inputs = {"": inputs_fingerprint(GENERATOR_VERSION, TEMPLATE_INPUTS)}
+    for name, template in RENDERER_TEMPLATES.items():
+        used = {reference: values[reference] for reference in template_references([template])}
+        inputs[name] = inputs_fingerprint(GENERATOR_VERSION, [], used)
+    return inputs
+
+def generate_plan_md(spec_info: Dict[str, Any], feature_dir: str, write=None) -> str:
+    """Generate plan.md content (or pass it to write in chunks)"""
+    from speckit.templates import render_template
+
+    return render_template(PLAN_TEMPLATE, doc_context(spec_info, feature_dir), write)
+
+def generate_tasks_md(spec_info: Dict[str, Any], feature_dir: str, write=None) -> str:
+    """Generate tasks.md content (or pass it to write in chunks)"""
+    from speckit.templates import render_template
+
+    return render_template(TASKS_TEMPLATE, doc_context(spec_info, feature_dir), write)
+
+def generate_feature_html(spec_info: Dict[str, Any], feature_dir: str) -> str:
+    """Generate the HTML export of a feature"""
+    from speckit.templates import render_template
+
+    return render_template(HTML_TEMPLATE, doc_context(spec_info, feature_dir))
+
+# Docs first, in the order they are reported; see speckit.renderers for json/csv
+register_renderer(Renderer("plan", "plan.md", lambda info: generate_plan_md(info.as_dict(), info.feature), DOC,
+                           stream=lambda info, write: generate_plan_md(info.as_dict(), info.feature, write)))
+register_renderer(Renderer("tasks", "tasks.md", lambda info: generate_tasks_md(info.as_dict(), info.feature), DOC,
+                           stream=lambda info, write: generate_tasks_md(info.as_dict(), info.feature, write)))
+register_renderer(Renderer("html", "{feature}.html", lambda info: generate_feature_html(info.as_dict(), info.feature)))
+
+def process_feature(
+    feature: FeatureScan,
+    entry: Optional[Dict[str, Any]] = None,
+    inputs: Optional[Dict[str, str]] = None,
+    force: bool = False,
+    timed: bool = False,
+    exports: Tuple[str, ...] = (),
+    export_dir: Optional[Path] = None,
+    stream: bool = False,
+    staged_spec: Optional[bytes] = None,
+    adopt: bool = False,
+) -> Dict[str, Any]:
+    """Parse, render and write the docs and exports for one feature directory.
+
+    Runs in the parent process or in a pool worker, so it never prints:
+    log lines, stat increments and the updated manifest entry are returned
+    for main() to report and persist in directory order.
+
+    Missing docs are always generated. Existing docs are regenerated only if
+    the manifest says the generator wrote them and spec.md, the generator
+    and templates, or the constitution values used by that doc's template
+    (see generator_inputs()) have changed since; anything else is treated
+    as hand-authored.
+    An existing doc the generator does not own yet (hand-authored, or
+    written before the manifest) is compared once against the render of
+    the spec recorded for it and taken over if they match; if they do not,
+    its feature is listed under "unowned" whenever spec.md changes, and
+    adopt=True (--adopt) regenerates it and takes it over regardless.
+    Exports (see speckit.renderers) are re-rendered under the same rules,
+    minus the hand-edit protection.
+
+    spec.md is parsed at most once, and only if some output needs it or it
+    changed; the FeatureInfo is returned under "info" so the spec index can
+    reuse it instead of parsing again.
+
+    Which docs exist comes from the directory scan in `feature`, so the
+    only syscall for an up-to-date feature is the manifest's stat of
+    spec.md.
+
+    With timed=True the result also carries per-phase timings and byte
+    counts under "metrics".
+
+    With stream=True (--stream) spec.md is parsed line by line as it is
+    read, and docs with a streaming renderer are written chunk by chunk
+    (see speckit.output.write_chunks_if_changed), so neither the spec nor a
+    whole rendered doc is held in memory; reading is then timed as parsing
+    and rendering as writing.
+
+    staged_spec is the index copy of spec.md (--staged with unstaged
+    changes on top, see speckit.changes.staged_specs); the docs are then
+    rendered from it instead of from the working-tree file.
+    """
+    from speckit.manifest import check_spec, check_staged_spec
+    from speckit.templates import fragment_counts
+
+    spec_dir = feature.path
+    feature_name = spec_dir.name
+    spec_file = spec_dir / "spec.md"
+    present = {"plan.md": feature.has_plan, "tasks.md": feature.has_tasks}
+
+    result = {
+        "feature": feature_name,
+        "log": [],
+        "stats": {
+            "plan_generated": 0,
+            "tasks_generated": 0,
+            "written": 0,
+            "unchanged": 0,
+            "skipped": 0,
+            "errors": 0,
+            "exported": 0,
+        },
+        "entry": entry,
+        "info": None,
+        "unowned": [],
     }
+    log = result["log"]
+    stats = result["stats"]
+    timer = FeatureTimer(timed)
+    bytes_read = bytes_written = 0
+
+    # Skip if spec.md doesn't exist
+    if not feature.has_spec:
+        log.append(f"⚠️  {feature_name}: No spec.md found, skipping")
+        stats["skipped"] += 1
+        result["entry"] = None
+        return result
+
+    try:
+        if staged_spec is None:
+            spec_changed, spec = check_spec(entry, spec_file)
+        else:
+            spec_changed, spec = check_staged_spec(entry, staged_spec)
+        outputs = dict(entry["outputs"]) if entry else {}
+        inputs = inputs or {}
+        recorded = entry.get("inputs") if entry else None
+        # Entries written before per-renderer inputs hold one fingerprint
+        recorded = recorded if isinstance(recorded, dict) else {}
+        stale = force or spec_changed or entry is None or recorded.get("") != inputs.get("")
+
+        def changed(renderer: str) -> bool:
+            return stale or recorded.get(renderer) != inputs.get(renderer)
+
+        # Exports rendered from an older spec or other inputs are forgotten,
+        # requested or not
+        exported = {name: output for name, output in (entry or {}).get("exports", {}).items() if not changed(name)}
+
+        # Unowned docs already found to differ from the render of the recorded spec
+        authored = {doc for doc in (entry or {}).get("authored", []) if doc not in outputs}
+        pending = {}
+        steps = []
+        candidates = []
+        for renderer in doc_renderers():
+            doc_file = spec_dir / renderer.output
+            exists = present[renderer.output] if renderer.output in present else doc_file.exists()
+            if not exists:
+                outputs.pop(renderer.output, None)
+                pending[renderer.output] = "created"
+            elif changed(renderer.name) and renderer.output in outputs:
+                if not force and output_digest(doc_file.read_text()) != outputs[renderer.output]:
+                    # Edited since we wrote it: it belongs to the author now
+                    del outputs[renderer.output]
+                    steps.append(f"⚠️  {renderer.output} was edited by hand, leaving it untouched")
+                else:
+                    pending[renderer.output] = "regenerated"
+            elif renderer.output in outputs:
+                continue
+            elif adopt:
+                authored.discard(renderer.output)
+                pending[renderer.output] = "regenerated and taken over"
+            elif entry is None or not spec_changed:
+                # Once per recorded spec: is it what the generator would have written?
+                if renderer.output not in authored and (entry is None or not changed(renderer.name)):
+                    candidates.append(renderer)
+            else:
+                authored.discard(renderer.output)
+                result["unowned"].append(renderer.output)
+                steps.append(f"⚠️  spec.md changed but {renderer.output} is not generator-owned, "
+                             "leaving it untouched (--adopt regenerates it)")
+
+        needed = [
+            renderer for renderer in export_renderers(list(exports))
+            if renderer.name not in exported
+            or (renderer.kind == FILE and not (export_dir / output_name(renderer, feature_name)).exists())
+        ]
+        timer.lap("check")
+    except Exception as e:
+        log.append(f"\n📝 Processing {feature_name}...")
+        log.append(f"   └─ ❌ Error: {str(e)}")
+        stats["errors"] += 1
+        return result
+
+    new_entry = {"inputs": inputs, "spec": spec, "outputs": outputs}
+    if exported or needed:
+        new_entry["exports"] = exported
+
+    kept = bool(steps)
+    processing = bool(pending or steps)
+    if processing:
+        log.append(f"\n📝 Processing {feature_name}...")
+    fragments = fragment_counts() if timed else None
+    try:
+        if (pending or needed or spec_changed or candidates) and stream:
+            with open(spec_file, 'r') as f:
+                bytes_read = os.fstat(f.fileno()).st_size
+                info = FeatureInfo.from_dict(feature_name, parse_lines(f))
+            result["info"] = info
+            timer.lap("parse")
+        elif pending or needed or spec_changed or candidates:
+            # The one read and parse of spec.md, shared by every renderer
+            if staged_spec is not None:
+                content = staged_spec.decode()
+                bytes_read = len(staged_spec)
+            else:
+                with open(spec_file, 'r') as f:
+                    content = f.read()
+                    bytes_read = os.fstat(f.fileno()).st_size
+            timer.lap("read")
+            info = parse_feature(feature_name, content)
+            result["info"] = info
+            timer.lap("parse")
+
+        for renderer in candidates:
+            digest = output_digest(renderer.render(info))
+            timer.lap("render")
+            if output_digest((spec_dir / renderer.output).read_text()) != digest:
+                authored.add(renderer.output)
+                continue
+            outputs[renderer.output] = digest
+            if not processing:
+                log.append(f"\n📝 Processing {feature_name}...")
+                processing = True
+            steps.append(f"✓ {renderer.output} matches the generator's output, taken over")
+        if authored:
+            new_entry["authored"] = sorted(authored)
+
+        if pending:
+            for renderer in doc_renderers():
+                doc = renderer.output
+                if doc not in pending:
+                    steps.append(f"{doc} already exists")
+                    continue
+                steps.append(f"Generating {doc}...")
+                if stream and renderer.stream:
+                    written, outputs[doc] = write_chunks_if_changed(
+                        spec_dir / doc, lambda write, renderer=renderer: renderer.stream(info, write))
+                    timer.lap("write")
+                    size = (spec_dir / doc).stat().st_size if written and timed else 0
+                else:
+                    doc_content = renderer.render(info)
+                    timer.lap("render")
+                    written, outputs[doc] = write_if_changed(spec_dir / doc, doc_content)
+                    timer.lap("write")
+                    size = len(doc_content.encode())
+                stats[f"{renderer.name}_generated"] = stats.get(f"{renderer.name}_generated", 0) + 1
+                if written:
+                    bytes_written += size
+                    stats["written"] += 1
+                    steps.append(f"✓ {doc} {pending[doc]}")
+                else:
+                    stats["unchanged"] += 1
+                    steps.append(f"= {doc} unchanged, write skipped")
+        elif kept:
+            steps.append("plan.md and tasks.md kept as authored")
+            stats["skipped"] += 1
+        elif steps:
+            stats["skipped"] += 1
+        else:
+            log.append(f"✅ {feature_name}: Already has complete documentation")
+            stats["skipped"] += 1
 
-    # Extract feature name from title
-    title_match = re.search(r'# Feature Specification: (.+)', content)
-    if title_match:
-        info["name"] = title_match.group(1)
-
-    # Extract feature number from branch
-    branch_match = re.search(r'\*\*Feature Branch\*\*: `\[(\d+)-', content)
-    if branch_match:
-        info["number"] = branch_match.group(1)
-
-    # Extract status
-    status_match = re.search(r'\*\*Status\*\*: (.+)', content)
-    if status_match:
-        info["status"] = status_match.group(1).strip()
-
-    # Extract user stories
-    user_story_pattern = r'### User Story \d+ - (.+?) \(Priority: (P\d)\)'
-    for match in re.finditer(user_story_pattern, content):
-        info["user_stories"].append({
-            "title": match.group(1),
-            "priority": match.group(2)
-        })
-
-    # Extract entities
-    entity_section = re.search(r'### Key Entities.*?\n\n((?:- \*\*\w+\*\*:.+\n?)+)', content, re.DOTALL)
-    if entity_section:
-        entity_lines = entity_section.group(1).strip().split('\n')
-        for line in entity_lines:
-            entity_match = re.match(r'- \*\*(\w+)\*\*:', line)
-            if entity_match:
-                info["entities"].append(entity_match.group(1))
-
-    # Extract functional requirements
-    fr_pattern = r'- \*\*FR-\d+\*\*: (.+)'
-    info["requirements"] = re.findall(fr_pattern, content)
-
-    return info
-
-def generate_plan_md(spec_info: Dict[str, Any], feature_dir: str) -> str:
-    """Generate plan.md content"""
-    feature_name_slug = feature_dir.split('/')[-1]
-    today = datetime.now().strftime('%Y-%m-%d')
-
-    plan = f"""# Implementation Plan: {spec_info['name']}
-
-**Feature**: {feature_name_slug}
-**Tech Stack**: NestJS, TypeScript, PostgreSQL, TypeORM, React, Vite, Tailwind CSS
-**Created**: {today}
-**Status**: {spec_info['status']}
-
-## Overview
-
-{spec_info['name']} - A comprehensive feature implementation following OmniAds architecture patterns and tech stack requirements.
-
-## Architecture
-
-### Backend Architecture
-
-**Module Structure**:
-```
-backend/src/{feature_name_slug}/
-├── {feature_name_slug}.module.ts
-├── {feature_name_slug}.service.ts
-├── {feature_name_slug}.controller.ts
-├── dto/
-│   ├── create-{feature_name_slug}.dto.ts
-│   └── update-{feature_name_slug}.dto.ts
-└── entities/
-"""
-
-    # Add entities
-    for entity in spec_info['entities']:
-        plan += f"    ├── {entity.lower()}.entity.ts\n"
-
-    plan += """```
-
-**Tech Stack**:
-- Framework: NestJS 10.3.0+ (TypeScript)
-- Database: PostgreSQL 14+ with TypeORM 0.3.19+
-- Authentication: JWT + Passport.js
-- Testing: Jest 30.2.0+
-
-### Frontend Architecture
-
-**Component Structure**:
-```
-frontend/src/
-├── pages/
-│   └── [FeaturePage].tsx
-├── components/
-│   └── [feature]/
-│       ├── [FeatureList].tsx
-│       ├── [FeatureDetail].tsx
-│       └── [FeatureForm].tsx
-└── lib/
-    └── api/
-        └── [feature].ts
-```
-
-**Tech Stack**:
-- Framework: React 18.2.0+ with TypeScript 5.3.3+
-- Build: Vite 5.0.11+
-- UI: shadcn/ui + Tailwind CSS 3.4.1+
-- State: Zustand 4.4.7+
-- Testing: Vitest 4.0.7+ + React Testing Library
-
-### Database Schema
-
-**Entities**:
-
-"""
-
-    for entity in spec_info['entities']:
-        plan += f"""#### {entity}
-
-```typescript
-@Entity('{entity.lower()}s')
-export class {entity} {{
-  @PrimaryGeneratedColumn('uuid')
-  id: string;
-
-  @Column()
-  workspaceId: string;
-
-  @ManyToOne(() => Workspace, workspace => workspace.id)
-  workspace: Workspace;
-
-  @CreateDateColumn()
-  createdAt: Date;
-
-  @UpdateDateColumn()
-  updatedAt: Date;
-}}
-```
-
-"""
-
-    plan += """### API Endpoints
-
-**Base Path**: `/api/v1/[feature-slug]`
-
-| Method | Endpoint | Description | Auth |
-|--------|----------|-------------|------|
-| GET | `/` | List all items | JWT |
-| GET | `/:id` | Get item by ID | JWT |
-| POST | `/` | Create new item | JWT |
-| PUT | `/:id` | Update item | JWT |
-| DELETE | `/:id` | Delete item | JWT |
-| POST | `/:id/process` | Execute feature action | JWT |
-
-## Implementation Phases
-
-### Phase 1: Database & Backend Foundation (Priority: P1)
-
-**Objective**: Set up database entities and basic backend structure
-
-**Tasks**:
-1. Create TypeORM entities for all database models
-2. Generate and run database migrations
-3. Create NestJS module structure
-4. Set up repository pattern for data access
-
-**Testing**: Unit tests for entities and repositories
-
-**Deliverable**: Database schema ready, backend module structure in place
-
----
-
-### Phase 2: Business Logic & Services (Priority: P1)
-
-**Objective**: Implement core business logic
-
-**Tasks**:
-1. Implement service layer with business logic
-2. Add data validation and error handling
-3. Implement required integrations
-4. Add logging and monitoring
-
-**Testing**: Service unit tests with 80%+ coverage
-
-**Deliverable**: Fully functional service layer
-
----
-
-### Phase 3: API Endpoints & Controllers (Priority: P1)
-
-**Objective**: Expose functionality via REST API
-
-**Tasks**:
-1. Create DTOs for request/response validation
-2. Implement controllers with all CRUD operations
-3. Add authentication guards and RBAC
-4. Add request/response interceptors
-5. Document API endpoints
-
-**Testing**: Controller unit tests, integration tests for endpoints
-
-**Deliverable**: Complete REST API with authentication
-
----
-
-### Phase 4: Frontend Components & UI (Priority: P2)
-
-**Objective**: Build user interface
-
-**Tasks**:
-1. Create page layouts and routing
-2. Build UI components using shadcn/ui
-3. Implement forms with validation
-4. Add state management with Zustand
-5. Integrate with backend API
-6. Add loading states and error handling
-
-**Testing**: Component tests with Vitest and React Testing Library
-
-**Deliverable**: Fully functional UI
-
----
-
-### Phase 5: Integration & Testing (Priority: P2)
-
-**Objective**: End-to-end testing and quality assurance
-
-**Tasks**:
-1. Run full test suite (backend + frontend)
-2. Verify test coverage meets 80%+ threshold
-3. Manual testing of all user flows
-4. Fix any bugs discovered
-5. Performance testing and optimization
-
-**Testing**: Integration tests, E2E tests, manual QA
-
-**Deliverable**: Feature tested and ready for deployment
-
----
-
-### Phase 6: Documentation & Deployment (Priority: P3)
-
-**Objective**: Document and prepare for production
-
-**Tasks**:
-1. Update README.md with feature description
-2. Document API endpoints
-3. Add inline code comments
-4. Update architecture documentation
-5. Verify Docker deployment works
-6. Create deployment checklist
-
-**Deliverable**: Complete documentation, deployment-ready feature
-
----
-
-## Dependencies
-
-### External Dependencies
-- PostgreSQL database
-- NestJS framework
-- React framework
-- TypeORM
-- JWT authentication system
-
-### Internal Dependencies
-- User authentication module
-- Workspace management
-- Database connection
-
-### Feature Dependencies
-None (standalone feature)
-
-## Risk Assessment
-
-### Technical Risks
-- **Complexity**: Medium - Standard CRUD operations with business logic
-- **Performance**: Monitor database query performance with proper indexing
-- **Integration**: Ensure proper error handling for all external calls
-
-### Mitigation Strategies
-- Use database indexes for frequently queried fields
-- Implement caching where appropriate
-- Add comprehensive error handling and logging
-- Use transactions for multi-step operations
-
-## Testing Strategy
-
-### Unit Tests
-- **Backend**: Jest tests for services, controllers (80%+ coverage)
-- **Frontend**: Vitest tests for components, utilities (80%+ coverage)
-- **Focus**: Business logic, edge cases, error handling
-
-### Integration Tests
-- API endpoint tests
-- Database integration tests
-- Authentication flow tests
-
-### E2E Tests
-- Critical user journeys
-- Complete workflows from UI to database
-
-## Success Criteria
-
-### Functional
-- All acceptance criteria from spec.md met
-- All user stories implemented and working
-- All API endpoints functional
-
-### Technical
-- Backend build succeeds: `cd backend && npm run build`
-- Frontend build succeeds: `cd frontend && npm run build`
-- All tests pass: `npm test`
-- Test coverage ≥ 80% (statements, functions, lines)
-- Test coverage ≥ 75% (branches)
-
-### Quality
-- No TypeScript `any` types
-- All endpoints have input validation
-- Proper error handling throughout
-- Code follows ESLint rules
-- Code formatted with Prettier
-
-### Performance
-- API response time < 200ms for simple queries
-- Database queries optimized with indexes
-- Frontend renders without lag
-
-## Timeline Estimate
-
-| Phase | Estimated Time |
-|-------|---------------|
-| Phase 1: Database & Backend Foundation | 1-2 days |
-| Phase 2: Business Logic & Services | 2-3 days |
-| Phase 3: API Endpoints & Controllers | 1-2 days |
-| Phase 4: Frontend Components & UI | 2-3 days |
-| Phase 5: Integration & Testing | 1-2 days |
-| Phase 6: Documentation & Deployment | 1 day |
-| **Total** | **8-13 days** |
-
-**Parallel Opportunities**:
-- Frontend work can start after Phase 3 completes
-- Documentation can be written alongside implementation
-
-## Constitution Compliance
-
-This implementation plan adheres to all requirements in `.specify/memory/constitution.md`:
-
-✅ Uses approved tech stack (NestJS, React, PostgreSQL, TypeORM)
-✅ Includes comprehensive unit testing (80%+ coverage)
-✅ Updates documentation synchronously
-✅ Includes quality gates (tests, build, Docker)
-✅ No forbidden practices (no `any` types, no hardcoded secrets)
-✅ Follows code quality standards
-✅ Security standards (JWT auth, input validation)
-
----
-
-**Next Step**: Generate tasks.md using `/speckit-tasks` or automated script
-"""
-
-    return plan
-
-def generate_tasks_md(spec_info: Dict[str, Any], feature_dir: str) -> str:
-    """Generate tasks.md content"""
-    feature_name_slug = feature_dir.split('/')[-1]
-    today = datetime.now().strftime('%Y-%m-%d')
-
-    tasks = f"""# Tasks: {spec_info['name']}
-
-**Feature**: {feature_name_slug}
-**Created**: {today}
-**Status**: {spec_info['status']}
-
-**Input**: Design documents from `specs/{feature_name_slug}/`
-**Prerequisites**: plan.md (required), spec.md (required)
-
-## Task Organization
-
-Tasks are organized by implementation phase to enable systematic development and testing.
-
----
-
-## Phase 1: Setup & Database Foundation
-
-**Purpose**: Establish database schema and basic project structure
-
-### T001: Create Database Entities
-
-**Type**: Database
-**Time Estimate**: 1 day
-**Dependencies**: None
-
-**Acceptance Criteria**:
-"""
-
-    # Add entity creation tasks
-    for entity in spec_info['entities']:
-        tasks += f"- [ ] Create {entity} TypeORM entity with all required columns\n"
-
-    tasks += """- [ ] Define relationships between entities
-- [ ] Add indexes for performance optimization
-- [ ] Add validation decorators
-- [ ] Create database migrations
-
-**Definition of Done**:
-"""
-
-    for entity in spec_info['entities']:
-        tasks += f"- Entity file exists at `backend/src/database/entities/{entity.lower()}.entity.ts`\n"
-
-    tasks += """- Migration files created in `backend/src/migrations/`
-- `npm run migration:run` succeeds
-- All entities properly registered in module
-
----
-
-### T002: Create NestJS Module Structure
-
-**Type**: Backend
-**Time Estimate**: 0.5 days
-**Dependencies**: T001
-
-**Acceptance Criteria**:
-- [ ] Module file created with all imports
-- [ ] Module registered in app.module.ts
-- [ ] Service and controller placeholders created
-- [ ] DTOs directory structure created
-
-**Definition of Done**:
-- Module structure exists at `backend/src/[feature-slug]/`
-- Application starts without errors
-- Module properly imported in root module
-
----
-
-## Phase 2: Business Logic Implementation
-
-**Purpose**: Implement core business logic and data operations
-
-### T003: Implement Service Layer
-
-**Type**: Backend
-**Time Estimate**: 2 days
-**Dependencies**: T002
-
-**Acceptance Criteria**:
-- [ ] CRUD operations implemented (create, findAll, findOne, update, delete)
-- [ ] Business logic for feature-specific operations
-- [ ] Input validation in service methods
-- [ ] Error handling for all edge cases
-- [ ] Proper use of TypeORM repositories
-- [ ] Transaction handling where needed
-
-**Definition of Done**:
-- Service file at `backend/src/[feature-slug]/[feature-slug].service.ts`
-- All methods have proper TypeScript types
-- No `any` types used
-- Logging added for important operations
-
----
-
-### T004: Write Service Unit Tests
-
-**Type**: Testing
-**Time Estimate**: 1.5 days
-**Dependencies**: T003
-
-**Acceptance Criteria**:
-- [ ] Test file created with comprehensive test suite
-- [ ] All service methods tested
-- [ ] Edge cases covered (not found, invalid input, etc.)
-- [ ] Mocks created for repository
-- [ ] Test coverage ≥ 80% for service
-- [ ] All tests pass
-
-**Definition of Done**:
-- Test file at `backend/src/[feature-slug]/[feature-slug].service.spec.ts`
-- `npm test` passes with no failures
-- Coverage report shows ≥ 80% coverage
-
----
-
-## Phase 3: API Layer Implementation
-
-**Purpose**: Expose functionality via REST API endpoints
-
-### T005: Create DTOs and Validation
-
-**Type**: Backend
-**Time Estimate**: 0.5 days
-**Dependencies**: T003
-
-**Acceptance Criteria**:
-- [ ] CreateDto with class-validator decorators
-- [ ] UpdateDto with optional fields
-- [ ] Query/filter DTOs if needed
-- [ ] Response DTOs for data serialization
-- [ ] Validation rules for all fields
-
-**Definition of Done**:
-- DTO files in `backend/src/[feature-slug]/dto/`
-- All DTOs properly exported
-- Validation decorators from class-validator applied
-
----
-
-### T006: Implement Controller Endpoints
-
-**Type**: Backend
-**Time Estimate**: 1.5 days
-**Dependencies**: T005
-
-**Acceptance Criteria**:
-- [ ] GET / endpoint (list all with pagination)
-- [ ] GET /:id endpoint (get by ID)
-- [ ] POST / endpoint (create)
-- [ ] PUT /:id endpoint (update)
-- [ ] DELETE /:id endpoint (delete)
-- [ ] POST /:id/process endpoint (feature-specific action)
-- [ ] JWT authentication guards on all routes
-- [ ] Proper HTTP status codes
-- [ ] Error handling with proper responses
-
-**Definition of Done**:
-- Controller at `backend/src/[feature-slug]/[feature-slug].controller.ts`
-- All endpoints properly decorated
-- Authentication guards applied
-- Swagger/OpenAPI annotations added
-
----
-
-### T007: Write Controller Unit Tests
-
-**Type**: Testing
-**Time Estimate**: 1 day
-**Dependencies**: T006
-
-**Acceptance Criteria**:
-- [ ] Test suite for all controller endpoints
-- [ ] Authentication scenarios tested
-- [ ] Validation error scenarios tested
-- [ ] Success response scenarios tested
-- [ ] Service methods properly mocked
-- [ ] Test coverage ≥ 80%
-
-**Definition of Done**:
-- Test file at `backend/src/[feature-slug]/[feature-slug].controller.spec.ts`
-- All tests pass
-- Coverage threshold met
-
----
-
-## Phase 4: Frontend Implementation
-
-**Purpose**: Build user interface components
-
-### T008: Create API Client
-
-**Type**: Frontend
-**Time Estimate**: 0.5 days
-**Dependencies**: T006
-
-**Acceptance Criteria**:
-- [ ] API client functions for all endpoints
-- [ ] Proper TypeScript types for requests/responses
-- [ ] Error handling
-- [ ] JWT token injection
-- [ ] Request/response interceptors if needed
-
-**Definition of Done**:
-- API client at `frontend/src/lib/api/[feature].ts`
-- All endpoints have corresponding client functions
-- Types properly defined
-
----
-
-### T009: Create UI Components
-
-**Type**: Frontend
-**Time Estimate**: 2 days
-**Dependencies**: T008
-
-**Acceptance Criteria**:
-- [ ] List component for displaying items
-- [ ] Detail component for single item view
-- [ ] Form component for create/update
-- [ ] Delete confirmation dialog
-- [ ] Loading states for async operations
-- [ ] Error states and messages
-- [ ] Use shadcn/ui components
-- [ ] Tailwind CSS styling
-- [ ] Responsive design
-
-**Definition of Done**:
-- Components in `frontend/src/components/[feature]/`
-- All components properly typed
-- Accessible (ARIA attributes)
-
----
-
-### T010: Create Page and Routing
-
-**Type**: Frontend
-**Time Estimate**: 0.5 days
-**Dependencies**: T009
-
-**Acceptance Criteria**:
-- [ ] Main page component created
-- [ ] Route added to router configuration
-- [ ] Navigation link added to sidebar/menu
-- [ ] Page layout matches design system
-- [ ] Protected route (requires authentication)
-
-**Definition of Done**:
-- Page at `frontend/src/pages/[FeaturePage].tsx`
-- Route accessible via `/[feature-slug]`
-- Page renders correctly
-
----
-
-### T011: Implement State Management
-
-**Type**: Frontend
-**Time Estimate**: 1 day
-**Dependencies**: T008
-
-**Acceptance Criteria**:
-- [ ] Zustand store created for feature state
-- [ ] Actions for CRUD operations
-- [ ] Loading and error state management
-- [ ] Selectors for derived state
-- [ ] Store properly typed
-
-**Definition of Done**:
-- Store at `frontend/src/store/[feature].ts`
-- State updates work correctly
-- No console errors
-
----
-
-### T012: Write Frontend Component Tests
-
-**Type**: Testing
-**Time Estimate**: 1.5 days
-**Dependencies**: T009, T010, T011
-
-**Acceptance Criteria**:
-- [ ] Tests for all components
-- [ ] User interaction tests
-- [ ] API integration tests with mocks
-- [ ] Loading and error state tests
-- [ ] Accessibility tests
-- [ ] Test coverage ≥ 80%
-
-**Definition of Done**:
-- Test files in `frontend/src/components/[feature]/`
-- `npm run test:run` passes
-- Coverage threshold met
-
----
-
-## Phase 5: Integration & Quality Assurance
-
-**Purpose**: End-to-end testing and quality verification
-
-### T013: Integration Testing
+        for renderer in needed:
+            rendered = renderer.render(info)
+            timer.lap("render")
+            if renderer.kind == ROW:
+                exported[renderer.name] = rendered
+            else:
+                export_dir.mkdir(parents=True, exist_ok=True)
+                written, exported[renderer.name] = write_if_changed(
+                    export_dir / output_name(renderer, feature_name), rendered
+                )
+                timer.lap("write")
+                if written:
+                    bytes_written += len(rendered.encode())
+            stats["exported"] += 1
+        if needed:
+            names = ", ".join(renderer.name for renderer in needed)
+            if steps:
+                steps.append(f"Exported {names}")
+            else:
+                log[-1] += f" (exported {names})"
+
+        result["entry"] = new_entry
+    except Exception as e:
+        if not processing:
+            log.append(f"\n📝 Processing {feature_name}...")
+        steps.append(f"❌ Error: {str(e)}")
+        stats["errors"] += 1
+
+    for i, step in enumerate(steps):
+        log.append(f"   {'└─' if i == len(steps) - 1 else '├─'} {step}")
+    if timed:
+        result["metrics"] = dict(timer.laps, bytes_read=bytes_read, bytes_written=bytes_written)
+        # Hits depend on what this process rendered before, so they vary with --jobs
+        for key, count in fragment_counts().items():
+            result["metrics"][f"worker_fragment_{key}"] = count - fragments[key]
+    return result
+
+def iter_results(
+    features: List[FeatureScan],
+    jobs: int,
+    manifest: "Manifest",
+    force: bool = False,
+    timed: bool = False,
+    exports: Tuple[str, ...] = (),
+    export_dir: Optional[Path] = None,
+    staged: Optional[Dict[str, bytes]] = None,
+    adopt: bool = False,
+) -> Iterator[Dict[str, Any]]:
+    """Yield process_feature() results in features order, optionally from a process pool"""
+    from speckit.stream import process_pool
+
+    entries = [manifest.get(f.name) for f in features]
+    specs = [(staged or {}).get(f.name) for f in features]
+    if jobs <= 1 or len(features) <= 1:
+        for feature, entry, spec in zip(features, entries, specs):
+            yield process_feature(feature, entry, manifest.inputs, force, timed, exports, export_dir, False, spec,
+                                  adopt)
+        return
+
+    # Executor.map preserves input order, so output stays deterministic no
+    # matter which worker finishes first; chunking keeps IPC overhead low.
+    chunksize = max(1, len(features) // (jobs * 4))
+    with process_pool(jobs) as executor:
+        yield from executor.map(
+            process_feature,
+            features,
+            entries,
+            repeat(manifest.inputs),
+            repeat(force),
+            repeat(timed),
+            repeat(exports),
+            repeat(export_dir),
+            repeat(False),
+            specs,
+            repeat(adopt),
+            chunksize=chunksize,
+        )
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command-line arguments"""
+    parser = argparse.ArgumentParser(description="Generate plan.md and tasks.md for all features in specs/")
+    parser.add_argument(
+        "-j", "--jobs",
+        type=int,
+        default=1,
+        metavar="N",
+        help="number of worker processes (0 = one per CPU, default: 1)",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="regenerate every generator-owned plan.md/tasks.md, even if unchanged or edited by hand",
+    )
+    parser.add_argument(
+        "--adopt",
+        action="store_true",
+        help="regenerate the plan.md/tasks.md the generator does not own (hand-authored, or written "
+             "before its manifest) and take them over",
+    )
+    changes = parser.add_mutually_exclusive_group()
+    changes.add_argument(
+        "--since",
+        metavar="REF",
+        help="only process features with changes (including untracked files) since git REF",
+    )
+    changes.add_argument(
+        "--staged",
+        action="store_true",
+        help="only process features with changes staged in the git index (for pre-commit hooks)",
+    )
+    parser.add_argument(
+        "--timings",
+        action="store_true",
+        help="print a per-phase timing breakdown (scan, check, read, parse, render, write)",
+    )
+    parser.add_argument(
+        "--metrics-json",
+        type=Path,
+        metavar="FILE",
+        help="write per-feature and aggregate timings, byte counters and stats to FILE",
+    )
+    parser.add_argument(
+        "--profile",
+        type=Path,
+        metavar="FILE",
+        help="run under cProfile, save pstats data to FILE and print the top functions "
+             "(covers the main process only; combine with --jobs 1)",
+    )
+    parser.add_argument(
+        "--export",
+        action="append",
+        metavar="FORMAT[,FORMAT]",
+        help=f"also render each parsed spec as {', '.join(export_names())} in the same pass "
+             "(repeatable; csv is one features.csv summary)",
+    )
+    parser.add_argument(
+        "--export-dir",
+        type=Path,
+        default=EXPORT_DIR,
+        metavar="DIR",
+        help=f"where --export writes (default: {EXPORT_DIR.relative_to(PROJECT_ROOT)})",
+    )
+    parser.add_argument(
+        "--shard",
+        metavar="I/N",
+        help="only process the features in shard I of N (by a stable hash of the directory name), "
+             "for fanning a run out over N CI runners; combine with --metrics-json and merge-results",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="bounded-memory mode for very large trees: features flow through bounded queues in unsorted "
+             "(filesystem) order, docs are written in chunks and the manifest is kept in SQLite",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="after the initial run, keep regenerating docs as specs change",
+    )
+    parser.add_argument(
+        "--poll",
+        action="store_true",
+        help="with --watch, poll for changes instead of using inotify",
+    )
+    parser.add_argument(
+        "--debounce",
+        type=int,
+        default=50,
+        metavar="MS",
+        help="with --watch, wait for MS quiet milliseconds before regenerating (default: 50)",
+    )
+
+    commands = parser.add_subparsers(dest="command", metavar="COMMAND")
+    query = commands.add_parser(
+        "query",
+        help="query the spec index (stories, entities, statuses, requirements)",
+        description="Query the index of parsed specs. Filters combine with AND; NAME and STATUS "
+                    "match case-insensitively and accept * wildcards. With --priority the matching "
+                    "user stories are listed, otherwise the matching features.",
+    )
+    query.add_argument("--priority", metavar="P", help="user stories with this priority (e.g. P1)")
+    query.add_argument("--entity", metavar="NAME", help="features declaring this Key Entity")
+    query.add_argument("--status", metavar="STATUS", help="features with this status (e.g. Draft)")
+    query.add_argument("--requirement", metavar="TEXT", help="features with a functional requirement containing TEXT")
+    query.add_argument("--sql", metavar="QUERY", help="run a read-only SQL query against the index instead")
+    query.add_argument("--json", action="store_true", help="print results as JSON")
+
+    validate = commands.add_parser(
+        "validate",
+        help="check every feature against the Speckit structure rules",
+        description="Check spec.md/plan.md/tasks.md presence, mandatory spec headings, the Feature "
+                    "Branch number, Functional Requirements and Key Entities entries, and that "
+                    "plan.md/tasks.md mention every Key Entity. Exits 1 if any feature fails.",
+    )
+    validate.add_argument(
+        "--feature",
+        action="append",
+        metavar="N",
+        help="only check this feature, by number (e.g. 001) or directory name (repeatable)",
+    )
+    validate_changes = validate.add_mutually_exclusive_group()
+    validate_changes.add_argument("--since", metavar="REF", default=argparse.SUPPRESS,
+                                  help="only check features changed since git REF")
+    validate_changes.add_argument("--staged", action="store_true", default=argparse.SUPPRESS,
+                                  help="only check features with staged changes")
+    validate.add_argument("-j", "--jobs", type=int, metavar="N", default=0,
+                          help="number of worker processes (0 = one per CPU, default; small runs stay in process)")
+    validate.add_argument("--strict", action="store_true", help="fail on warnings too")
+    validate.add_argument("--json", action="store_true", help="print the full report as JSON")
+
+    search = commands.add_parser(
+        "search",
+        help="full-text search of specs, plans and tasks, ranked by BM25",
+        description="Search every feature's spec.md, plan.md and tasks.md, minus the lines plans and tasks "
+                    "take from the generator's templates. Words are stemmed and all must "
+                    "appear in one section (with --any, one is enough); a trailing * matches a prefix. "
+                    "Matches in headings and in requirement/Key Entity lines weigh more than prose.",
+    )
+    search.add_argument("query", nargs="+", metavar="QUERY", help="words to search for")
+    search.add_argument("-n", "--limit", type=int, metavar="N", default=10,
+                        help="show the N best features (default: 10)")
+    search.add_argument("--any", action="store_true", help="match sections containing any of the words")
+    search.add_argument("--json", action="store_true", help="print results as JSON")
+
+    dedupe = commands.add_parser(
+        "dedupe",
+        help="list clusters of features that look like duplicates of each other",
+        description="Compare the words identifying each feature (slug, title, user story titles, Key "
+                    "Entities, functional requirements) with MinHash/LSH, ignoring words common to many "
+                    "features, and list the clusters of features above the Jaccard similarity threshold, "
+                    "then the less similar pairs as possible duplicates, most similar first.",
+    )
+    dedupe.add_argument("--threshold", type=float, metavar="J", default=DEFAULT_THRESHOLD,
+                        help=f"minimum Jaccard similarity of a duplicate pair (default: {DEFAULT_THRESHOLD})")
+    dedupe.add_argument("--near", type=float, metavar="J", default=NEAR_THRESHOLD,
+                        help="minimum Jaccard similarity of a possible duplicate pair, below --threshold "
+                             f"(default: {NEAR_THRESHOLD}; 1 lists none)")
+    dedupe.add_argument("--json", action="store_true", help="print the clusters and possible pairs as JSON")
+
+    agent_context = commands.add_parser(
+        "agent-context",
+        help="update AI agent context files from the current feature's plan.md",
+        description="In-process equivalent of .specify/scripts/bash/update-agent-context.sh: reads "
+                    "Language/Version, Primary Dependencies, Storage and Project Type from the current "
+                    "feature's plan.md (SPECIFY_FEATURE or the git branch) and adds them to the agent "
+                    "files, producing the same files as the script.",
+    )
+    agent_context.add_argument(
+        "agent",
+        nargs="?",
+        metavar="AGENT",
+        help="only update this agent's file (claude, gemini, copilot, cursor-agent, ...; an unknown AGENT "
+             "lists them all); default: every existing agent file, or CLAUDE.md if there is none",
+    )
+
+    merge = commands.add_parser(
+        "merge-results",
+        help="combine the --metrics-json files of --shard runs into one summary",
+        description="Read the --metrics-json file of every shard of a --shard I/N run and print the "
+                    "summary the unsharded run would have printed. Exits 1 if any shard had errors or "
+                    "a shard's file is missing or repeated.",
+    )
+    merge.add_argument("files", nargs="+", type=Path, metavar="FILE", help="one --metrics-json file per shard")
+    merge.add_argument("--timings", action="store_true", help="also print the merged timing breakdown")
+    merge.add_argument("--metrics-json", type=Path, metavar="FILE", help="write the merged metrics to FILE")
+
+    serve_parser = commands.add_parser(
+        "serve",
+        help="answer parse/render/validate/regenerate requests over a Unix socket, with warm caches",
+        description="Keep the feature directory listing, parsed specs and compiled templates in memory "
+                    "and answer JSON-RPC 2.0 requests (one JSON object per line) on a Unix socket: "
+                    "parse, render, validate, regenerate and status. speckit_client.py is the client; "
+                    "it runs requests in process when no server is listening.",
+    )
+    serve_parser.add_argument("--socket", type=Path, default=SOCKET_PATH, metavar="PATH",
+                              help=f"socket to listen on (default: {SOCKET_PATH.relative_to(PROJECT_ROOT)})")
+
+    impact = commands.add_parser(
+        "impact",
+        help="list the Jest/Vitest test files affected by changed backend/frontend files",
+        description="Follow the cached import graph of backend/src and frontend/src backwards from the "
+                    "changed files to the test files that import them, directly or not, and map the "
+                    "changes to feature modules and their specs/ directories. A project needs its full "
+                    "suite when a change is outside src/, to a test setup file, or not in the graph.",
+    )
+    impact.add_argument("files", nargs="*", metavar="FILE", help="changed files, relative to the repository root")
+    impact_changes = impact.add_mutually_exclusive_group()
+    impact_changes.add_argument("--since", metavar="REF", default=argparse.SUPPRESS,
+                                help="files changed since git REF, including untracked files")
+    impact_changes.add_argument("--staged", action="store_true", default=argparse.SUPPRESS,
+                                help="files with staged changes (for the pre-commit hook)")
+    impact.add_argument("--project", metavar="NAME",
+                        help="backend or frontend: only print this project's test files, relative to it, one "
+                             "per line, or 'all' when it needs its full suite (for the pre-commit hook)")
+    impact.add_argument("--json", action="store_true", help="print the result as JSON")
+
+    progress = commands.add_parser(
+        "progress",
+        help="implementation progress from the checkboxes of every tasks.md",
+        description="Count checked acceptance criteria and completed tasks (every box checked) per "
+                    "feature, from an index of tasks.md that only re-reads changed files. With "
+                    "--feature, break the feature down by phase and task.",
+    )
+    progress.add_argument("--feature", action="append", metavar="N",
+                          help="show this feature's phases and tasks, by number or directory name (repeatable)")
+    progress.add_argument("--incomplete", action="store_true", help="only list features with unchecked boxes")
+    progress.add_argument("--json", action="store_true", help="print the progress as JSON")
+
+    schedule = commands.add_parser(
+        "schedule",
+        help="critical path and a worker schedule for the tasks of every tasks.md",
+        description="Build one task graph from every tasks.md (time estimates, **Dependencies** fields "
+                    "and 'T012 depends on T009' lines; 002:T004 names another feature's task), report "
+                    "the critical path and each task's earliest start and slack, and assign the tasks "
+                    "to N workers, longest remaining path first.",
+    )
+    schedule.add_argument("--workers", type=int, default=1, metavar="N", help="workers to schedule on (default: 1)")
+    schedule.add_argument("--feature", action="append", metavar="N",
+                          help="only schedule this feature and the tasks it depends on, by number or directory "
+                               "name (repeatable)")
+    schedule.add_argument("--limit", type=int, default=20, metavar="N",
+                          help="schedule entries to print, 0 for all (default: 20)")
+    schedule.add_argument("--json", action="store_true", help="print every task's timing and assignment as JSON")
+
+    allocate_parser = commands.add_parser(
+        "allocate",
+        help="claim the next feature number and create its specs/ directory (for create-new-feature.sh)",
+        description="Under a lock on .specify/cache/features.lock, take the next number not used by a specs/ "
+                    "directory or a local or remote-tracking branch, create specs/NNN-SLUG/ and print its "
+                    "name. The numbers in use are cached and only listed again when specs/ has changed.",
+    )
+    allocate_parser.add_argument("slug", metavar="SLUG", help="the name after the number, e.g. user-auth")
+    allocate_parser.add_argument("--number", type=int, metavar="N",
+                                 help="claim this number instead; fails if it is in use")
+    allocate_parser.add_argument("--json", action="store_true", help="print the allocation as JSON")
+
+    args = parser.parse_args(argv)
+    if args.jobs < 0:
+        parser.error("--jobs must be >= 0")
+    if args.jobs == 0:
+        args.jobs = os.cpu_count() or 1
+    if args.watch and (args.since or args.staged):
+        parser.error("--watch cannot be combined with --since/--staged")
+    if args.stream and (args.watch or args.since or args.staged):
+        parser.error("--stream cannot be combined with --watch/--since/--staged")
+    if args.shard is not None:
+        from speckit.shard import parse_shard
+        if args.watch:
+            parser.error("--watch cannot be combined with --shard")
+        try:
+            args.shard = parse_shard(args.shard)
+        except ValueError as e:
+            parser.error(str(e))
+    if args.command == "impact" and bool(args.files) + (args.since is not None) + args.staged != 1:
+        parser.error("impact needs FILE arguments, --since REF or --staged")
+    if args.command == "impact" and args.project:
+        from speckit.impact import PROJECTS
+        if args.project not in [project.name for project in PROJECTS]:
+            parser.error(f"--project must be one of {', '.join(project.name for project in PROJECTS)}")
+    if args.command == "schedule" and args.workers < 1:
+        parser.error("--workers must be >= 1")
+    if args.command == "dedupe" and not 0 < args.threshold <= 1:
+        parser.error("--threshold must be in (0, 1]")
+    if args.command == "dedupe" and not 0 < args.near <= 1:
+        parser.error("--near must be in (0, 1]")
+    if args.command is None:
+        names = [name.strip() for value in args.export or [] for name in value.split(",") if name.strip()]
+        try:
+            args.export = tuple(renderer.name for renderer in export_renderers(names))
+        except ValueError as e:
+            parser.error(str(e))
+    return args
 
-**Type**: Testing
-**Time Estimate**: 1 day
-**Dependencies**: T007, T012
-
-**Acceptance Criteria**:
-- [ ] API integration tests (real HTTP requests to test server)
-- [ ] Database integration tests
-- [ ] Authentication flow tests
-- [ ] Error scenario tests
-- [ ] All integration tests pass
+def generate_all(args: argparse.Namespace) -> Tuple[int, Optional["Manifest"]]:
+    """Generate docs for every feature in specs/ and print the summary.
 
-**Definition of Done**:
-- Integration tests created
-- `npm test` passes all tests
-- No flaky tests
-
----
-
-### T014: Manual QA and Bug Fixes
-
-**Type**: Testing
-**Time Estimate**: 1 day
-**Dependencies**: T013
-
-**Acceptance Criteria**:
-- [ ] All user stories manually tested
-- [ ] All acceptance criteria verified
-- [ ] Edge cases tested
-- [ ] Any bugs found are documented and fixed
-- [ ] Regression testing after fixes
-
-**Definition of Done**:
-- All user stories work as specified
-- No critical bugs remaining
-- QA checklist completed
-
----
-
-### T015: Quality Gates Verification
-
-**Type**: Testing
-**Time Estimate**: 0.5 days
-**Dependencies**: T014
-
-**Acceptance Criteria**:
-- [ ] Backend build succeeds: `cd backend && npm run build`
-- [ ] Frontend build succeeds: `cd frontend && npm run build`
-- [ ] All backend tests pass: `cd backend && npm test`
-- [ ] All frontend tests pass: `cd frontend && npm run test:run`
-- [ ] Test coverage ≥ 80% (statements, functions, lines)
-- [ ] Test coverage ≥ 75% (branches)
-- [ ] No ESLint errors
-- [ ] Code formatted with Prettier
-- [ ] Docker Compose starts successfully
-
-**Definition of Done**:
-- All quality gates pass
-- Coverage reports generated
-- Builds succeed without errors
-
----
-
-## Phase 6: Documentation & Deployment
-
-**Purpose**: Document feature and prepare for production
-
-### T016: Update Documentation
-
-**Type**: Documentation
-**Time Estimate**: 0.5 days
-**Dependencies**: T015
-
-**Acceptance Criteria**:
-- [ ] README.md updated with feature description
-- [ ] API endpoints documented in README
-- [ ] Feature added to feature list
-- [ ] Inline code comments for complex logic
-- [ ] Architecture documentation updated if needed
-- [ ] Update spec.md status to "Implemented"
-
-**Definition of Done**:
-- README.md contains feature documentation
-- All API endpoints listed
-- Code comments added
-
----
-
-### T017: Deployment Verification
-
-**Type**: DevOps
-**Time Estimate**: 0.5 days
-**Dependencies**: T016
-
-**Acceptance Criteria**:
-- [ ] Docker images build successfully
-- [ ] Docker Compose starts all services
-- [ ] Database migrations run successfully
-- [ ] Health checks pass
-- [ ] Feature accessible in containerized environment
-
-**Definition of Done**:
-- `docker compose up --build -d` succeeds
-- All services healthy
-- Feature works in Docker environment
-
----
-
-## Dependencies & Execution Order
-
-### Phase Dependencies
-1. **Phase 1 (Setup)**: No dependencies - start immediately
-2. **Phase 2 (Business Logic)**: Depends on Phase 1 completion
-3. **Phase 3 (API Layer)**: Depends on Phase 2 completion
-4. **Phase 4 (Frontend)**: Depends on Phase 3 completion (can start earlier with mocks)
-5. **Phase 5 (Integration)**: Depends on Phase 3 + Phase 4 completion
-6. **Phase 6 (Documentation)**: Depends on Phase 5 completion
-
-### Task Dependencies
-- T002 depends on T001 (need entities before creating module)
-- T003 depends on T002 (need module before service)
-- T004 depends on T003 (need service before testing)
-- T005 depends on T003 (DTOs need service logic understanding)
-- T006 depends on T005 (controller needs DTOs)
-- T007 depends on T006 (test controller after implementation)
-- T008 depends on T006 (API client needs endpoints)
-- T009 depends on T008 (components need API client)
-- T010 depends on T009 (page needs components)
-- T011 depends on T008 (state management needs API client)
-- T012 depends on T009, T010, T011 (test after implementation)
-- T013 depends on T007, T012 (integration after unit tests)
-- T014 depends on T013 (manual QA after integration)
-- T015 depends on T014 (gates after bugs fixed)
-- T016 depends on T015 (document after verification)
-- T017 depends on T016 (deploy after documentation)
-
-### Parallel Opportunities
-- T004 and T005 can run in parallel
-- T011 can start while T009 is in progress
-- Documentation (T016) can be written alongside implementation
-
----
-
-## Implementation Strategy
-
-### Sequential Approach (Recommended)
-1. Complete Phase 1 → Foundation ready
-2. Complete Phase 2 → Services ready
-3. Complete Phase 3 → API ready
-4. Complete Phase 4 → UI ready
-5. Complete Phase 5 → Tested and verified
-6. Complete Phase 6 → Documented and deployed
-
-### Time Estimate Summary
-- **Phase 1**: 1.5 days
-- **Phase 2**: 3.5 days
-- **Phase 3**: 3 days
-- **Phase 4**: 4 days
-- **Phase 5**: 2.5 days
-- **Phase 6**: 1 day
-- **Total**: ~15.5 days
-
----
-
-## Notes
-
-- All tasks must follow constitution.md standards
-- Test coverage thresholds are non-negotiable (80%+ statements, 75%+ branches)
-- No `any` types allowed in TypeScript
-- All endpoints must have JWT authentication
-- Input validation required on all API endpoints
-- Commit after completing each task or logical group
-- Run quality gates before final commit
-
----
-
-**Reference**: See `specs/006-unmock-ai-integration/` for a complete implementation example
-"""
+    Returns the exit status and the manifest, or None for the manifest if
+    the constitution could not be read.
+    """
+    from speckit.constitution import ConstitutionError
+    from speckit.index import SpecIndex
 
-    return tasks
+    timed = args.timings or args.metrics_json is not None
+    metrics = RunMetrics() if timed else None
 
-def main():
-    """Main execution function"""
     print("🚀 Starting automated documentation generation...")
     print(f"📁 Scanning specs directory: {SPECS_DIR}")
-
-    # Get all spec directories
-    spec_dirs = sorted([d for d in SPECS_DIR.iterdir() if d.is_dir()])
+    if args.jobs > 1:
+        print(f"⚙️  Using {args.jobs} worker processes")
+
+    try:
+        values = constitution_values()
+    except ConstitutionError as e:
+        print(f"❌ Cannot read the constitution: {e}")
+        return 1, None
+    manifest = load_manifest(generator_inputs(values))
+
+    # Get and classify all spec directories, or only the changed ones
+    scan_start = time.perf_counter()
+    partial = bool(args.since or args.staged)
+    staged = None
+    if partial:
+        try:
+            changed = changed_features(SPECS_DIR, args.since, args.staged)
+            if args.staged:
+                staged = staged_specs(SPECS_DIR, changed)
+        except GitError as e:
+            print(f"❌ Could not list changed features: {e}")
+            return 1, manifest
+        if args.shard:
+            changed = {name for name in changed if args.shard.owns(name)}
+        features = []
+        for name in sorted(changed):
+            spec_dir = SPECS_DIR / name
+            if spec_dir.is_dir():
+                features.append(scan_feature(spec_dir))
+            else:
+                manifest.update(name, None)
+        print(f"🔀 {len(features)} changed feature(s) {f'since {args.since}' if args.since else 'staged'}")
+        if staged:
+            print(f"📌 Rendering {len(staged)} partially staged spec.md file(s) from the index")
+    else:
+        features, listings = scan_features(SPECS_DIR, manifest.listings)
+        manifest.set_listings(listings)
+        present = [f.name for f in features]
+        if args.shard:
+            features = [f for f in features if args.shard.owns(f.name)]
+            print(f"🧩 Shard {args.shard}: {len(features)} of {len(present)} feature(s)")
+    if metrics:
+        metrics.add_phase("scan", time.perf_counter() - scan_start)
+    statuses = count_statuses(features)
+    print(f"📋 {statuses['complete']} complete, {statuses['missing-plan']} missing plan.md, "
+          f"{statuses['missing-tasks']} missing tasks.md, {statuses['missing-docs']} missing both, "
+          f"{statuses['no-spec']} without spec.md")
 
     stats = {
-        "total": len(spec_dirs),
+        "total": len(features),
         "plan_generated": 0,
         "tasks_generated": 0,
+        "written": 0,
+        "unchanged": 0,
         "skipped": 0,
         "errors": 0,
+        "exported": 0,
     }
 
-    for spec_dir in spec_dirs:
-        feature_name = spec_dir.name
-        spec_file = spec_dir / "spec.md"
-        plan_file = spec_dir / "plan.md"
-        tasks_file = spec_dir / "tasks.md"
+    spec_records = {}
+    infos = {}
+    unowned = []
+    results = iter_results(features, args.jobs, manifest, args.force, timed, args.export, args.export_dir, staged,
+                           args.adopt)
+    for result in results:
+        for line in result["log"]:
+            print(line)
+        for key, value in result["stats"].items():
+            stats[key] += value
+        manifest.update(result["feature"], result["entry"])
+        if result["unowned"]:
+            unowned.append((result["feature"], result["unowned"]))
+        if result["entry"] and not result["stats"]["errors"]:
+            spec_records[result["feature"]] = result["entry"]["spec"]
+            if result["info"] is not None:
+                infos[result["feature"]] = result["info"]
+        if metrics:
+            metrics.add_feature(result["feature"], result.get("metrics"))
+
+    if not partial:
+        # Other shards' entries stay, so shards sharing a cache do not evict each other
+        manifest.prune(present)
+    summaries = write_row_exports(manifest, args.export, args.export_dir)
+    manifest.save()
+    with SpecIndex(INDEX_PATH) as index:
+        if partial:
+            indexed = index.refresh([SPECS_DIR / name for name in changed], complete=False,
+                                    records=spec_records, infos=infos)
+        elif args.shard:
+            # Only this shard's features; one whose spec.md is gone is removed
+            indexed = index.refresh([f.path for f in features], complete=False, records=spec_records, infos=infos)
+        else:
+            indexed = index.refresh([f.path for f in features if f.has_spec], records=spec_records, infos=infos)
+
+    print_summary(stats, indexed, args.export, summaries)
+    report_unowned(unowned)
+    if partial or args.shard:
+        report_constitution(values, [f.path for f in features])
+    else:
+        report_constitution(values)
 
-        # Skip if spec.md doesn't exist
-        if not spec_file.exists():
-            print(f"⚠️  {feature_name}: No spec.md found, skipping")
-            stats["skipped"] += 1
-            continue
+    if metrics:
+        if args.timings:
+            metrics.print_summary()
+        if args.metrics_json:
+            extra = {"shard": str(args.shard), "indexed": indexed, "exports": list(args.export)} if args.shard else {}
+            metrics.write_json(args.metrics_json, stats, jobs=args.jobs, **extra)
+            print(f"💾 Metrics written to {args.metrics_json}")
 
-        # Skip if both plan.md and tasks.md already exist
-        if plan_file.exists() and tasks_file.exists():
-            print(f"✅ {feature_name}: Already has complete documentation")
-            stats["skipped"] += 1
-            continue
+    if stats["errors"] == 0:
+        print("\n✅ All documentation generated successfully!")
+    else:
+        print(f"\n⚠️  Completed with {stats['errors']} errors")
 
-        try:
-            print(f"\n📝 Processing {feature_name}...")
-
-            # Extract information from spec
-            spec_info = extract_feature_info(spec_file)
-
-            # Generate plan.md if missing
-            if not plan_file.exists():
-                print(f"   ├─ Generating plan.md...")
-                plan_content = generate_plan_md(spec_info, str(spec_dir))
-                with open(plan_file, 'w') as f:
-                    f.write(plan_content)
-                stats["plan_generated"] += 1
-                print(f"   ├─ ✓ plan.md created")
-            else:
-                print(f"   ├─ plan.md already exists")
-
-            # Generate tasks.md if missing
-            if not tasks_file.exists():
-                print(f"   ├─ Generating tasks.md...")
-                tasks_content = generate_tasks_md(spec_info, str(spec_dir))
-                with open(tasks_file, 'w') as f:
-                    f.write(tasks_content)
-                stats["tasks_generated"] += 1
-                print(f"   └─ ✓ tasks.md created")
-            else:
-                print(f"   └─ tasks.md already exists")
+    return (0 if stats["errors"] == 0 else 1), manifest
 
-        except Exception as e:
-            print(f"   └─ ❌ Error: {str(e)}")
-            stats["errors"] += 1
+def report_unowned(unowned: List[Tuple[str, List[str]]]):
+    """List the features whose spec.md changed while docs they have are not generator-owned"""
+    if not unowned:
+        return
+    print(f"\n✋ {len(unowned)} feature(s) with a changed spec.md kept docs the generator does not own "
+          "(rerun with --adopt to regenerate and take them over):")
+    for feature, docs in unowned:
+        print(f"   {feature}: {', '.join(docs)}")
 
-    # Print summary
+def report_constitution(values: Dict[str, Any], spec_dirs: Optional[List[Path]] = None):
+    """Print the constitution values changed since the last full run and the docs still mentioning old ones.
+
+    A full run records values as the last full run's; a partial or shard
+    run passes the features it processed and only their docs are checked.
+    """
+    from speckit.constitution import changed_values, last_rendered, record_rendered, stale_mentions
+
+    if spec_dirs is None:
+        previous = record_rendered(CONSTITUTION_CACHE_PATH, values)
+    else:
+        previous = last_rendered(CONSTITUTION_CACHE_PATH)
+    changes = changed_values(previous, values) if previous is not None else []
+    if not changes:
+        return
+    print("\n🏛️  Constitution values changed since the last full run (the generated docs "
+          f"{'of these features ' if spec_dirs is not None else ''}using them were regenerated):")
+    for key, old, new in changes:
+        print(f"   constitution.{key}: {old!r} → {new!r}")
+    for doc, old, key in stale_mentions(list_feature_dirs(SPECS_DIR) if spec_dirs is None else spec_dirs, changes):
+        print(f"⚠️  {doc.relative_to(PROJECT_ROOT)} still mentions {old!r} (constitution.{key} changed)")
+
+def print_summary(
+    stats: Dict[str, int],
+    indexed: Dict[str, int],
+    exports: Tuple[str, ...],
+    summaries: List[Tuple[Path, bool]],
+):
+    """Print the generation summary of a run (or of merged shard runs)"""
     print("\n" + "="*60)
     print("📊 Generation Summary")
     print("="*60)
     print(f"Total features: {stats['total']}")
     print(f"Plan.md files generated: {stats['plan_generated']}")
     print(f"Tasks.md files generated: {stats['tasks_generated']}")
-    print(f"Skipped (already complete): {stats['skipped']}")
+    print(f"Files written: {stats['written']}")
+    print(f"Files unchanged (write skipped): {stats['unchanged']}")
+    print(f"Skipped (up to date): {stats['skipped']}")
     print(f"Errors: {stats['errors']}")
+    print(f"Specs indexed: {indexed['parsed']} updated, {indexed['removed']} removed")
+    if exports:
+        print(f"Exports rendered ({', '.join(exports)}): {stats['exported']}"
+              + "".join(f", {path.name} {'written' if written else 'unchanged'}" for path, written in summaries))
     print("="*60)
 
+def _newer(path: Path, than: Path) -> bool:
+    """Whether path exists and was modified after than (or than does not exist)"""
+    try:
+        mtime_ns = path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return False
+    try:
+        return mtime_ns > than.stat().st_mtime_ns
+    except FileNotFoundError:
+        return True
+
+def load_manifest(inputs: Dict[str, str]) -> "Manifest":
+    """Load the JSON manifest, taking over the entries of a --stream run's manifest written since"""
+    from speckit.manifest import Manifest, ManifestDB
+
+    manifest = Manifest.load(MANIFEST_PATH, inputs)
+    if _newer(MANIFEST_DB_PATH, MANIFEST_PATH):
+        with ManifestDB(MANIFEST_DB_PATH, inputs) as db:
+            manifest.replace(dict(db.entries()))
+    return manifest
+
+def generate_stream(args: argparse.Namespace) -> Tuple[int, None]:
+    """Generate docs for every feature with memory bounded regardless of the number of features (--stream)"""
+    from speckit.constitution import ConstitutionError
+    from speckit.index import SpecIndex
+    from speckit.manifest import Manifest, ManifestDB
+    from speckit.stream import bounded_map, prefetch
+
+    timed = args.timings or args.metrics_json is not None
+    metrics = RunMetrics() if timed else None
+
+    print("🚀 Starting automated documentation generation (streaming)...")
+    print(f"📁 Scanning specs directory: {SPECS_DIR}")
+    if args.jobs > 1:
+        print(f"⚙️  Using {args.jobs} worker processes")
+
+    try:
+        values = constitution_values()
+    except ConstitutionError as e:
+        print(f"❌ Cannot read the constitution: {e}")
+        return 1, None
+    inputs = generator_inputs(values)
+    # A default run since the last --stream run left the newer entries in the JSON manifest
+    imported = _newer(MANIFEST_PATH, MANIFEST_DB_PATH)
+    stats = {
+        "total": 0,
+        "plan_generated": 0,
+        "tasks_generated": 0,
+        "written": 0,
+        "unchanged": 0,
+        "skipped": 0,
+        "errors": 0,
+        "exported": 0,
+    }
+    statuses = dict.fromkeys(STATUSES, 0)
+    indexed = {"parsed": 0, "unchanged": 0, "removed": 0}
+
+    with ManifestDB(MANIFEST_DB_PATH, inputs) as manifest, SpecIndex(INDEX_PATH) as index:
+        if imported:
+            count = manifest.replace(Manifest.load(MANIFEST_PATH, inputs).features.items())
+            print(f"📥 Took over {count} manifest entries from {MANIFEST_PATH.name}")
+
+        features = prefetch(iter_feature_scans(SPECS_DIR))
+        if args.shard:
+            print(f"🧩 Shard {args.shard}")
+            features = (f for f in features if args.shard.owns(f.name))
+
+        # Entries of the features in flight, so unchanged ones are not written back
+        previous: Dict[str, Any] = {}
+
+        def tasks():
+            for feature in features:
+                statuses[feature.status] += 1
+                stats["total"] += 1
+                previous[feature.name] = manifest.get(feature.name)
+                yield (feature, previous[feature.name], inputs, args.force, timed, args.export,
+                       args.export_dir, True, None, args.adopt)
+
+        batch: List[Path] = []
+        unowned = []
+        spec_records = {}
+        infos = {}
+
+        def record_batch():
+            counts = index.refresh(batch, complete=False, records=spec_records, infos=infos)
+            for key in indexed:
+                indexed[key] += counts[key]
+            manifest.save()
+            batch.clear()
+            spec_records.clear()
+            infos.clear()
+
+        for result in bounded_map(process_feature, tasks(), args.jobs, args.jobs * 4):
+            for line in result["log"]:
+                print(line)
+            for key, value in result["stats"].items():
+                stats[key] += value
+            if result["entry"] != previous.pop(result["feature"]):
+                manifest.update(result["feature"], result["entry"])
+            if result["unowned"]:
+                unowned.append((result["feature"], result["unowned"]))
+            batch.append(SPECS_DIR / result["feature"])
+            if result["entry"] and not result["stats"]["errors"]:
+                spec_records[result["feature"]] = result["entry"]["spec"]
+                if result["info"] is not None:
+                    infos[result["feature"]] = result["info"]
+            if metrics:
+                metrics.add_feature(result["feature"], result.get("metrics"))
+            if len(batch) >= STREAM_BATCH:
+                record_batch()
+        record_batch()
+
+        manifest.prune_missing(SPECS_DIR)
+        indexed["removed"] += index.remove_missing(SPECS_DIR)
+        manifest.save()
+        summaries = stream_row_exports(manifest, args.export, args.export_dir)
+
+    print(f"📋 {statuses['complete']} complete, {statuses['missing-plan']} missing plan.md, "
+          f"{statuses['missing-tasks']} missing tasks.md, {statuses['missing-docs']} missing both, "
+          f"{statuses['no-spec']} without spec.md, processed in unsorted (filesystem) order")
+    print_summary(stats, indexed, args.export, summaries)
+    report_unowned(unowned)
+    if not args.shard:
+        report_constitution(values)
+
+    if metrics:
+        if args.timings:
+            metrics.print_summary()
+        if args.metrics_json:
+            extra = {"shard": str(args.shard), "indexed": indexed, "exports": list(args.export)} if args.shard else {}
+            metrics.write_json(args.metrics_json, stats, jobs=args.jobs, **extra)
+            print(f"💾 Metrics written to {args.metrics_json}")
+
     if stats["errors"] == 0:
         print("\n✅ All documentation generated successfully!")
     else:
         print(f"\n⚠️  Completed with {stats['errors']} errors")
+    return (0 if stats["errors"] == 0 else 1), None
+
+def stream_row_exports(manifest: "ManifestDB", exports: Tuple[str, ...], export_dir: Path) -> List[Tuple[Path, bool]]:
+    """write_row_exports() for --stream: rows go from the manifest to the file one at a time"""
+    summaries = []
+    for renderer in export_renderers(list(exports)):
+        if renderer.kind != ROW:
+            continue
 
-    return 0 if stats["errors"] == 0 else 1
+        def produce(write, renderer=renderer):
+            write(renderer.header)
+            for _, entry in manifest.entries():
+                row = entry.get("exports", {}).get(renderer.name)
+                if row is not None:
+                    write(row)
+
+        export_dir.mkdir(parents=True, exist_ok=True)
+        path = export_dir / renderer.output
+        written, _ = write_chunks_if_changed(path, produce)
+        summaries.append((path, written))
+    return summaries
+
+def write_row_exports(manifest: "Manifest", exports: Tuple[str, ...], export_dir: Path) -> List[Tuple[Path, bool]]:
+    """Join the per-feature rows of each ROW export into its summary file, in directory order"""
+    summaries = []
+    for renderer in export_renderers(list(exports)):
+        if renderer.kind != ROW:
+            continue
+        rows = []
+        for name in sorted(manifest.features):
+            row = manifest.features[name].get("exports", {}).get(renderer.name)
+            if row is not None:
+                rows.append(row)
+        path = export_dir / renderer.output
+        export_dir.mkdir(parents=True, exist_ok=True)
+        written, _ = write_if_changed(path, renderer.header + "".join(rows))
+        summaries.append((path, written))
+    return summaries
+
+def main(argv: Optional[List[str]] = None):
+    """Main execution function"""
+    args = parse_args(argv)
+
+    if args.command == "query":
+        return query_specs(args)
+    if args.command == "validate":
+        return validate_specs(args)
+    if args.command == "search":
+        return search_specs(args)
+    if args.command == "dedupe":
+        return dedupe_specs(args)
+    if args.command == "agent-context":
+        from speckit.agent_context import update_agent_context
+        return update_agent_context(args.agent, PROJECT_ROOT)
+    if args.command == "merge-results":
+        return merge_shard_results(args)
+    if args.command == "serve":
+        return serve_specs(args)
+    if args.command == "impact":
+        return impact_of_changes(args)
+    if args.command == "progress":
+        return progress_of_tasks(args)
+    if args.command == "schedule":
+        return schedule_tasks(args)
+    if args.command == "allocate":
+        return allocate_feature(args)
+
+    if args.profile:
+        import cProfile
+        import pstats
+        profiler = cProfile.Profile()
+        code, manifest = profiler.runcall(generate_stream if args.stream else generate_all, args)
+        profiler.dump_stats(str(args.profile))
+        print(f"\n🔬 Profile written to {args.profile} (top functions by cumulative time):")
+        pstats.Stats(profiler).sort_stats("cumulative").print_stats(20)
+    elif args.stream:
+        code, manifest = generate_stream(args)
+    else:
+        code, manifest = generate_all(args)
+
+    if args.watch and manifest is not None:
+        return watch_specs(manifest, args)
+
+    return code
+
+def watch_specs(manifest: "Manifest", args: argparse.Namespace) -> int:
+    """Regenerate docs for features as their specs change, until interrupted"""
+    from speckit.constitution import ConstitutionError
+    from speckit.index import SpecIndex
+    from speckit.watch import ALL_FEATURES, open_watcher, watch
+
+    watcher = open_watcher(SPECS_DIR, TEMPLATE_INPUTS + [CONSTITUTION_PATH], poll=args.poll)
+    print(f"\n👀 Watching {SPECS_DIR} ({watcher.backend}), press Ctrl+C to stop")
+
+    def handle(changed: Set[str]):
+        start = time.perf_counter()
+        if ALL_FEATURES in changed:
+            try:
+                manifest.inputs = generator_inputs()
+            except ConstitutionError as e:
+                print(f"❌ Cannot read the constitution: {e}")
+                return
+            features, listings = scan_features(SPECS_DIR, manifest.listings)
+            manifest.set_listings(listings)
+            manifest.prune(f.name for f in features)
+        else:
+            features = []
+            for name in sorted(changed):
+                spec_dir = SPECS_DIR / name
+                if spec_dir.is_dir():
+                    features.append(scan_feature(spec_dir))
+                elif manifest.get(name) is not None:
+                    manifest.update(name, None)
+                    print(f"🗑️  {name}: removed")
+
+        errors = 0
+        infos = {}
+        for result in iter_results(features, args.jobs, manifest, args.force, exports=args.export,
+                                   export_dir=args.export_dir, adopt=args.adopt):
+            for line in result["log"]:
+                print(line)
+            errors += result["stats"]["errors"]
+            manifest.update(result["feature"], result["entry"])
+            if result["info"] is not None and not result["stats"]["errors"]:
+                infos[result["feature"]] = result["info"]
+        write_row_exports(manifest, args.export, args.export_dir)
+        manifest.save()
+        with SpecIndex(INDEX_PATH) as index:
+            if ALL_FEATURES in changed:
+                index.refresh([f.path for f in features if f.has_spec], infos=infos)
+            else:
+                index.refresh([SPECS_DIR / name for name in changed], complete=False, infos=infos)
+        if not features:
+            return
+
+        elapsed = (time.perf_counter() - start) * 1000
+        status = f", {errors} errors" if errors else ""
+        print(f"⏱️  Checked {len(features)} feature(s) in {elapsed:.1f} ms{status}")
+
+    try:
+        watch(watcher, handle, args.debounce / 1000)
+    except KeyboardInterrupt:
+        print("\n👋 Stopped watching")
+    finally:
+        watcher.close()
+    return 0
+
+def query_specs(args: argparse.Namespace) -> int:
+    """Refresh the spec index and print the rows matching the query filters"""
+    import sqlite3
+
+    from speckit.index import SpecIndex
+
+    start = time.perf_counter()
+    with SpecIndex(INDEX_PATH) as index:
+        index.refresh(list_feature_dirs(SPECS_DIR))
+        try:
+            if args.sql:
+                rows = index.execute(args.sql)
+            else:
+                filtered = any((args.entity, args.status, args.requirement))
+                features = index.find_features(args.status, args.entity, args.requirement, args.priority)
+                if args.priority:
+                    names = [row["name"] for row in features] if filtered else None
+                    rows = index.find_stories(args.priority, names)
+                else:
+                    rows = features
+        except sqlite3.Error as e:
+            print(f"❌ Query failed: {e}")
+            return 1
+
+    records = [dict(row) for row in rows]
+    if args.json:
+        print(json.dumps(records, indent=2))
+        return 0
+
+    for record in records:
+        print("  ".join(str(value) for value in record.values()))
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f"\n🔎 {len(records)} result(s) in {elapsed:.1f} ms")
+    return 0
+
+def search_specs(args: argparse.Namespace) -> int:
+    """Refresh the full-text index and print the best-ranked features for the query"""
+    import sqlite3
+
+    from speckit.search import SearchIndex, iter_hits_text, template_lines
+
+    start = time.perf_counter()
+    query = " ".join(args.query)
+    # Bold matches on a terminal, brackets otherwise
+    highlight = ("\033[1m", "\033[0m") if sys.stdout.isatty() and not args.json else ("[", "]")
+    with SearchIndex(SEARCH_INDEX_PATH, template_lines([PLAN_TEMPLATE, TASKS_TEMPLATE])) as index:
+        index.refresh(list_feature_dirs(SPECS_DIR))
+        try:
+            hits, matched = index.search(query, args.limit, args.any, highlight)
+        except (ValueError, sqlite3.Error) as e:
+            print(f"❌ Search failed: {e}")
+            return 1
+
+    if args.json:
+        print(json.dumps([hit._asdict() for hit in hits], indent=2, ensure_ascii=False))
+        return 0
+
+    for line in iter_hits_text(hits):
+        print(line)
+    elapsed = (time.perf_counter() - start) * 1000
+    shown = f", showing {len(hits)}" if len(hits) < matched else ""
+    print(f"\n🔎 {matched} feature(s) match '{query}'{shown} in {elapsed:.1f} ms")
+    return 0
+
+def merge_shard_results(args: argparse.Namespace) -> int:
+    """Print the summary of a --shard run from its shards' --metrics-json files"""
+    from speckit.shard import merge_results
+
+    try:
+        merged = merge_results(args.files)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+    print(f"🧩 Merged {len(args.files)} shard result file(s)")
+    print_summary(merged.stats, merged.indexed, tuple(merged.exports), [])
+    if args.timings:
+        merged.metrics.print_summary()
+    if args.metrics_json:
+        merged.metrics.write_json(args.metrics_json, merged.stats, shards=len(args.files), indexed=merged.indexed,
+                                  exports=merged.exports)
+        print(f"💾 Metrics written to {args.metrics_json}")
+
+    for problem in merged.problems:
+        print(f"❌ {problem}")
+    if merged.problems:
+        return 1
+    if merged.stats["errors"] == 0:
+        print("\n✅ All documentation generated successfully!")
+        return 0
+    print(f"\n⚠️  Completed with {merged.stats['errors']} errors")
+    return 1
+
+def dedupe_specs(args: argparse.Namespace) -> int:
+    """Refresh the spec index and print clusters of near-duplicate features, then the possible ones"""
+    from speckit.dedupe import find_duplicates
+    from speckit.index import SpecIndex
+
+    start = time.perf_counter()
+    with SpecIndex(INDEX_PATH) as index:
+        index.refresh(list_feature_dirs(SPECS_DIR))
+        shingle_sets = index.shingle_sets()
+    clusters, near, counts = find_duplicates(shingle_sets, args.threshold, near=args.near)
+
+    if args.json:
+        print(json.dumps({
+            "clusters": [
+                {
+                    "features": list(cluster.features),
+                    "pairs": [{"a": a, "b": b, "similarity": round(similarity, 3)}
+                              for a, b, similarity in cluster.pairs],
+                }
+                for cluster in clusters
+            ],
+            "possible": [{"a": a, "b": b, "similarity": round(similarity, 3)} for a, b, similarity in near],
+        }, indent=2))
+        return 0
+
+    for cluster in clusters:
+        print(f"👯 {', '.join(cluster.features)}")
+        for a, b, similarity in cluster.pairs:
+            print(f"   {similarity:.2f}  {a} ~ {b}")
+    if near:
+        print(f"\n🤔 Possible duplicates (Jaccard >= {min(args.near, args.threshold):g}):")
+        for a, b, similarity in near:
+            print(f"   {similarity:.2f}  {a} ~ {b}")
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f"\n🧬 {len(clusters)} cluster(s) among {counts['features']} feature(s) at Jaccard >= "
+          f"{args.threshold:g} and {len(near)} possible pair(s) ({counts['candidates']} candidate pair(s), "
+          f"{counts['pairs']} confirmed) in {elapsed:.1f} ms")
+    return 0
+
+def impact_of_changes(args: argparse.Namespace) -> int:
+    """Print the test files affected by the changed files, per project"""
+    from speckit.impact import ImportGraph, find_impact
+
+    start = time.perf_counter()
+    if args.files:
+        root = PROJECT_ROOT.resolve()
+        changed = [Path(os.path.relpath(os.path.abspath(path), root)).as_posix() for path in args.files]
+    else:
+        try:
+            changed = changed_paths(PROJECT_ROOT, args.since, args.staged)
+        except GitError as e:
+            print(f"❌ {e}", file=sys.stderr)
+            return 1
+
+    graph = ImportGraph.load(IMPACT_PATH)
+    counts = graph.refresh(PROJECT_ROOT)
+    graph.save()
+    impact = find_impact(graph, changed, SPECS_DIR)
+
+    if args.project:
+        for result in impact.projects:
+            if result.project.name == args.project:
+                print("all" if result.full else "\n".join(result.tests))
+        return 0
+    if args.json:
+        print(json.dumps({
+            "projects": {
+                result.project.name: {"changed": result.changed, "tests": result.tests, "full": result.full}
+                for result in impact.projects
+            },
+            "modules": impact.modules,
+        }, indent=2))
+        return 0
+
+    if not any(result.changed for result in impact.projects):
+        print("ℹ️  No backend/frontend changes")
+    for result in impact.projects:
+        if not result.changed:
+            continue
+        if result.full:
+            print(f"🧪 {result.project.name} ({result.project.runner}): full suite, {result.full}")
+            continue
+        print(f"🧪 {result.project.name} ({result.project.runner}): {len(result.tests)} test file(s) "
+              f"affected by {len(result.changed)} changed file(s)")
+        for test in result.tests:
+            print(f"   {test}")
+    for module, feature in impact.modules.items():
+        print(f"📦 {module}" + (f" → specs/{feature}" if feature else ""))
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f"\n🕸️  Import graph: {counts['files']} file(s), {counts['read']} re-read, "
+          f"{counts['removed']} removed in {elapsed:.1f} ms")
+    return 0
+
+def progress_of_tasks(args: argparse.Namespace) -> int:
+    """Refresh the progress index and print completion per feature (or per phase and task)"""
+    from speckit.progress import ProgressIndex, percent
+
+    start = time.perf_counter()
+    unmatched: List[str] = []
+    names = None
+    if args.feature:
+        selected, unmatched = select_features(args.feature)
+        names = [feature.name for feature in selected]
+    with ProgressIndex(PROGRESS_PATH) as index:
+        counts = index.refresh(list_feature_dirs(SPECS_DIR))
+        features = index.features(names)
+        if args.incomplete:
+            features = [feature for feature in features if feature.checked < feature.boxes]
+        details = {feature.feature: (index.phases(feature.feature), index.tasks(feature.feature))
+                   for feature in features} if args.feature else {}
+
+    if args.json:
+        records = []
+        for feature in features:
+            record = dict(feature._asdict(), percent=round(percent(feature.checked, feature.boxes), 1))
+            if feature.feature in details:
+                phases, tasks = details[feature.feature]
+                record["phases"] = [
+                    dict(phase._asdict(), items=[
+                        {"task": task.task, "title": task.title, "boxes": task.boxes, "checked": task.checked,
+                         "done": task.done}
+                        for task in tasks if task.phase == number
+                    ])
+                    for number, phase in enumerate(phases)
+                ]
+            records.append(record)
+        print(json.dumps(records, indent=2))
+        return 1 if unmatched else 0
+
+    for name in unmatched:
+        print(f"❌ No spec directory found for feature {name}")
+    for feature in features:
+        print(f"{percent(feature.checked, feature.boxes):5.1f}%  {feature.done:>3}/{feature.tasks:<3} tasks  "
+              f"{feature.checked:>4}/{feature.boxes:<4} criteria  {feature.feature}")
+        if feature.feature not in details:
+            continue
+        phases, tasks = details[feature.feature]
+        for number, phase in enumerate(phases):
+            print(f"         {phase.done:>3}/{phase.tasks:<3} tasks  {phase.checked:>4}/{phase.boxes:<4} criteria  "
+                  f"{phase.name or '(before the first heading)'}")
+            for task in tasks:
+                if task.phase == number:
+                    print(f"            [{'x' if task.done else ' '}] {task.task} {task.title} "
+                          f"({task.checked}/{task.boxes})")
+
+    totals = [sum(getattr(feature, field) for feature in features) for field in ("done", "tasks", "checked", "boxes")]
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f"\n📈 {len(features)} feature(s): {totals[0]}/{totals[1]} tasks done, {totals[2]}/{totals[3]} "
+          f"acceptance criteria checked ({percent(totals[2], totals[3]):.1f}%) in {elapsed:.1f} ms "
+          f"({counts['parsed']} tasks.md parsed, {counts['unchanged']} unchanged)")
+    return 1 if unmatched else 0
+
+def schedule_tasks(args: argparse.Namespace) -> int:
+    """Build the task graph of every tasks.md and print its critical path and a schedule on N workers"""
+    from speckit.schedule import analyze, build_graph, list_schedule, prerequisites
+
+    start = time.perf_counter()
+    documents = []
+    for spec_dir in list_feature_dirs(SPECS_DIR):
+        try:
+            documents.append((spec_dir.name, (spec_dir / "tasks.md").read_text(encoding="utf-8", errors="replace")))
+        except FileNotFoundError:
+            continue
+    graph = build_graph(documents)
+    unmatched: List[str] = []
+    if args.feature:
+        selected, unmatched = select_features(args.feature)
+        graph = prerequisites(graph, [feature.name for feature in selected])
+    analysis = analyze(graph)
+    schedule = list_schedule(graph, analysis, args.workers)
+    elapsed = (time.perf_counter() - start) * 1000
+    tasks = graph.tasks
+    failed = bool(unmatched or analysis.cyclic)
+
+    if args.json:
+        placed = {assignment.task: assignment for assignment in schedule.assignments}
+        records = []
+        for number, task in enumerate(tasks):
+            record = dict(task._asdict(), key=task.key)
+            if number in placed:
+                assignment = placed[number]
+                record.update(earliest=analysis.earliest[number], latest=analysis.latest[number],
+                              slack=analysis.latest[number] - analysis.earliest[number],
+                              worker=assignment.worker + 1, start=assignment.start, end=assignment.end)
+            records.append(record)
+        print(json.dumps({
+            "workers": schedule.workers,
+            "makespan": schedule.makespan,
+            "lower_bound": schedule.lower_bound,
+            "critical_path": {"days": analysis.length, "tasks": [tasks[task].key for task in analysis.critical_path]},
+            "cyclic": [tasks[task].key for task in analysis.cyclic],
+            "problems": graph.problems,
+            "unmatched": unmatched,
+            "tasks": records,
+        }, indent=2))
+        return 1 if failed else 0
+
+    for name in unmatched:
+        print(f"❌ No spec directory found for feature {name}")
+    for problem in graph.problems:
+        print(f"⚠️  {problem}")
+    if analysis.cyclic:
+        print(f"❌ {len(analysis.cyclic)} task(s) in or after a dependency cycle, left out: "
+              f"{', '.join(tasks[task].key for task in analysis.cyclic)}")
+
+    print(f"🧭 Critical path: {analysis.length:g} day(s), {len(analysis.critical_path)} task(s)")
+    for task in analysis.critical_path:
+        print(f"   {analysis.earliest[task]:>7g} → {analysis.earliest[task] + tasks[task].days:<7g} "
+              f"{tasks[task].key} {tasks[task].title}")
+
+    shown = schedule.assignments if args.limit == 0 else schedule.assignments[:args.limit]
+    if shown:
+        more = f" (first {len(shown)} of {len(schedule.assignments)})" if len(shown) < len(schedule.assignments) else ""
+        print(f"\n👷 Schedule on {schedule.workers} worker(s){more}:")
+    for assignment in shown:
+        task = assignment.task
+        slack = analysis.latest[task] - analysis.earliest[task]
+        print(f"   {assignment.start:>7g} → {assignment.end:<7g} w{assignment.worker + 1:<3} "
+              f"slack {slack:<5g} {tasks[task].key} {tasks[task].title}")
+
+    work = sum(tasks[task].days for task in analysis.order)
+    utilisation = 100.0 * work / (schedule.makespan * schedule.workers) if schedule.makespan else 0.0
+    features = len({task.feature for task in tasks})
+    print(f"\n📅 {len(tasks)} task(s) in {features} feature(s), {sum(map(len, graph.preds))} dependencies: "
+          f"{schedule.makespan:g} day(s) on {schedule.workers} worker(s), lower bound {schedule.lower_bound:g} "
+          f"({work:g} day(s) of work), {utilisation:.0f}% busy in {elapsed:.1f} ms")
+    return 1 if failed else 0
+
+def allocate_feature(args: argparse.Namespace) -> int:
+    """Claim a feature number, create its directory and print the directory name"""
+    from speckit.allocate import AllocationError, allocate
+
+    try:
+        allocation = allocate(SPECS_DIR, CACHE_DIR, args.slug, args.number, PROJECT_ROOT)
+    except AllocationError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+    if args.json:
+        print(json.dumps({"number": allocation.number, "name": allocation.name, "path": str(allocation.path),
+                          "rebuilt": allocation.rebuilt}))
+    else:
+        print(allocation.name)
+    return 0
+
+def select_features(names: List[str]) -> Tuple[List[FeatureScan], List[str]]:
+    """Resolve feature numbers or directory names to scans; return (features, unmatched)"""
+    dirs = list_feature_dirs(SPECS_DIR)
+    features = []
+    unmatched = []
+    for name in names:
+        matches = [d for d in dirs if d.name == name or d.name.startswith(f"{name}-")]
+        if not matches:
+            unmatched.append(name)
+        features.extend(scan_feature(d) for d in matches if d not in [f.path for f in features])
+    return sorted(features), unmatched
+
+def validate_specs(args: argparse.Namespace) -> int:
+    """Validate features and print the results; returns 1 if any feature fails"""
+    from speckit.validate import ERROR, passed, summarize, validate_features
+
+    start = time.perf_counter()
+    unmatched: List[str] = []
+    if args.feature:
+        features, unmatched = select_features(args.feature)
+    elif args.since or args.staged:
+        try:
+            changed = changed_features(SPECS_DIR, args.since, args.staged)
+        except GitError as e:
+            print(f"❌ Could not list changed features: {e}")
+            return 1
+        features = [scan_feature(SPECS_DIR / name) for name in sorted(changed) if (SPECS_DIR / name).is_dir()]
+    else:
+        features, _ = scan_features(SPECS_DIR)
+
+    results = list(validate_features(features, args.jobs))
+    for name in unmatched:
+        results.append({
+            "feature": name,
+            "issues": [{"check": "files", "severity": ERROR, "message": f"no spec directory found for feature {name}"}],
+        })
+    report = summarize(results, args.strict)
+    summary = report["summary"]
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return 0 if summary["failed"] == 0 else 1
+
+    for result in results:
+        if not result["issues"]:
+            continue
+        marker = "✅" if passed(result, args.strict) else "❌"
+        print(f"{marker} {result['feature']}")
+        for issue in result["issues"]:
+            icon = "❌" if issue["severity"] == ERROR else "⚠️ "
+            print(f"   {icon} [{issue['check']}] {issue['message']}")
+
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f"\n🔍 Validated {summary['features']} feature(s) in {elapsed:.1f} ms: "
+          f"{summary['passed']} passed, {summary['failed']} failed "
+          f"({summary['errors']} errors, {summary['warnings']} warnings)")
+    return 0 if summary["failed"] == 0 else 1
+
+class SpecService:
+    """The requests of `serve`, answered from caches that stay warm between requests.
+
+    Specs are parsed and checked (the spec.md part of validate) once, and
+    again only when spec.md's size or mtime changes; the feature directory listing is re-read only when specs/
+    changes; compiled templates are cached by speckit.templates. The
+    manifest is reloaded when another process rewrote it or the templates
+    changed. speckit_client.py uses this class directly when no server runs.
+    """
+
+    def __init__(self):
+        self.started = time.time()
+        self.requests = 0
+        self.dirs: List[Path] = []
+        self.dirs_mtime_ns = -1
+        # feature name -> (spec.md size, mtime_ns, FeatureInfo, SpecCheck or None until checked)
+        self.infos: Dict[str, Tuple[int, int, FeatureInfo, Optional[SpecCheck]]] = {}
+        self.manifest: Optional[Manifest] = None
+        self.manifest_mtime_ns = -1
+        self.methods = {
+            "parse": self.parse,
+            "render": self.render,
+            "validate": self.validate,
+            "regenerate": self.regenerate,
+            "status": self.status,
+        }
+
+    def dispatch(self, method: str, params: Dict[str, Any]) -> Any:
+        """Run one request; raises RPCError for unknown methods and bad params"""
+        from speckit.server import METHOD_NOT_FOUND, RPCError
+        handler = self.methods.get(method)
+        if handler is None:
+            raise RPCError(METHOD_NOT_FOUND, f"unknown method '{method}' (choose from {', '.join(self.methods)})")
+        self.requests += 1
+        return handler(params)
+
+    def warm(self) -> int:
+        """Fill the caches ahead of the first request; returns the number of specs parsed"""
+        from speckit.constitution import ConstitutionError, load_constitution
+        from speckit.templates import load_template
+
+        for template in TEMPLATE_INPUTS:
+            load_template(template)
+        try:
+            load_constitution(CONSTITUTION_PATH, CONSTITUTION_CACHE_PATH)
+        except ConstitutionError:
+            pass
+        for spec_dir in self.feature_dirs():
+            try:
+                self.feature_info(spec_dir)
+            except OSError:
+                continue
+        return len(self.infos)
+
+    def feature_dirs(self) -> List[Path]:
+        st = SPECS_DIR.stat()
+        if st.st_mtime_ns != self.dirs_mtime_ns:
+            self.dirs = list_feature_dirs(SPECS_DIR)
+            self.dirs_mtime_ns = st.st_mtime_ns
+            present = {d.name for d in self.dirs}
+            for name in [name for name in self.infos if name not in present]:
+                del self.infos[name]
+        return self.dirs
+
+    def resolve(self, value: Any) -> Path:
+        """The feature directory for a number (001) or directory name"""
+        from speckit.server import INVALID_PARAMS, RPCError
+        if not isinstance(value, str) or not value:
+            raise RPCError(INVALID_PARAMS, "feature must be a feature number or directory name")
+        matches = [d for d in self.feature_dirs() if d.name == value or d.name.startswith(f"{value}-")]
+        if len(matches) != 1:
+            problem = "no spec directory found" if not matches else "several spec directories found"
+            raise RPCError(INVALID_PARAMS, f"{problem} for feature {value}")
+        return matches[0]
+
+    def feature_info(self, spec_dir: Path) -> FeatureInfo:
+        return self.parsed_spec(spec_dir)[2]
+
+    def parsed_spec(self, spec_dir: Path) -> Tuple[int, int, FeatureInfo, "SpecCheck"]:
+        """The cache entry of a spec, parsed and checked from one read of spec.md when it changed"""
+        from speckit.validate import check_spec
+
+        st = (spec_dir / "spec.md").stat()
+        cached = self.infos.get(spec_dir.name)
+        fresh = cached is not None and cached[:2] == (st.st_size, st.st_mtime_ns)
+        if fresh and cached[3] is not None:
+            return cached
+        content = (spec_dir / "spec.md").read_text()
+        # regenerate() caches the FeatureInfo it parsed, but not the checks
+        info = cached[2] if fresh else parse_feature(spec_dir.name, content)
+        entry = (st.st_size, st.st_mtime_ns, info, check_spec(spec_dir.name, content, info.requirements))
+        self.infos[spec_dir.name] = entry
+        return entry
+
+    def parse(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """The parsed spec.md of params["feature"]"""
+        from speckit.server import INVALID_PARAMS, RPCError
+        spec_dir = self.resolve(params.get("feature"))
+        try:
+            info = self.feature_info(spec_dir)
+        except FileNotFoundError:
+            raise RPCError(INVALID_PARAMS, f"{spec_dir.name} has no spec.md") from None
+        return {"feature": info.feature, **info.as_dict()}
+
+    def render(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Render params["output"] (plan by default, or any --export format) without writing it"""
+        from speckit.server import INVALID_PARAMS, RPCError
+        spec_dir = self.resolve(params.get("feature"))
+        name = params.get("output", "plan")
+        renderer = RENDERERS.get(name)
+        if renderer is None:
+            raise RPCError(INVALID_PARAMS, f"unknown output '{name}' (choose from {', '.join(RENDERERS)})")
+        try:
+            info = self.feature_info(spec_dir)
+        except FileNotFoundError:
+            raise RPCError(INVALID_PARAMS, f"{spec_dir.name} has no spec.md") from None
+        return {"feature": spec_dir.name, "output": output_name(renderer, spec_dir.name),
+                "content": renderer.render(info)}
+
+    def validate(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """The validate --json report for params["features"] (default: every feature)"""
+        from speckit.server import INVALID_PARAMS, RPCError
+        from speckit.validate import summarize, validate_feature
+        names = params.get("features")
+        if names is None:
+            dirs = self.feature_dirs()
+        elif isinstance(names, list):
+            dirs = [self.resolve(name) for name in names]
+        else:
+            raise RPCError(INVALID_PARAMS, "features must be a list of feature numbers or directory names")
+        results = []
+        for spec_dir in dirs:
+            try:
+                spec_check = self.parsed_spec(spec_dir)[3]
+            except (OSError, UnicodeDecodeError):
+                # validate_feature() reports the missing or unreadable spec.md
+                spec_check = None
+            results.append(validate_feature(scan_feature(spec_dir), spec_check))
+        return summarize(results, bool(params.get("strict")))
+
+    def regenerate(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Run the generator on params["feature"], as `generate_all_docs.py` would, and update the caches"""
+        from speckit.index import SpecIndex
+
+        spec_dir = self.resolve(params.get("feature"))
+        inputs = generator_inputs()
+        try:
+            manifest_mtime_ns = MANIFEST_PATH.stat().st_mtime_ns
+        except FileNotFoundError:
+            manifest_mtime_ns = -1
+        if self.manifest is None or self.manifest.inputs != inputs or manifest_mtime_ns != self.manifest_mtime_ns:
+            self.manifest = load_manifest(inputs)
+
+        name = spec_dir.name
+        result = process_feature(scan_feature(spec_dir), self.manifest.get(name), inputs, bool(params.get("force")),
+                                 adopt=bool(params.get("adopt")))
+        self.manifest.update(name, result["entry"])
+        self.manifest.save()
+        self.manifest_mtime_ns = MANIFEST_PATH.stat().st_mtime_ns if MANIFEST_PATH.exists() else -1
+        infos = {}
+        if result["info"] is not None and not result["stats"]["errors"]:
+            spec = result["entry"]["spec"]
+            self.infos[name] = (spec["size"], spec["mtime_ns"], result["info"], None)
+            infos[name] = result["info"]
+        with SpecIndex(INDEX_PATH) as index:
+            index.refresh([spec_dir], complete=False, infos=infos)
+        return {"feature": name, "log": result["log"], "stats": result["stats"]}
+
+    def status(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Server process and cache counters"""
+        return {
+            "pid": os.getpid(),
+            "uptime_seconds": round(time.time() - self.started, 3),
+            "requests": self.requests,
+            "features": len(self.dirs),
+            "parsed_specs": len(self.infos),
+        }
+
+def serve_specs(args: argparse.Namespace) -> int:
+    """Warm the caches and answer requests on the socket until interrupted"""
+    import signal
+
+    from speckit.server import serve
+
+    start = time.perf_counter()
+    service = SpecService()
+    parsed = service.warm()
+    # Leave through serve()'s cleanup, which removes the socket file
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+
+    def ready():
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"🛰️  Serving {parsed} parsed spec(s) on {args.socket} "
+              f"(warmed up in {elapsed:.1f} ms, Ctrl-C to stop)", flush=True)
+
+    try:
+        serve(args.socket, service.dispatch, ready)
+    except OSError as e:
+        print(f"❌ Could not serve on {args.socket}: {e}")
+        return 1
+    except KeyboardInterrupt:
+        print("\n👋 Stopped serving")
+    return 0
 
 if __name__ == "__main__":
     exit(main())
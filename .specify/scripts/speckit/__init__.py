@@ -0,0 +1,3 @@
+"""
+Support modules for the Speckit Python tooling (generate_all_docs.py)
+"""
@@ -0,0 +1,696 @@
+"""
+In-process port of update-agent-context.sh (generate_all_docs.py agent-context)
+
+The shell script reads plan.md through a grep | head | sed | sed | grep -v |
+grep -v pipeline per field and edits agent files with one `sed -i` per
+template placeholder, forking dozens of processes per run. Here plan.md is
+read and parsed once, and each agent file gets a single read-modify-write
+(AGENTS.md, which the script updates twice when every agent is refreshed,
+is updated twice in memory and written once). The only subprocess is one
+`git rev-parse` to locate the repository and branch.
+
+Output is byte-identical to the script's, quirks included, because agent
+files already maintained by the script must keep diffing cleanly:
+
+    - "already listed" checks use the tech stack as a grep basic regular
+      expression, not as a literal string
+    - new files get sed replacement semantics: `&` inserts the placeholder,
+      `\\n` becomes a newline, other escapes and \\U/\\L case conversion apply,
+      and an unescaped `|` in a value makes the substitution fail
+    - lines are re-emitted through bash `echo`, so a line consisting only of
+      -n/-e/-E flags is swallowed and a missing final newline is added
+    - a "## Recent Changes" heading directly after the Active Technologies
+      section only closes that section and gets no new entry
+
+The one deliberate difference: rewritten files keep their permissions
+(the script's mktemp + mv leaves them 0600).
+"""
+
+import os
+import re
+import subprocess
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from speckit.output import atomic_write
+
+# agent type -> (file relative to the repository root, display name)
+AGENTS: Dict[str, Tuple[str, str]] = {
+    "claude": ("CLAUDE.md", "Claude Code"),
+    "gemini": ("GEMINI.md", "Gemini CLI"),
+    "copilot": (".github/copilot-instructions.md", "GitHub Copilot"),
+    "cursor-agent": (".cursor/rules/specify-rules.mdc", "Cursor IDE"),
+    "qwen": ("QWEN.md", "Qwen Code"),
+    "opencode": ("AGENTS.md", "opencode"),
+    "codex": ("AGENTS.md", "Codex CLI"),
+    "windsurf": (".windsurf/rules/specify-rules.md", "Windsurf"),
+    "kilocode": (".kilocode/rules/specify-rules.md", "Kilo Code"),
+    "auggie": (".augment/rules/specify-rules.md", "Auggie CLI"),
+    "roo": (".roo/rules/specify-rules.md", "Roo Code"),
+    "codebuddy": ("CODEBUDDY.md", "CodeBuddy CLI"),
+    "amp": ("AGENTS.md", "Amp"),
+    "q": ("AGENTS.md", "Amazon Q Developer CLI"),
+}
+
+# Files refreshed when no agent type is given, in the script's order
+# (AGENTS.md appears twice there too)
+EXISTING_AGENTS: List[Tuple[str, str]] = [
+    ("CLAUDE.md", "Claude Code"),
+    ("GEMINI.md", "Gemini CLI"),
+    (".github/copilot-instructions.md", "GitHub Copilot"),
+    (".cursor/rules/specify-rules.mdc", "Cursor IDE"),
+    ("QWEN.md", "Qwen Code"),
+    ("AGENTS.md", "Codex/opencode"),
+    (".windsurf/rules/specify-rules.md", "Windsurf"),
+    (".kilocode/rules/specify-rules.md", "Kilo Code"),
+    (".augment/rules/specify-rules.md", "Auggie CLI"),
+    (".roo/rules/specify-rules.md", "Roo Code"),
+    ("CODEBUDDY.md", "CodeBuddy CLI"),
+    ("AGENTS.md", "Amazon Q Developer CLI"),
+]
+
+TEMPLATE = Path(".specify") / "templates" / "agent-file-template.md"
+
+# Read and write agent files byte for byte, whatever their encoding
+ENCODING_ERRORS = "surrogateescape"
+
+FEATURE_PREFIX_RE = re.compile(r'([0-9]{3})-')
+DATE_RE = re.compile(r'[0-9]{4}-[0-9]{2}-[0-9]{2}')
+LAST_UPDATED_RE = re.compile(r'\*\*Last updated\*\*:.*[0-9]{4}-[0-9]{2}-[0-9]{2}')
+# [[:space:]] in the C locale
+SECTION_RE = re.compile(r'##[ \t\n\v\f\r]')
+ECHO_FLAGS_RE = re.compile(r'-[neE]+')
+SED_SPECIAL_RE = re.compile(r'[\\\[.*^$()+{}|]')
+
+# (placeholder regex, global flag) of each sed substitution, applied in order
+SUBSTITUTIONS = (
+    (re.compile(r'\[PROJECT NAME\]'), False),
+    (re.compile(r'\[DATE\]'), False),
+    (re.compile(r'\[EXTRACTED FROM ALL PLAN.MD FILES\]'), False),
+    (re.compile(r'\[ACTUAL STRUCTURE FROM PLANS\]'), True),
+    (re.compile(r'\[ONLY COMMANDS FOR ACTIVE TECHNOLOGIES\]'), False),
+    (re.compile(r'\[LANGUAGE-SPECIFIC, ONLY FOR LANGUAGES IN USE\]'), False),
+    (re.compile(r'\[LAST 3 FEATURES AND WHAT THEY ADDED\]'), False),
+)
+
+class PlanData(NamedTuple):
+    """The plan.md fields the agent files are built from ("" when absent)"""
+    lang: str
+    framework: str
+    db: str
+    project_type: str
+
+class FeatureContext(NamedTuple):
+    """What common.sh's get_feature_paths resolves"""
+    repo_root: Path
+    branch: str
+    has_git: bool
+    feature_dir: Path
+
+# ---------------------------------------------------------------------------
+# grep basic regular expressions
+
+_POSIX_CLASSES = {
+    "alpha": "a-zA-Z", "digit": "0-9", "alnum": "0-9a-zA-Z", "upper": "A-Z",
+    "lower": "a-z", "space": " \\t\\n\\r\\f\\v", "blank": " \\t", "xdigit": "0-9A-Fa-f",
+    "punct": re.escape("!\"#$%&'()*+,-./:;<=>?@[\\]^_`{|}~"),
+    "print": "\\x20-\\x7e", "graph": "\\x21-\\x7e", "cntrl": "\\x00-\\x1f\\x7f",
+}
+
+_BRE_ESCAPES = {
+    "<": r"\b(?=\w)", ">": r"\b(?<=\w)", "b": r"\b", "B": r"\B",
+    "w": r"\w", "W": r"\W", "s": r"\s", "S": r"\S", "`": r"\A", "'": r"\Z",
+}
+
+def _bracket(pattern: str, i: int) -> Tuple[str, int]:
+    """Translate the bracket expression starting at pattern[i] == '['"""
+    j = i + 1
+    negate = pattern.startswith("^", j)
+    if negate:
+        j += 1
+    items = []
+    first = True
+    while True:
+        if j >= len(pattern):
+            raise re.error("Unmatched [")
+        c = pattern[j]
+        if c == "]" and not first:
+            break
+        first = False
+        if pattern.startswith("[:", j):
+            end = pattern.find(":]", j + 2)
+            if end < 0 or pattern[j + 2:end] not in _POSIX_CLASSES:
+                raise re.error("Invalid character class name")
+            items.append(_POSIX_CLASSES[pattern[j + 2:end]])
+            j = end + 2
+            continue
+        if pattern.startswith("[=", j) or pattern.startswith("[.", j):
+            end = pattern.find(pattern[j + 1] + "]", j + 2)
+            if end < 0:
+                raise re.error("Unmatched [")
+            c = pattern[j + 2:end]
+            j = end + 2
+        else:
+            j += 1
+        if pattern.startswith("-", j) and not pattern.startswith("-]", j) and j + 1 < len(pattern):
+            high = pattern[j + 1]
+            if high < c:
+                raise re.error("Invalid range end")
+            items.append(f"{re.escape(c)}-{re.escape(high)}")
+            j += 2
+        else:
+            items.append(re.escape(c))
+    return "[" + ("^" if negate else "") + "".join(items) + "]", j + 1
+
+def bre_to_python(pattern: str) -> str:
+    """Translate a GNU basic regular expression (grep's default syntax) to Python re syntax"""
+    out: List[str] = []
+    atom = -1          # index in out where the last quantifiable atom starts
+    quantified = False
+    groups: List[int] = []
+    closed = 0
+    start = True       # '*' is literal and '^' an anchor here
+    i, n = 0, len(pattern)
+
+    def quantify(q: str):
+        nonlocal quantified
+        if quantified:
+            out[atom:] = ["(?:" + "".join(out[atom:]) + ")"]
+        out.append(q)
+        quantified = True
+
+    while i < n:
+        c = pattern[i]
+        i += 1
+        if c == "\\":
+            if i == n:
+                raise re.error("Trailing backslash")
+            c = pattern[i]
+            i += 1
+            if c == "(":
+                groups.append(len(out))
+                out.append("(")
+                start, atom, quantified = True, -1, False
+                continue
+            if c == "|":
+                out.append("|")
+                start, atom, quantified = True, -1, False
+                continue
+            if c == ")":
+                if not groups:
+                    raise re.error("Unmatched ) or \\)")
+                out.append(")")
+                atom, quantified, start = groups.pop(), False, False
+                closed += 1
+                continue
+            if c == "{":
+                end = pattern.find("\\}", i)
+                bounds = pattern[i:end]
+                if start or atom < 0 or end < 0 or not re.fullmatch(r'\d+(,\d*)?|,\d+', bounds):
+                    raise re.error("Invalid preceding regular expression")
+                quantify("{" + bounds + "}")
+                i = end + 2
+                continue
+            if c in "+?" and not start and atom >= 0:
+                quantify(c)
+                continue
+            if c in "123456789":
+                if int(c) > closed:
+                    raise re.error("Invalid back reference")
+                fragment = "\\" + c
+            else:
+                fragment = _BRE_ESCAPES.get(c, re.escape(c))
+        elif c == "[":
+            fragment, i = _bracket(pattern, i - 1)
+        elif c == "*" and not start and atom >= 0:
+            if not quantified:
+                quantify("*")
+            continue
+        elif c == "^" and start:
+            out.append("^")
+            continue
+        elif c == "$" and (i == n or pattern.startswith("\\)", i) or pattern.startswith("\\|", i)):
+            out.append("$")
+            start, atom, quantified = False, -1, False
+            continue
+        elif c == ".":
+            fragment = "."
+        else:
+            fragment = re.escape(c)
+        atom, quantified, start = len(out), False, False
+        out.append(fragment)
+
+    if groups:
+        raise re.error("Unmatched ( or \\(")
+    return "".join(out)
+
+def grep_quiet(pattern: str, text: str) -> bool:
+    """Return the exit status of `grep -q "$pattern"` on text as a bool (True = 0)"""
+    if pattern.startswith("-"):
+        # grep parses it as options and exits 2
+        return False
+    try:
+        regex = re.compile(bre_to_python(pattern))
+    except re.error:
+        return False
+    return any(regex.search(line) for line in text.split("\n"))
+
+# ---------------------------------------------------------------------------
+# sed replacements
+
+class SedError(ValueError):
+    """sed rejected an s command"""
+
+def _sed_replacement(text: str) -> List[Tuple[str, str]]:
+    """Compile the RHS of `s|regex|text|` into (kind, value) pieces as GNU sed would"""
+    # match_slash(): an unescaped delimiter ends the RHS, '\|' is a plain '|'
+    chars: List[str] = []
+    i = 0
+    while i < len(text):
+        c = text[i]
+        if c == "|":
+            raise SedError("unknown option to `s'")
+        if c == "\\":
+            i += 1
+            if i == len(text):
+                raise SedError("unterminated `s' command")
+            chars.append("|" if text[i] == "|" else "\\" + text[i])
+        else:
+            chars.append(c)
+        i += 1
+
+    pieces: List[Tuple[str, str]] = []
+    controls = {"a": "\a", "f": "\f", "n": "\n", "r": "\r", "t": "\t", "v": "\v"}
+    radixes = {"d": (10, 3, "0123456789"), "o": (8, 3, "01234567"), "x": (16, 2, "0123456789abcdefABCDEF")}
+    i = 0
+    while i < len(chars):
+        c = chars[i]
+        i += 1
+        if c == "&":
+            pieces.append(("match", ""))
+        elif len(c) == 1:
+            pieces.append(("text", c))
+        elif c[1] == "0":
+            pieces.append(("match", ""))
+        elif c[1] in "123456789":
+            raise SedError(f"invalid reference \\{c[1]} on `s' command's RHS")
+        elif c[1] in "LUElu":
+            pieces.append(("case", c[1]))
+        elif c[1] in controls:
+            pieces.append(("text", controls[c[1]]))
+        elif c[1] == "c" and i < len(chars) and len(chars[i]) == 1:
+            pieces.append(("text", chr(ord(chars[i].upper()) ^ 0x40)))
+            i += 1
+        elif c[1] in radixes:
+            base, width, valid = radixes[c[1]]
+            digits = ""
+            while len(digits) < width and i < len(chars) and len(chars[i]) == 1 and chars[i] in valid:
+                digits += chars[i]
+                i += 1
+            pieces.append(("text", chr(int(digits, base) & 0xFF) if digits else c[1]))
+        else:
+            pieces.append(("text", c[1]))
+    return pieces
+
+def _expand(pieces: List[Tuple[str, str]], match: str) -> str:
+    """Build one replacement, applying \\U/\\L/\\u/\\l/\\E case conversion"""
+    out = []
+    persistent = one_shot = ""
+    for kind, value in pieces:
+        if kind == "case":
+            if value in "UL":
+                persistent = value
+            elif value == "E":
+                persistent = one_shot = ""
+            else:
+                one_shot = value
+            continue
+        text = match if kind == "match" else value
+        if not text:
+            continue
+        if persistent:
+            text = text.upper() if persistent == "U" else text.lower()
+        if one_shot:
+            text = (text[0].upper() if one_shot == "u" else text[0].lower()) + text[1:]
+            one_shot = ""
+        out.append(text)
+    return "".join(out)
+
+def sed_substitute(content: str, regex: "re.Pattern[str]", replacement: str, global_: bool) -> str:
+    """Apply `sed -e "s|<regex>|<replacement>|[g]"` to content, line by line"""
+    pieces = _sed_replacement(replacement)
+    lines = content.split("\n")
+    count = 0 if global_ else 1
+    return "\n".join(regex.sub(lambda m: _expand(pieces, m.group()), line, count=count) for line in lines)
+
+def sed_escape(value: str) -> str:
+    """The script's `sed 's/[\\[\\.*^$()+{}|]/\\\\&/g'` escaping"""
+    return SED_SPECIAL_RE.sub(lambda m: "\\" + m.group(), value)
+
+# ---------------------------------------------------------------------------
+# plan.md
+
+def extract_plan_field(content: str, field: str) -> str:
+    """The first `**field**: value` line's value, "" if absent, unclear or N/A"""
+    prefix = f"**{field}**: "
+    for line in content.split("\n"):
+        if line.startswith(prefix):
+            value = line[len(prefix):].strip(" \t")
+            if "NEEDS CLARIFICATION" in value or value == "N/A":
+                return ""
+            return value
+    return ""
+
+def parse_plan(content: str) -> PlanData:
+    """Extract the agent-file fields from plan.md"""
+    return PlanData(
+        lang=extract_plan_field(content, "Language/Version"),
+        framework=extract_plan_field(content, "Primary Dependencies"),
+        db=extract_plan_field(content, "Storage"),
+        project_type=extract_plan_field(content, "Project Type"),
+    )
+
+def technology_stack(plan: PlanData) -> str:
+    """Language and framework joined with " + " """
+    parts = [plan.lang] if plan.lang and plan.lang != "NEEDS CLARIFICATION" else []
+    if plan.framework and plan.framework not in ("NEEDS CLARIFICATION", "N/A"):
+        parts.append(plan.framework)
+    return " + ".join(parts)
+
+def project_structure(project_type: str) -> str:
+    return "backend/\\nfrontend/\\ntests/" if "web" in project_type else "src/\\ntests/"
+
+def language_commands(lang: str) -> str:
+    if "Python" in lang:
+        return "cd src && pytest && ruff check ."
+    if "Rust" in lang:
+        return "cargo test && cargo clippy"
+    if "JavaScript" in lang or "TypeScript" in lang:
+        return "npm test \\&\\& npm run lint"
+    return f"# Add commands for {lang}"
+
+# ---------------------------------------------------------------------------
+# Agent files
+
+def render_new_file(template: str, plan: PlanData, branch: str, project_name: str, date: str) -> str:
+    """create_new_agent_file(): fill the agent file template (raises SedError)"""
+    lang, framework = sed_escape(plan.lang), sed_escape(plan.framework)
+    escaped_branch = sed_escape(branch)
+    added = " + ".join(part for part in (lang, framework) if part)
+    tech_stack = f"- {added} ({escaped_branch})" if added else f"- ({escaped_branch})"
+    recent_change = f"- {escaped_branch}: Added {added}" if added else f"- {escaped_branch}: Added"
+
+    replacements = (
+        project_name,
+        date,
+        tech_stack,
+        project_structure(plan.project_type),
+        language_commands(plan.lang),
+        f"{plan.lang}: Follow standard conventions",
+        recent_change,
+    )
+    content = template
+    for (regex, global_), replacement in zip(SUBSTITUTIONS, replacements):
+        content = sed_substitute(content, regex, replacement, global_)
+    # The script's final "s/\\n/$(printf '\n')/g" substitutes an empty string
+    return content.replace("\\n", "")
+
+def _echo(line: str) -> str:
+    """What bash's `echo "$line"` prints"""
+    if ECHO_FLAGS_RE.fullmatch(line):
+        return "" if "n" in line else "\n"
+    return line + "\n"
+
+def update_existing_file(content: str, plan: PlanData, branch: str, date: str) -> str:
+    """update_existing_agent_file(): add new technologies and the recent change"""
+    tech_stack = technology_stack(plan)
+    has_db = plan.db not in ("", "N/A", "NEEDS CLARIFICATION")
+    new_tech_entries = []
+    if tech_stack and not grep_quiet(tech_stack, content):
+        new_tech_entries.append(f"- {tech_stack} ({branch})\n")
+    if has_db and not grep_quiet(plan.db, content):
+        new_tech_entries.append(f"- {plan.db} ({branch})\n")
+    tech_entries = "".join(new_tech_entries)
+
+    if tech_stack:
+        new_change_entry = f"- {branch}: Added {tech_stack}"
+    elif has_db:
+        new_change_entry = f"- {branch}: Added {plan.db}"
+    else:
+        new_change_entry = ""
+
+    lines = content.split("\n")
+    if lines[-1] == "":
+        lines.pop()
+    has_active_technologies = any(line.startswith("## Active Technologies") for line in lines)
+    has_recent_changes = any(line.startswith("## Recent Changes") for line in lines)
+
+    out: List[str] = []
+    in_tech_section = in_changes_section = tech_entries_added = False
+    existing_changes_count = 0
+    for line in lines:
+        # bash's read drops NUL bytes
+        line = line.replace("\0", "")
+        if line == "## Active Technologies":
+            out.append(_echo(line))
+            in_tech_section = True
+            continue
+        if in_tech_section and (SECTION_RE.match(line) or not line):
+            if not tech_entries_added and tech_entries:
+                out.append(tech_entries)
+                tech_entries_added = True
+            out.append(_echo(line))
+            if line:
+                in_tech_section = False
+            continue
+
+        if line == "## Recent Changes":
+            out.append(_echo(line))
+            if new_change_entry:
+                out.append(new_change_entry + "\n")
+            in_changes_section = True
+            continue
+        if in_changes_section and SECTION_RE.match(line):
+            out.append(_echo(line))
+            in_changes_section = False
+            continue
+        if in_changes_section and line.startswith("- "):
+            if existing_changes_count < 2:
+                out.append(_echo(line))
+                existing_changes_count += 1
+            continue
+
+        if LAST_UPDATED_RE.search(line):
+            out.append(DATE_RE.sub(date, line, count=1) + "\n")
+        else:
+            out.append(_echo(line))
+
+    if in_tech_section and not tech_entries_added and tech_entries:
+        out.append(tech_entries)
+    if not has_active_technologies and tech_entries:
+        out.append("\n## Active Technologies\n" + tech_entries)
+    if not has_recent_changes and new_change_entry:
+        out.append("\n## Recent Changes\n" + new_change_entry + "\n")
+    return "".join(out)
+
+# ---------------------------------------------------------------------------
+# Repository context
+
+def _latest_feature(specs_dir: Path) -> Optional[str]:
+    """The NNN-* directory with the highest number, first one on ties"""
+    latest, highest = None, 0
+    try:
+        names = sorted(entry.name for entry in os.scandir(specs_dir) if entry.is_dir())
+    except OSError:
+        return None
+    for name in names:
+        match = FEATURE_PREFIX_RE.match(name)
+        if match and int(match.group(1)) > highest:
+            latest, highest = name, int(match.group(1))
+    return latest
+
+def _feature_dir(repo_root: Path, branch: str, log: Callable[[str], None]) -> Path:
+    """find_feature_dir_by_prefix(): the single specs/NNN-* directory matching the branch"""
+    specs_dir = repo_root / "specs"
+    match = FEATURE_PREFIX_RE.match(branch)
+    if not match:
+        return specs_dir / branch
+    prefix = match.group(1) + "-"
+    try:
+        matches = sorted(entry.name for entry in os.scandir(specs_dir)
+                         if entry.name.startswith(prefix) and entry.is_dir())
+    except OSError:
+        matches = []
+    if len(matches) == 1:
+        return specs_dir / matches[0]
+    if matches:
+        log(f"ERROR: Multiple spec directories found with prefix '{match.group(1)}': {' '.join(matches)}")
+        log("Please ensure only one spec directory exists per numeric prefix.")
+    return specs_dir / branch
+
+def _rev_parse(args: List[str]) -> Optional[List[str]]:
+    try:
+        proc = subprocess.run(["git", "rev-parse", *args], stdout=subprocess.PIPE,
+                              stderr=subprocess.DEVNULL)
+    except FileNotFoundError:
+        return None
+    if proc.returncode != 0:
+        return None
+    return proc.stdout.decode(errors=ENCODING_ERRORS).splitlines()
+
+def resolve_context(fallback_root: Path, log: Callable[[str], None]) -> FeatureContext:
+    """get_feature_paths(): repository root, current feature and its directory.
+
+    The branch is SPECIFY_FEATURE, else git's current branch, else the
+    highest-numbered feature in specs/, else "main". One `git rev-parse`
+    answers both git questions in the common case.
+    """
+    output = _rev_parse(["--show-toplevel", "--abbrev-ref", "HEAD"])
+    if output is not None and len(output) == 2:
+        repo_root, git_branch, has_git = Path(output[0]), output[1], True
+    else:
+        # Not a repository, or no commit on the branch yet
+        toplevel = _rev_parse(["--show-toplevel"])
+        has_git = bool(toplevel)
+        repo_root = Path(toplevel[0]) if toplevel else Path(os.path.abspath(fallback_root))
+        git_branch = None
+
+    branch = os.environ.get("SPECIFY_FEATURE") or git_branch or _latest_feature(repo_root / "specs") or "main"
+    return FeatureContext(repo_root, branch, has_git, _feature_dir(repo_root, branch, log))
+
+def _read(path: Path) -> str:
+    with open(path, 'r', errors=ENCODING_ERRORS, newline='') as f:
+        return f.read()
+
+def update_agent_context(agent_type: Optional[str], fallback_root: Path,
+                         out: Callable[[str], None] = print,
+                         err: Callable[[str], None] = lambda line: print(line, file=sys.stderr)) -> int:
+    """Run the equivalent of `update-agent-context.sh [agent_type]`, returning its exit status"""
+    context = resolve_context(fallback_root, err)
+    repo_root, branch = context.repo_root, context.branch
+    plan_path = context.feature_dir / "plan.md"
+    template_path = repo_root / TEMPLATE
+
+    if not branch:
+        err("ERROR: Unable to determine current feature")
+        out("INFO: Make sure you're on a feature branch" if context.has_git
+            else "INFO: Set SPECIFY_FEATURE environment variable or create a feature first")
+        return 1
+    if not plan_path.is_file():
+        err(f"ERROR: No plan.md found at {plan_path}")
+        out("INFO: Make sure you're working on a feature with a corresponding spec directory")
+        if not context.has_git:
+            out("INFO: Use: export SPECIFY_FEATURE=your-feature-name or create a new feature first")
+        return 1
+    if not template_path.is_file():
+        err(f"WARNING: Template file not found at {template_path}")
+        err("WARNING: Creating new agent files will fail")
+
+    out(f"INFO: === Updating agent context files for feature {branch} ===")
+    if not os.access(plan_path, os.R_OK):
+        err(f"ERROR: Plan file is not readable: {plan_path}")
+        err("ERROR: Failed to parse plan data")
+        return 1
+    out(f"INFO: Parsing plan data from {plan_path}")
+    plan = parse_plan(_read(plan_path))
+    if plan.lang:
+        out(f"INFO: Found language: {plan.lang}")
+    else:
+        err("WARNING: No language information found in plan")
+    if plan.framework:
+        out(f"INFO: Found framework: {plan.framework}")
+    if plan.db and plan.db != "N/A":
+        out(f"INFO: Found database: {plan.db}")
+    if plan.project_type:
+        out(f"INFO: Found project type: {plan.project_type}")
+
+    date = datetime.now().strftime("%Y-%m-%d")
+    # path -> new content, written once each after every update is applied
+    pending: Dict[Path, str] = {}
+
+    def update(relative: str, name: str) -> bool:
+        target = repo_root / relative
+        out(f"INFO: Updating {name} context file: {target}")
+        try:
+            target.parent.mkdir(parents=True, exist_ok=True)
+        except OSError:
+            err(f"ERROR: Failed to create directory: {target.parent}")
+            return False
+
+        if target in pending or target.is_file():
+            if target not in pending:
+                if not os.access(target, os.R_OK):
+                    err(f"ERROR: Cannot read existing file: {target}")
+                    return False
+                if not os.access(target, os.W_OK):
+                    err(f"ERROR: Cannot write to existing file: {target}")
+                    return False
+            out("INFO: Updating existing agent context file...")
+            content = pending[target] if target in pending else _read(target)
+            pending[target] = update_existing_file(content, plan, branch, date)
+            out(f"✓ Updated existing {name} context file")
+            return True
+
+        if not template_path.is_file():
+            err(f"ERROR: Template not found at {template_path}")
+        elif not os.access(template_path, os.R_OK):
+            err(f"ERROR: Template file is not readable: {template_path}")
+        else:
+            out("INFO: Creating new agent context file from template...")
+            try:
+                content = render_new_file(_read(template_path), plan, branch, repo_root.name, date)
+            except SedError as e:
+                err(f"sed: {e}")
+                err("ERROR: Failed to perform substitution")
+            else:
+                pending[target] = content
+                out(f"✓ Created new {name} context file")
+                return True
+        err("ERROR: Failed to create new agent file")
+        return False
+
+    if agent_type:
+        out(f"INFO: Updating specific agent: {agent_type}")
+        if agent_type not in AGENTS:
+            err(f"ERROR: Unknown agent type '{agent_type}'")
+            err("ERROR: Expected: claude|gemini|copilot|cursor-agent|qwen|opencode|codex|windsurf|kilocode|auggie|roo|amp|q")
+            return 1
+        success = update(*AGENTS[agent_type])
+    else:
+        out("INFO: No agent specified, updating all existing agent files...")
+        found = False
+        for relative, name in EXISTING_AGENTS:
+            if (repo_root / relative).is_file():
+                update(relative, name)
+                found = True
+        success = True
+        if not found:
+            out("INFO: No existing agent files found, creating default Claude file...")
+            success = update(*AGENTS["claude"])
+
+    for target, content in pending.items():
+        try:
+            atomic_write(target, content, errors=ENCODING_ERRORS)
+        except OSError as e:
+            err(f"ERROR: Failed to update target file: {e}")
+            success = False
+
+    out("")
+    out("INFO: Summary of changes:")
+    if plan.lang:
+        out(f"  - Added language: {plan.lang}")
+    if plan.framework:
+        out(f"  - Added framework: {plan.framework}")
+    if plan.db and plan.db != "N/A":
+        out(f"  - Added database: {plan.db}")
+    out("")
+    out("INFO: Usage: generate_all_docs.py agent-context "
+        "[claude|gemini|copilot|cursor-agent|qwen|opencode|codex|windsurf|kilocode|auggie|codebuddy|q]")
+
+    if success:
+        out("✓ Agent context update completed successfully")
+        return 0
+    err("ERROR: Agent context update completed with errors")
+    return 1
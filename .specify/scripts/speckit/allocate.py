@@ -0,0 +1,183 @@
+"""
+Feature numbers for create-new-feature.sh (generate_all_docs.py allocate)
+
+The script used to find the next number by listing specs/ and every local
+and remote branch (after a `git fetch --all`) on each run, and two agents
+creating features at the same time could both pick the same number.
+allocate() instead:
+
+    lock     takes an exclusive flock() on .specify/cache/features.lock, so
+             concurrent allocations run one after the other; the kernel
+             releases it when the process exits, however it exits
+    index    reads .specify/cache/features.json: the numbers in use and the
+             mtimes of specs/ and of every remote-tracking ref directory
+             they were collected at. The refs are looked up in the git
+             common dir (`git rev-parse --git-common-dir`, run once and kept
+             in the index), so worktrees and submodules, where .git is a
+             file, work too. Only when one of those has changed since (a
+             feature directory added, removed or renamed by anything else,
+             or a fetch) is the index rebuilt, from one scandir() of specs/
+             and one `git for-each-ref` of the local and remote-tracking
+             branches. Creating a local branch does not count: the script
+             creates each one next to its specs/ directory
+    claim    creates specs/NNN-slug/ with the next free number while still
+             holding the lock, and records the number and the new mtime of
+             specs/, so the next allocation does not rebuild either
+
+An allocation therefore costs a lock, a small JSON read and write and a
+mkdir(), however many features and branches there are. Remote branches are
+those of the last fetch; the allocator never goes to the network, the
+script fetches before calling it (unless given --no-fetch).
+"""
+
+import bisect
+import fcntl
+import json
+import os
+import re
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, List, NamedTuple, Optional, Set
+
+from speckit.changes import GitError, git_lines, git_output
+from speckit.output import atomic_write
+
+INDEX_VERSION = 2
+
+# GitHub's limit on branch names, which are also the directory names
+MAX_NAME_LENGTH = 244
+
+NUMBER_RE = re.compile(r'^(\d+)-')
+
+class AllocationError(ValueError):
+    """The requested number is taken or the name is unusable"""
+
+class Allocation(NamedTuple):
+    """A claimed feature number and the directory created for it"""
+    number: int
+    name: str           # NNN-slug, also the branch name
+    path: Path
+    rebuilt: bool       # whether specs/ and the branches had to be listed
+
+def feature_number(name: str) -> Optional[int]:
+    """001-user-auth -> 1; None for names without a number"""
+    match = NUMBER_RE.match(name)
+    return int(match.group(1)) if match else None
+
+def branch_names(root: Path) -> List[str]:
+    """Local and remote-tracking branch names, without refs/heads/ or refs/remotes/<remote>/"""
+    try:
+        refs = git_lines(root, ["for-each-ref", "--format=%(refname)%00", "refs/heads", "refs/remotes"])
+    except GitError:
+        return []
+    names = []
+    for ref in refs:
+        ref = ref.strip()
+        if ref.startswith("refs/heads/"):
+            names.append(ref[len("refs/heads/"):])
+        elif ref.startswith("refs/remotes/"):
+            names.append(ref[len("refs/remotes/"):].split("/", 1)[-1])
+    return names
+
+def used_numbers(specs_dir: Path, root: Path) -> Set[int]:
+    """Numbers of the feature directories in specs_dir and of the branches of the repository at root"""
+    names = branch_names(root)
+    try:
+        with os.scandir(specs_dir) as entries:
+            names.extend(entry.name for entry in entries if entry.is_dir())
+    except FileNotFoundError:
+        pass
+    return {number for number in map(feature_number, names) if number is not None}
+
+@contextmanager
+def locked(lock_path: Path) -> Iterator[None]:
+    """Hold an exclusive advisory lock on lock_path"""
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(lock_path, "a") as lock:
+        fcntl.flock(lock.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock.fileno(), fcntl.LOCK_UN)
+
+def git_common_dir(root: Path) -> Optional[Path]:
+    """The directory holding the refs of the repository at root, shared by all its worktrees; None outside git"""
+    try:
+        path = git_output(root, ["rev-parse", "--git-common-dir"]).decode().strip()
+    except GitError:
+        return None
+    return (root / path).resolve()
+
+def refs_stamp(git_dir: Optional[Path]) -> List[int]:
+    """mtimes of the places git records remote-tracking branches in, which change on every fetch that updates one.
+
+    A loose ref is updated by renaming a lock file over it, which changes the
+    mtime of its directory only, so every directory under refs/remotes/ is
+    stamped: origin/team/x lives in refs/remotes/origin/team/.
+    """
+    if git_dir is None:
+        return []
+    paths = [git_dir / "packed-refs", git_dir / "reftable"]
+    for dirpath, dirnames, _ in os.walk(git_dir / "refs" / "remotes"):
+        dirnames.sort()
+        paths.append(Path(dirpath))
+    stamp = []
+    for path in paths:
+        try:
+            stamp.append(path.stat().st_mtime_ns)
+        except (FileNotFoundError, NotADirectoryError):
+            stamp.append(0)
+    return stamp
+
+def _load(index_path: Path) -> dict:
+    try:
+        with open(index_path, "r") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return data if data.get("version") == INDEX_VERSION else {}
+
+def allocate(specs_dir: Path, cache_dir: Path, slug: str, number: Optional[int] = None,
+             root: Optional[Path] = None) -> Allocation:
+    """Claim the next free feature number (or `number`) and create specs_dir/NNN-slug/ for it"""
+    slug = slug.strip("-")[:MAX_NAME_LENGTH - 4].rstrip("-")
+    if not slug or "/" in slug:
+        raise AllocationError(f"'{slug}' cannot be used in a directory or branch name")
+    if number is not None and number < 1:
+        raise AllocationError("feature numbers start at 1")
+    root = root or specs_dir.parent
+    index_path = cache_dir / "features.json"
+    specs_dir.mkdir(parents=True, exist_ok=True)
+
+    with locked(cache_dir / "features.lock"):
+        data = _load(index_path)
+        mtime_ns = specs_dir.stat().st_mtime_ns
+        # Resolved once per root: .git is a file in worktrees and submodules
+        git_dir = Path(data["git_dir"]) if data.get("root") == str(root) and data.get("git_dir") else None
+        if git_dir is None or not git_dir.is_dir():
+            git_dir = git_common_dir(root)
+        refs = refs_stamp(git_dir)
+        rebuilt = data.get("specs_mtime_ns") != mtime_ns or data.get("refs") != refs
+        used: List[int] = sorted(used_numbers(specs_dir, root)) if rebuilt else data["used"]
+
+        if number is not None and number in used:
+            raise AllocationError(f"feature number {number:03d} is already used by a spec directory or branch")
+        candidate = number if number is not None else (used[-1] + 1 if used else 1)
+        while True:
+            name = f"{candidate:03d}-{slug}"
+            path = specs_dir / name
+            try:
+                path.mkdir()
+                break
+            except FileExistsError:
+                # Created by something outside the allocator since the index was built
+                if number is not None:
+                    raise AllocationError(f"{path} already exists") from None
+                bisect.insort(used, candidate)
+                candidate += 1
+
+        bisect.insort(used, candidate)
+        data = {"version": INDEX_VERSION, "root": str(root), "git_dir": str(git_dir) if git_dir else None,
+                "specs_mtime_ns": specs_dir.stat().st_mtime_ns, "refs": refs, "used": used}
+        atomic_write(index_path, json.dumps(data, separators=(",", ":")) + "\n")
+    return Allocation(candidate, name, path, rebuilt)
@@ -0,0 +1,72 @@
+"""
+Map git changes to feature directories (generate_all_docs.py --since/--staged)
+and to changed files (generate_all_docs.py impact)
+
+One `git diff --name-only` (plus `git ls-files --others` for untracked files
+when comparing against a ref) is run inside specs/, and every changed path
+is reduced to its first component: the feature directory it belongs to.
+The cost is proportional to the size of the change, not of specs/.
+
+With --staged, a spec.md with unstaged changes on top of its staged ones
+(`git add -p`) is read from the index (staged_specs()), so the docs match
+what is being committed.
+"""
+
+import subprocess
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+
+class GitError(RuntimeError):
+    """git is missing, the tree is not a repository, or the ref is unknown"""
+
+def git_output(cwd: Path, args: List[str]) -> bytes:
+    """Run git in cwd and return its output; raises GitError"""
+    try:
+        proc = subprocess.run(
+            ["git", *args],
+            cwd=cwd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            check=True,
+        )
+    except FileNotFoundError:
+        raise GitError("git is not installed")
+    except subprocess.CalledProcessError as e:
+        raise GitError(e.stderr.decode(errors="replace").strip() or f"git {args[0]} failed")
+    return proc.stdout
+
+def git_lines(cwd: Path, args: List[str]) -> List[str]:
+    """Run git in cwd and return its NUL-separated output; raises GitError"""
+    return [path for path in git_output(cwd, args).decode().split("\0") if path]
+
+def changed_paths(cwd: Path, since: Optional[str] = None, staged: bool = False) -> List[str]:
+    """Return the changed file paths under cwd, relative to it.
+
+    staged=True looks at the index (what the next commit contains); since
+    compares the working tree, including untracked files, against a ref.
+    Deleted files are included.
+    """
+    if staged == (since is not None):
+        raise ValueError("pass exactly one of since or staged")
+
+    # --relative limits the diff to cwd and strips the prefix;
+    # --no-renames reports both sides of a move
+    diff = ["diff", "--name-only", "-z", "--relative", "--no-renames"]
+    paths = git_lines(cwd, diff + (["--cached"] if staged else [since, "--"]))
+    if not staged:
+        paths += git_lines(cwd, ["ls-files", "-z", "--others", "--exclude-standard"])
+    return paths
+
+def changed_features(specs_dir: Path, since: Optional[str] = None, staged: bool = False) -> Set[str]:
+    """Return the names of feature directories with changes (see changed_paths)"""
+    return {path.split("/", 1)[0] for path in changed_paths(specs_dir, since, staged) if "/" in path}
+
+def staged_specs(specs_dir: Path, features: Iterable[str]) -> Dict[str, bytes]:
+    """The index copy of each feature's spec.md whose working-tree copy differs from it (partially staged)"""
+    wanted = set(features)
+    unstaged = git_lines(specs_dir, ["diff", "--name-only", "-z", "--relative", "--no-renames", "--diff-filter=M"])
+    return {
+        path.split("/", 1)[0]: git_output(specs_dir, ["show", f":./{path}"])
+        for path in unstaged
+        if path.count("/") == 1 and path.endswith("/spec.md") and path.split("/", 1)[0] in wanted
+    }
@@ -0,0 +1,219 @@
+"""
+Structured values from .specify/memory/constitution.md
+
+parse_constitution() reads the parts of the constitution that generated
+docs repeat:
+
+    backend, frontend   the "- Label: value" lists under **Backend:** and
+                        **Frontend:** (Technology Stack Adherence), keyed by
+                        label in snake_case: framework, database, testing,
+                        build_tool, ui_library, state_management...
+    stack               the tool names of STACK_SUMMARY, e.g. "NestJS,
+                        TypeScript, PostgreSQL, TypeORM, React, Vite..."
+    coverage            statements/branches/functions/lines percentages
+                        ("80%+ statements" or "- Statements: 80%")
+    version, ratified, amended
+
+Templates use them as {{ constitution.backend.testing }}.
+
+load_constitution() caches the parse in .specify/cache/constitution.json,
+keyed like the manifest keys spec.md: size/mtime first, then sha256, so a
+touched-but-identical file is not parsed again. Each process also keeps
+the last config it loaded until the file's mtime changes, like compiled
+templates: pool workers forked after the parent loaded it inherit it,
+spawned ones read the JSON once.
+
+Only the values the templates reference (template_references()) go into
+the generator's inputs, and each output's fingerprint covers only those
+of its own template, so rewording a principle regenerates nothing, while
+a changed value regenerates the generated docs that show it. The cache
+also keeps the values the last full run rendered with, so the generator
+can say which values changed and flag hand-authored docs that still
+mention the old ones.
+"""
+
+import json
+import re
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from speckit.manifest import sha256_bytes
+from speckit.output import atomic_write
+
+CACHE_VERSION = 1
+
+STACK_SECTIONS = ("backend", "frontend")
+# Components named on a plan's **Tech Stack** line, in order
+STACK_SUMMARY = (
+    ("backend", "framework"),
+    ("backend", "database"),
+    ("frontend", "framework"),
+    ("frontend", "build_tool"),
+    ("frontend", "ui_library"),
+)
+COVERAGE_METRICS = ("statements", "branches", "functions", "lines")
+
+SECTION_RE = re.compile(r'^\*\*(\w+):\*\*\s*$')
+ITEM_RE = re.compile(r'^[-*]\s+([^:]+?):\s+(.+?)\s*$')
+COVERAGE_RE = re.compile(r'(\d+)%\+?\s+(statements|branches|functions|lines)\b', re.IGNORECASE)
+COVERAGE_ITEM_RE = re.compile(r'^[-*]\s+(Statements|Branches|Functions|Lines):\s*(\d+)%', re.IGNORECASE)
+FIELD_RE = re.compile(r'^\*\*(Version|Ratified|Last Amended)\*\*:\s*(.+?)\s*$')
+VERSION_TOKEN_RE = re.compile(r'\s+v?\d[\w.]*\+?')
+REFERENCE_RE = re.compile(r'{[{%][^}%]*?\bconstitution\.([A-Za-z_][\w.]*)')
+
+# Loaded configs of this process: constitution path -> (size, mtime_ns, config)
+_LOADED: Dict[Path, Tuple[int, int, Dict[str, Any]]] = {}
+
+class ConstitutionError(ValueError):
+    """Raised when the constitution is missing or lacks a value the templates use"""
+
+def _key(label: str) -> str:
+    return re.sub(r'[^a-z0-9]+', '_', label.lower()).strip('_')
+
+def tool_names(value: str) -> List[str]:
+    """'PostgreSQL 14+ with TypeORM 0.3.19+' -> ['PostgreSQL', 'TypeORM']"""
+    names = []
+    for part in re.split(r'\s+with\s+|\s+\+\s+|[(),]', value):
+        name = VERSION_TOKEN_RE.sub('', f" {part}").strip()
+        if name and name not in names:
+            names.append(name)
+    return names
+
+def parse_constitution(text: str) -> Dict[str, Any]:
+    """The structured values of a constitution.md; missing ones are left out"""
+    config: Dict[str, Any] = {section: {} for section in STACK_SECTIONS}
+    config["coverage"] = {}
+    section = None
+    in_fence = False
+    for line in text.splitlines():
+        if line.lstrip().startswith("```"):
+            in_fence = not in_fence
+            continue
+        if in_fence:
+            continue
+        stripped = line.strip()
+        match = SECTION_RE.match(stripped)
+        if match:
+            name = match.group(1).lower()
+            # Only the first list per section: later ones (Approved Dependencies) name packages
+            section = name if name in STACK_SECTIONS and not config[name] else None
+            continue
+        if section:
+            match = ITEM_RE.match(stripped)
+            if match:
+                config[section][_key(match.group(1))] = match.group(2)
+                continue
+            if stripped:
+                section = None
+        coverage = config["coverage"]
+        for percent, metric in COVERAGE_RE.findall(stripped):
+            coverage.setdefault(metric.lower(), int(percent))
+        match = COVERAGE_ITEM_RE.match(stripped)
+        if match:
+            coverage.setdefault(match.group(1).lower(), int(match.group(2)))
+        match = FIELD_RE.match(stripped)
+        if match:
+            config.setdefault(_key(match.group(1)).replace("last_", ""), match.group(2))
+
+    names: List[str] = []
+    for section_name, key in STACK_SUMMARY:
+        for name in tool_names(config[section_name].get(key, "")):
+            if name not in names:
+                names.append(name)
+    config["stack"] = ", ".join(names)
+    config["coverage"] = {metric: config["coverage"][metric]
+                          for metric in COVERAGE_METRICS if metric in config["coverage"]}
+    return config
+
+def _read_cache(cache_path: Path) -> Dict[str, Any]:
+    try:
+        with open(cache_path, "r") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return data if data.get("version") == CACHE_VERSION else {}
+
+def _write_cache(cache_path: Path, data: Dict[str, Any]):
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    atomic_write(cache_path, json.dumps(dict(data, version=CACHE_VERSION), indent=2, sort_keys=True) + "\n")
+
+def load_constitution(path: Path, cache_path: Path) -> Dict[str, Any]:
+    """The parsed constitution, from this process's copy, the JSON cache or a fresh parse"""
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        raise ConstitutionError(f"{path} not found") from None
+    loaded = _LOADED.get(path)
+    if loaded and loaded[:2] == (st.st_size, st.st_mtime_ns):
+        return loaded[2]
+
+    data = _read_cache(cache_path)
+    if data.get("size") == st.st_size and data.get("mtime_ns") == st.st_mtime_ns:
+        config = data["config"]
+    else:
+        raw = path.read_bytes()
+        sha = sha256_bytes(raw)
+        config = data["config"] if data.get("sha256") == sha else parse_constitution(raw.decode("utf-8", "replace"))
+        data.update(size=st.st_size, mtime_ns=st.st_mtime_ns, sha256=sha, config=config)
+        _write_cache(cache_path, data)
+    _LOADED[path] = (st.st_size, st.st_mtime_ns, config)
+    return config
+
+def template_references(template_paths: Iterable[Path]) -> List[str]:
+    """The constitution.* paths the templates use, e.g. backend.testing"""
+    found = set()
+    for path in template_paths:
+        try:
+            found.update(REFERENCE_RE.findall(path.read_text(encoding="utf-8")))
+        except FileNotFoundError:
+            continue
+    return sorted(found)
+
+def used_values(config: Dict[str, Any], references: Iterable[str]) -> Dict[str, Any]:
+    """The value of every referenced path; raises ConstitutionError for one the constitution lacks"""
+    values = {}
+    for reference in references:
+        value: Any = config
+        for part in reference.split("."):
+            if not isinstance(value, dict) or part not in value:
+                raise ConstitutionError(f"the templates use constitution.{reference}, which the constitution "
+                                        f"does not define")
+            value = value[part]
+        values[reference] = value
+    return values
+
+def last_rendered(cache_path: Path) -> Optional[Dict[str, Any]]:
+    """The values the last full run rendered with (None before the first)"""
+    return _read_cache(cache_path).get("rendered")
+
+def record_rendered(cache_path: Path, values: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Remember the values a full run rendered with; returns those of the previous run (None for the first)"""
+    data = _read_cache(cache_path)
+    previous = data.get("rendered")
+    if previous != values:
+        data["rendered"] = values
+        _write_cache(cache_path, data)
+    return previous
+
+def changed_values(previous: Dict[str, Any], values: Dict[str, Any]) -> List[Tuple[str, Any, Any]]:
+    """(path, old, new) for every value that differs between two runs"""
+    return [(key, previous.get(key), values.get(key)) for key in sorted(previous.keys() | values.keys())
+            if previous.get(key) != values.get(key)]
+
+def stale_mentions(spec_dirs: Iterable[Path], changes: List[Tuple[str, Any, Any]],
+                   docs: Tuple[str, ...] = ("plan.md", "tasks.md")) -> List[Tuple[Path, str, str]]:
+    """(doc, old value, path) for every doc that still mentions a value the constitution no longer has"""
+    # Numbers alone ("80") match too much to flag anything
+    olds = [(str(old), key) for key, old, new in changes
+            if isinstance(old, str) and len(old) >= 4 and str(old) not in str(new)]
+    found = []
+    if not olds:
+        return found
+    for spec_dir in spec_dirs:
+        for name in docs:
+            try:
+                text = (spec_dir / name).read_text(encoding="utf-8", errors="replace")
+            except (FileNotFoundError, NotADirectoryError):
+                continue
+            found.extend((spec_dir / name, old, key) for old, key in olds if old in text)
+    return found
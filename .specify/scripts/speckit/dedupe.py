@@ -0,0 +1,248 @@
+"""
+Near-duplicate feature detection (generate_all_docs.py dedupe)
+
+Specs in this repository are written from a handful of templates, so most
+of their prose is shared: shingling whole spec.md files makes every pair
+generated from the same template look identical and hides the features
+that really overlap (032-first-party-data-enrichment vs
+087-first-party-data-enrichment-hub). Each feature is therefore reduced to
+the words that identify it: its directory slug and title (words and word
+pairs), its user story titles, Key Entity names (split at CamelCase) and
+functional requirements (words). Each shingle is stored as a 64-bit hash.
+The spec index keeps these sets next to the other parsed fields, so they
+are only recomputed for specs whose content changed.
+
+At query time, shingles that occur in more than STOP_FRACTION of the
+features are dropped as boilerplate ("system", "configuration", ...). Then:
+
+    minhash      NUM_PERM universal hashes (a*x + b mod 2**61-1); the
+                 probability that two signatures agree in a slot is the
+                 Jaccard similarity of the two shingle sets
+    LSH          signatures cut into bands of rows, with the (bands, rows)
+                 split chosen for the near threshold; features sharing a band
+                 become candidate pairs
+    verify       candidates are kept if their exact Jaccard similarity
+                 reaches the near threshold
+    cluster      pairs reaching the threshold are merged with union-find;
+                 the weaker ones are returned apart, most similar first,
+                 as possible duplicates
+
+Each distinct shingle is permuted once (NUM_PERM multiplications), after
+which a signature costs one element-wise min over its shingles, so the
+work is linear in the corpus plus the candidate pairs; features are never
+compared all against all.
+"""
+
+import re
+from array import array
+from hashlib import blake2b
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+from speckit.parser import FeatureInfo
+
+NUM_PERM = 128
+
+# Shingles in more than this fraction of features (and at least
+# MIN_STOP_COUNT of them) are boilerplate
+STOP_FRACTION = 0.05
+MIN_STOP_COUNT = 5
+
+# Features sharing little but a word pair of their titles ("smart
+# campaign" in 114-smart-campaign-cloner and 127-smart-campaign-pauser)
+# score about 0.3, as do real duplicates described in different words
+# (055-voice-search-optimization vs 076-voice-search-ad-optimizer): pairs
+# from NEAR_THRESHOLD up to DEFAULT_THRESHOLD are only possible duplicates
+DEFAULT_THRESHOLD = 0.5
+NEAR_THRESHOLD = 0.2
+
+_PRIME = (1 << 61) - 1
+_SEED = 0x5EC1D
+
+# CamelCase-aware words: "VoiceSearchQuery" -> voice, search, query
+WORD_RE = re.compile(r'[A-Z]?[a-z]+|[A-Z]+(?![a-z])|\d+')
+
+class Cluster(NamedTuple):
+    """A group of features connected by verified candidate pairs"""
+    features: Tuple[str, ...]
+    # (feature, feature, Jaccard similarity), most similar first
+    pairs: Tuple[Tuple[str, str, float], ...]
+
+class Duplicates(NamedTuple):
+    """What find_duplicates() found"""
+    # Largest pair similarity first
+    clusters: List[Cluster]
+    # (feature, feature, Jaccard similarity) below the threshold, most similar first
+    near: List[Tuple[str, str, float]]
+    # features, candidates (pairs sharing an LSH band) and pairs (verified candidates)
+    counts: Dict[str, int]
+
+def _words(text: str) -> List[str]:
+    return [word.lower() for word in WORD_RE.findall(text)]
+
+def _hash(shingle: str) -> int:
+    return int.from_bytes(blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "little")
+
+def shingles(info: FeatureInfo) -> List[int]:
+    """Return the sorted shingle hashes identifying a feature"""
+    slug = info.feature.split("-", 1)[-1].replace("-", " ")
+    found: Set[str] = set()
+    for text in (slug, info.name):
+        words = _words(text)
+        found.update(words)
+        found.update(f"{a} {b}" for a, b in zip(words, words[1:]))
+    for text in (*(story.title for story in info.user_stories), *info.entities, *info.requirements):
+        found.update(_words(text))
+    return sorted(_hash(shingle) for shingle in found)
+
+def pack(hashes: Sequence[int]) -> bytes:
+    """Serialize shingle hashes for the spec index"""
+    return array("Q", hashes).tobytes()
+
+def unpack(blob: bytes) -> List[int]:
+    hashes = array("Q")
+    hashes.frombytes(blob)
+    return hashes.tolist()
+
+def _permutations(num_perm: int) -> List[Tuple[int, int]]:
+    """The (a, b) coefficients of num_perm universal hash functions, fixed by _SEED"""
+    coefficients = []
+    state = _SEED
+    for _ in range(num_perm):
+        pair = []
+        for _ in range(2):
+            # splitmix64: deterministic across runs and Python versions
+            state = (state + 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF
+            z = state
+            z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & 0xFFFFFFFFFFFFFFFF
+            z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & 0xFFFFFFFFFFFFFFFF
+            pair.append((z ^ (z >> 31)) % _PRIME)
+        coefficients.append((pair[0] or 1, pair[1]))
+    return coefficients
+
+def minhash(
+    hashes: Iterable[int],
+    permutations: List[Tuple[int, int]],
+    memo: Optional[Dict[int, Sequence[int]]] = None,
+) -> Tuple[int, ...]:
+    """MinHash signature of a non-empty shingle set.
+
+    memo caches each shingle's permuted values: features share most of
+    their vocabulary, so across a corpus each distinct shingle is permuted
+    once and a signature is an element-wise min over cached tuples.
+    """
+    memo = {} if memo is None else memo
+    columns = []
+    for h in hashes:
+        values = memo.get(h)
+        if values is None:
+            x = h % _PRIME
+            # An array takes a fifth of the memory of a tuple of ints
+            values = memo[h] = array("Q", [(a * x + b) % _PRIME for a, b in permutations])
+        columns.append(values)
+    return tuple(map(min, *columns)) if len(columns) > 1 else tuple(columns[0])
+
+def lsh_params(threshold: float, num_perm: int = NUM_PERM) -> Tuple[int, int]:
+    """Return the (bands, rows) split of num_perm that best separates pairs at threshold.
+
+    A pair with similarity s becomes a candidate with probability
+    1 - (1 - s**rows)**bands; the split minimizing the false positive mass
+    below the threshold plus the false negative mass above it is chosen.
+    """
+    def area(bands: int, rows: int, low: float, high: float, above: bool) -> float:
+        steps = 100
+        width = (high - low) / steps
+        total = 0.0
+        for i in range(steps):
+            s = low + (i + 0.5) * width
+            p = 1 - (1 - s ** rows) ** bands
+            total += (1 - p if above else p) * width
+        return total
+
+    best = (num_perm, 1)
+    best_error = float("inf")
+    for rows in range(1, num_perm + 1):
+        if num_perm % rows:
+            continue
+        bands = num_perm // rows
+        error = area(bands, rows, 0.0, threshold, False) + area(bands, rows, threshold, 1.0, True)
+        if error < best_error:
+            best, best_error = (bands, rows), error
+    return best
+
+def stop_shingles(shingle_sets: Dict[str, Sequence[int]]) -> Set[int]:
+    """Shingles common enough across features to be boilerplate"""
+    counts: Dict[int, int] = {}
+    for hashes in shingle_sets.values():
+        for h in hashes:
+            counts[h] = counts.get(h, 0) + 1
+    limit = max(MIN_STOP_COUNT, STOP_FRACTION * len(shingle_sets))
+    return {h for h, count in counts.items() if count > limit}
+
+def find_duplicates(
+    shingle_sets: Dict[str, Sequence[int]],
+    threshold: float = DEFAULT_THRESHOLD,
+    num_perm: int = NUM_PERM,
+    near: Optional[float] = None,
+) -> Duplicates:
+    """Cluster features whose shingle sets have Jaccard similarity >= threshold.
+
+    Pairs from near (when lower than threshold) up to threshold are
+    returned apart instead of being clustered.
+    """
+    near = threshold if near is None else min(near, threshold)
+    stop = stop_shingles(shingle_sets)
+    sets = {}
+    for name, hashes in shingle_sets.items():
+        kept = frozenset(h for h in hashes if h not in stop)
+        if kept:
+            sets[name] = kept
+
+    bands, rows = lsh_params(near, num_perm)
+    permutations = _permutations(num_perm)
+    memo: Dict[int, Sequence[int]] = {}
+    buckets: Dict[Tuple[int, Tuple[int, ...]], List[str]] = {}
+    for name in sorted(sets):
+        signature = minhash(sets[name], permutations, memo)
+        for band in range(bands):
+            key = (band, signature[band * rows:(band + 1) * rows])
+            buckets.setdefault(key, []).append(name)
+
+    candidates: Set[Tuple[str, str]] = set()
+    for members in buckets.values():
+        for i, a in enumerate(members):
+            for b in members[i + 1:]:
+                candidates.add((a, b))
+
+    parent = {}
+
+    def find(name: str) -> str:
+        while parent.get(name, name) != name:
+            parent[name] = parent.get(parent[name], parent[name])
+            name = parent[name]
+        return name
+
+    pairs = []
+    near_pairs = []
+    for a, b in candidates:
+        similarity = len(sets[a] & sets[b]) / len(sets[a] | sets[b])
+        if similarity >= threshold:
+            pairs.append((a, b, similarity))
+            root_a, root_b = find(a), find(b)
+            if root_a != root_b:
+                parent[max(root_a, root_b)] = min(root_a, root_b)
+        elif similarity >= near:
+            near_pairs.append((a, b, similarity))
+    near_pairs.sort(key=lambda pair: (-pair[2], pair[0], pair[1]))
+
+    groups: Dict[str, List[Tuple[str, str, float]]] = {}
+    for pair in pairs:
+        groups.setdefault(find(pair[0]), []).append(pair)
+    clusters = []
+    for group in groups.values():
+        group.sort(key=lambda pair: (-pair[2], pair[0], pair[1]))
+        members = sorted({name for pair in group for name in pair[:2]})
+        clusters.append(Cluster(tuple(members), tuple(group)))
+    clusters.sort(key=lambda cluster: (-cluster.pairs[0][2], cluster.features))
+
+    counts = {"features": len(sets), "candidates": len(candidates), "pairs": len(pairs)}
+    return Duplicates(clusters, near_pairs, counts)
@@ -0,0 +1,268 @@
+"""
+Test impact analysis for the pre-commit hook (generate_all_docs.py impact)
+
+The hook used to run the whole backend Jest suite and the whole frontend
+Vitest suite whenever anything under backend/src/ or frontend/src/ was
+staged. `impact` finds the test files that can observe a change instead:
+
+    graph     every source file under each project's src/ is read for its
+              import specifiers (import/export ... from, side-effect
+              imports, require(), import(), jest.mock(), vi.mock()). They
+              are cached in .specify/cache/impact.json per file, keyed on
+              size and mtime, so a warm run only re-reads changed files.
+              Specifiers are resolved against the current file list on
+              every run: relative paths, the backend's src/ and the
+              frontend's @/ aliases, extensions and index files. Package
+              imports are ignored.
+    impact    from the changed files, the graph is followed backwards to
+              every file importing them, directly or not, and the test
+              files among those are the ones to run.
+
+A project falls back to its full suite when the graph cannot answer: a
+change outside src/ (package.json, jest.config.js, tsconfig.json...), to
+a test setup file, or to a file under src/ that is neither source nor
+imported by any (e.g. a fixture read at run time). Matching is a regex,
+not a parser, so an import in a comment counts too: that only ever adds
+tests.
+
+Changed files are also mapped to the feature modules of the layout that
+generated plan.md/tasks.md describe (backend/src/<slug>/,
+frontend/src/components/<slug>/, frontend/src/lib/api/<slug>.ts,
+frontend/src/store/<slug>.ts) and to the specs/ feature directory of that
+slug, with or without its number.
+"""
+
+import json
+import os
+import posixpath
+import re
+from pathlib import Path
+from typing import Dict, Iterator, List, NamedTuple, Optional, Pattern, Set, Tuple
+
+from speckit.output import atomic_write
+
+CACHE_VERSION = 1
+
+SOURCE_EXTENSIONS = (".ts", ".tsx", ".js", ".jsx", ".mjs", ".cjs")
+
+IMPORT_RE = re.compile(
+    r"""(?:\bfrom\s*|\bimport\s*|\b(?:require|import|jest\.mock|vi\.mock|jest\.requireActual|vi\.importActual)"""
+    r"""\s*\(\s*)(['"])([^'"\n]+)\1"""
+)
+
+class Project(NamedTuple):
+    """A test runner's view of one package of the repository"""
+    name: str                              # directory under the repository root
+    runner: str
+    aliases: Tuple[Tuple[str, str], ...]   # specifier prefix -> path under the project
+    tests: Pattern
+    setup: Tuple[str, ...]                 # files every test loads, under the project
+
+# Mirrors backend/jest.config.js (testRegex, moduleNameMapper) and
+# frontend/vite.config.ts (resolve.alias, test.setupFiles, Vitest's default include)
+PROJECTS = (
+    Project("backend", "Jest", (("src/", "src/"),), re.compile(r"\.spec\.ts$"), ()),
+    Project("frontend", "Vitest", (("@/", "src/"),), re.compile(r"\.(?:test|spec)\.[cm]?[jt]sx?$"),
+            ("src/test/setup.ts",)),
+)
+
+# Feature modules in the layout of the generated plan.md/tasks.md
+MODULE_RES = (
+    re.compile(r"(backend/src)/([^/]+)/"),
+    re.compile(r"(frontend/src/components)/([^/]+)/"),
+    re.compile(r"(frontend/src/(?:lib/api|store))/([^/.]+)"),
+)
+
+class ProjectImpact(NamedTuple):
+    """What one project has to run for a change"""
+    project: Project
+    changed: List[str]
+    tests: List[str]        # relative to the project directory
+    full: Optional[str]     # why the full suite has to run, if it does
+
+class Impact(NamedTuple):
+    """What a change means for every project"""
+    projects: List[ProjectImpact]
+    modules: Dict[str, Optional[str]]   # feature module -> specs/ feature directory
+
+def is_source(path: str) -> bool:
+    """Whether path is a module the graph reads imports from"""
+    return path.endswith(SOURCE_EXTENSIONS) and not path.endswith(".d.ts")
+
+def read_imports(path: Path) -> List[str]:
+    """The module specifiers a source file imports, in order of appearance"""
+    text = path.read_text(encoding="utf-8", errors="replace")
+    return list(dict.fromkeys(match.group(2) for match in IMPORT_RE.finditer(text)))
+
+def _walk(root: Path, directory: str) -> Iterator[Tuple[str, os.stat_result]]:
+    try:
+        with os.scandir(root / directory) as entries:
+            for entry in entries:
+                path = f"{directory}/{entry.name}"
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name != "node_modules" and not entry.name.startswith("."):
+                        yield from _walk(root, path)
+                elif entry.is_file():
+                    yield path, entry.stat()
+    except FileNotFoundError:
+        return
+
+class ImportGraph:
+    """Import specifiers of every file under the projects' src/, cached as JSON under .specify/cache/"""
+
+    def __init__(self, path: Path, files: Optional[Dict[str, Dict]] = None):
+        self.path = path
+        self.files = files or {}
+        self.dirty = False
+
+    @classmethod
+    def load(cls, path: Path) -> "ImportGraph":
+        """Load the cached graph, starting empty if it is missing, unreadable or from another format"""
+        try:
+            with open(path, "r") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return cls(path)
+        if data.get("version") != CACHE_VERSION:
+            return cls(path)
+        return cls(path, data.get("files", {}))
+
+    def refresh(self, root: Path, projects: Tuple[Project, ...] = PROJECTS) -> Dict[str, int]:
+        """Bring the graph up to date with the files on disk; returns file, read and removed counts"""
+        counts = {"files": 0, "read": 0, "removed": 0}
+        seen = set()
+        for project in projects:
+            for path, st in _walk(root, f"{project.name}/src"):
+                seen.add(path)
+                counts["files"] += 1
+                entry = self.files.get(path)
+                if entry and entry["size"] == st.st_size and entry["mtime_ns"] == st.st_mtime_ns:
+                    continue
+                imports = read_imports(root / path) if is_source(path) else []
+                self.files[path] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "imports": imports}
+                counts["read"] += 1
+                self.dirty = True
+        for path in [path for path in self.files if path not in seen]:
+            del self.files[path]
+            counts["removed"] += 1
+            self.dirty = True
+        return counts
+
+    def save(self):
+        """Atomically write the graph if anything changed"""
+        if not self.dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = {"version": CACHE_VERSION, "files": {path: self.files[path] for path in sorted(self.files)}}
+        atomic_write(self.path, json.dumps(data, separators=(",", ":")) + "\n")
+        self.dirty = False
+
+    def importers(self, projects: Tuple[Project, ...] = PROJECTS) -> Dict[str, Set[str]]:
+        """Map every imported path to the files importing it.
+
+        An import that does not resolve maps every path it could have
+        resolved to, so the importers of a deleted file are still found.
+        """
+        owners = {f"{project.name}/": project for project in projects}
+        reverse: Dict[str, Set[str]] = {}
+        for path, entry in self.files.items():
+            project = owners.get(path[:path.index("/") + 1])
+            if project is None:
+                continue
+            for specifier in entry["imports"]:
+                base = _base(path, specifier, project)
+                if base is None:
+                    continue
+                candidates = list(_candidates(base))
+                resolved = next((c for c in candidates if c in self.files), None)
+                for target in [resolved] if resolved else candidates:
+                    reverse.setdefault(target, set()).add(path)
+        return reverse
+
+def _base(importer: str, specifier: str, project: Project) -> Optional[str]:
+    """The repository path a specifier points at, before extensions; None for packages"""
+    if specifier.startswith(("./", "../")) or specifier in (".", ".."):
+        return posixpath.normpath(posixpath.join(posixpath.dirname(importer), specifier))
+    for prefix, target in project.aliases:
+        if specifier.startswith(prefix):
+            return f"{project.name}/{target}{specifier[len(prefix):]}"
+    return None
+
+def _candidates(base: str) -> Iterator[str]:
+    """Paths a module specifier may resolve to, in the order TypeScript tries them"""
+    yield base
+    stem = base[:-3] if base.endswith(".js") else base
+    for extension in SOURCE_EXTENSIONS:
+        yield stem + extension
+    for extension in SOURCE_EXTENSIONS:
+        yield f"{base}/index{extension}"
+
+def _dependents(reverse: Dict[str, Set[str]], seeds: Set[str]) -> Set[str]:
+    """seeds plus every file importing one of them, directly or not"""
+    found = set(seeds)
+    stack = list(seeds)
+    while stack:
+        for importer in reverse.get(stack.pop(), ()):
+            if importer not in found:
+                found.add(importer)
+                stack.append(importer)
+    return found
+
+def feature_modules(paths: List[str], specs_dir: Path) -> Dict[str, Optional[str]]:
+    """Map the feature modules containing paths to their specs/ feature directories"""
+    try:
+        features = sorted(entry.name for entry in os.scandir(specs_dir) if entry.is_dir())
+    except FileNotFoundError:
+        features = []
+    by_slug: Dict[str, str] = {}
+    for name in features:
+        by_slug.setdefault(name, name)
+        number, _, slug = name.partition("-")
+        if number.isdigit() and slug:
+            by_slug.setdefault(slug, name)
+
+    modules: Dict[str, Optional[str]] = {}
+    for path in paths:
+        for pattern in MODULE_RES:
+            match = pattern.match(path)
+            if match:
+                # ActionItemCard, actionItemCard and action_item_card all match action-item-card
+                slug = re.sub(r"(?<=[a-z0-9])(?=[A-Z])", "-", match.group(2)).replace("_", "-").lower()
+                slug = slug[:-len(".store")] if slug.endswith(".store") else slug
+                modules[f"{match.group(1)}/{match.group(2)}"] = by_slug.get(slug)
+                break
+    return {module: modules[module] for module in sorted(modules)}
+
+def find_impact(
+    graph: ImportGraph,
+    changed: List[str],
+    specs_dir: Path,
+    projects: Tuple[Project, ...] = PROJECTS,
+) -> Impact:
+    """The tests each project has to run for changes to the given repository paths"""
+    reverse = graph.importers(projects)
+    results = []
+    for project in projects:
+        prefix = f"{project.name}/"
+        mine = sorted(path for path in set(changed) if path.startswith(prefix))
+        seeds: Set[str] = set()
+        full = None
+        for path in mine:
+            relative = path[len(prefix):]
+            if not relative.startswith("src/"):
+                full = f"{path} is outside src/"
+            elif relative in project.setup:
+                full = f"{path} is loaded by every test"
+            elif path in reverse or (path in graph.files and is_source(path)):
+                seeds.add(path)
+            elif path in graph.files:
+                full = f"{path} is not in the import graph"
+            # Otherwise a deleted file that nothing imports: no test can see it
+            if full:
+                break
+        tests = [] if full else sorted(
+            path[len(prefix):] for path in _dependents(reverse, seeds)
+            if path in graph.files and project.tests.search(path)
+        )
+        results.append(ProjectImpact(project, mine, tests, full))
+    return Impact(results, feature_modules(sorted(set(changed)), specs_dir))
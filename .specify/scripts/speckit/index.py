@@ -0,0 +1,271 @@
+"""
+Persistent SQLite index of parsed specs
+
+Stores the structures extract_feature_info() pulls out of every spec.md
+(name, number, status, user stories, entities, functional requirements),
+plus the shingle hashes the dedupe command compares (see dedupe.py), in
+.specify/cache/specs.sqlite. refresh() costs at most one stat() per spec
+(none when the caller passes fresh manifest records) and only reparses
+specs whose size/mtime changed and whose content hash differs, so keeping
+the index current is cheap enough to do on every generator run and before
+every query.
+"""
+
+import sqlite3
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from speckit.dedupe import pack, shingles, unpack
+from speckit.manifest import sha256_file
+from speckit.parser import FeatureInfo, parse_spec
+
+SCHEMA_VERSION = 2
+
+# Names per "IN (...)" lookup, below SQLite's host parameter limit
+LOOKUP_BATCH = 500
+
+SCHEMA = """
+CREATE TABLE features (
+    name TEXT PRIMARY KEY,
+    number TEXT NOT NULL,
+    title TEXT NOT NULL,
+    status TEXT NOT NULL,
+    spec_size INTEGER NOT NULL,
+    spec_mtime_ns INTEGER NOT NULL,
+    spec_sha256 TEXT NOT NULL
+);
+CREATE TABLE user_stories (
+    feature TEXT NOT NULL REFERENCES features(name) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    title TEXT NOT NULL,
+    priority TEXT NOT NULL,
+    PRIMARY KEY (feature, position)
+);
+CREATE TABLE entities (
+    feature TEXT NOT NULL REFERENCES features(name) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    PRIMARY KEY (feature, position)
+);
+CREATE TABLE requirements (
+    feature TEXT NOT NULL REFERENCES features(name) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    text TEXT NOT NULL,
+    PRIMARY KEY (feature, position)
+);
+CREATE TABLE shingles (
+    feature TEXT PRIMARY KEY REFERENCES features(name) ON DELETE CASCADE,
+    hashes BLOB NOT NULL
+);
+CREATE INDEX features_status ON features(status COLLATE NOCASE);
+CREATE INDEX user_stories_priority ON user_stories(priority);
+CREATE INDEX entities_name ON entities(name COLLATE NOCASE);
+"""
+
+def like_pattern(value: str) -> str:
+    """Turn a user pattern with * wildcards into a LIKE pattern (escape: backslash)"""
+    escaped = value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return escaped.replace("*", "%")
+
+class SpecIndex:
+    """Incrementally maintained SQLite index of every spec in specs/"""
+
+    def __init__(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.db = sqlite3.connect(str(path))
+        self.db.row_factory = sqlite3.Row
+        self.db.execute("PRAGMA foreign_keys = ON")
+        self.db.execute("PRAGMA journal_mode = WAL")
+        if self.db.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            self._reset()
+
+    def _reset(self):
+        with self.db:
+            for table in ("shingles", "requirements", "entities", "user_stories", "features"):
+                self.db.execute(f"DROP TABLE IF EXISTS {table}")
+            self.db.executescript(SCHEMA)
+            self.db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self) -> "SpecIndex":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def refresh(
+        self,
+        spec_dirs: Iterable[Path],
+        complete: bool = True,
+        records: Optional[Dict[str, Dict[str, Any]]] = None,
+        infos: Optional[Dict[str, FeatureInfo]] = None,
+    ) -> Dict[str, int]:
+        """Bring the index up to date for spec_dirs.
+
+        With complete=True, spec_dirs is the whole tree and rows for features
+        not in it are removed; otherwise only the given features are touched.
+        records maps feature names to fresh manifest spec records
+        ({"sha256", "size", "mtime_ns"}), which are trusted instead of
+        stat()ing and hashing spec.md again. infos maps feature names to the
+        FeatureInfo parsed from that same spec.md in the generator's pass,
+        which is stored instead of parsing the file again.
+        """
+        records = records or {}
+        infos = infos or {}
+        if complete:
+            rows = self.db.execute("SELECT name, spec_size, spec_mtime_ns, spec_sha256 FROM features")
+        else:
+            # Only the given features: a batch of a --stream run must not load the whole table
+            spec_dirs = list(spec_dirs)
+            names = [spec_dir.name for spec_dir in spec_dirs]
+            rows = [
+                row
+                for i in range(0, len(names), LOOKUP_BATCH)
+                for row in self.db.execute(
+                    "SELECT name, spec_size, spec_mtime_ns, spec_sha256 FROM features WHERE name IN "
+                    f"({', '.join('?' * len(names[i:i + LOOKUP_BATCH]))})", names[i:i + LOOKUP_BATCH])
+            ]
+        known = {row["name"]: (row["spec_size"], row["spec_mtime_ns"], row["spec_sha256"]) for row in rows}
+        counts = {"parsed": 0, "unchanged": 0, "removed": 0}
+        seen = set()
+
+        with self.db:
+            for spec_dir in spec_dirs:
+                name = spec_dir.name
+                spec_file = spec_dir / "spec.md"
+                record = records.get(name)
+                if record:
+                    size, mtime_ns, sha = record["size"], record["mtime_ns"], record["sha256"]
+                else:
+                    try:
+                        st = spec_file.stat()
+                    except (FileNotFoundError, NotADirectoryError):
+                        if name in known:
+                            self.db.execute("DELETE FROM features WHERE name = ?", (name,))
+                            counts["removed"] += 1
+                        continue
+                    size, mtime_ns, sha = st.st_size, st.st_mtime_ns, None
+                seen.add(name)
+
+                recorded = known.get(name)
+                if recorded and recorded[:2] == (size, mtime_ns):
+                    counts["unchanged"] += 1
+                    continue
+                sha = sha or sha256_file(spec_file)
+                if recorded and recorded[2] == sha:
+                    self.db.execute(
+                        "UPDATE features SET spec_size = ?, spec_mtime_ns = ? WHERE name = ?",
+                        (size, mtime_ns, name),
+                    )
+                    counts["unchanged"] += 1
+                    continue
+
+                info = infos.get(name) or FeatureInfo.from_dict(name, parse_spec(spec_file))
+                self._store(info, size, mtime_ns, sha)
+                counts["parsed"] += 1
+
+            if complete:
+                for name in known.keys() - seen:
+                    self.db.execute("DELETE FROM features WHERE name = ?", (name,))
+                    counts["removed"] += 1
+        return counts
+
+    def remove_missing(self, specs_dir: Path) -> int:
+        """Remove features whose spec.md is gone, one stat() per indexed feature; returns how many"""
+        missing = [name for (name,) in self.db.execute("SELECT name FROM features")
+                   if not (specs_dir / name / "spec.md").is_file()]
+        with self.db:
+            self.db.executemany("DELETE FROM features WHERE name = ?", [(name,) for name in missing])
+        return len(missing)
+
+    def _store(self, info: FeatureInfo, size: int, mtime_ns: int, sha: str):
+        name = info.feature
+        self.db.execute("DELETE FROM features WHERE name = ?", (name,))
+        self.db.execute(
+            "INSERT INTO features (name, number, title, status, spec_size, spec_mtime_ns, spec_sha256) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (name, info.number, info.name, info.status, size, mtime_ns, sha),
+        )
+        self.db.executemany(
+            "INSERT INTO user_stories (feature, position, title, priority) VALUES (?, ?, ?, ?)",
+            [(name, i, story.title, story.priority) for i, story in enumerate(info.user_stories, 1)],
+        )
+        self.db.executemany(
+            "INSERT INTO entities (feature, position, name) VALUES (?, ?, ?)",
+            [(name, i, entity) for i, entity in enumerate(info.entities, 1)],
+        )
+        self.db.executemany(
+            "INSERT INTO requirements (feature, position, text) VALUES (?, ?, ?)",
+            [(name, i, text) for i, text in enumerate(info.requirements, 1)],
+        )
+        self.db.execute("INSERT INTO shingles (feature, hashes) VALUES (?, ?)", (name, pack(shingles(info))))
+
+    def shingle_sets(self) -> Dict[str, List[int]]:
+        """Return every feature's dedupe shingle hashes"""
+        rows = self.db.execute("SELECT feature, hashes FROM shingles")
+        return {row["feature"]: unpack(row["hashes"]) for row in rows}
+
+    def find_features(
+        self,
+        status: Optional[str] = None,
+        entity: Optional[str] = None,
+        requirement: Optional[str] = None,
+        priority: Optional[str] = None,
+    ) -> List[sqlite3.Row]:
+        """Return features matching every given filter (patterns may use * wildcards)"""
+        clauses = []
+        params: List[Any] = []
+        if status:
+            clauses.append("f.status LIKE ? ESCAPE '\\'")
+            params.append(like_pattern(status))
+        if entity:
+            clauses.append("EXISTS (SELECT 1 FROM entities e WHERE e.feature = f.name AND e.name LIKE ? ESCAPE '\\')")
+            params.append(like_pattern(entity))
+        if requirement:
+            clauses.append("EXISTS (SELECT 1 FROM requirements r WHERE r.feature = f.name "
+                           "AND r.text LIKE ? ESCAPE '\\')")
+            params.append(f"%{like_pattern(requirement)}%")
+        if priority:
+            clauses.append("EXISTS (SELECT 1 FROM user_stories s WHERE s.feature = f.name AND s.priority = ?)")
+            params.append(priority.upper())
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        return self.db.execute(
+            f"SELECT f.name, f.number, f.title, f.status FROM features f {where} ORDER BY f.name", params
+        ).fetchall()
+
+    def find_stories(self, priority: Optional[str] = None, features: Optional[List[str]] = None) -> List[sqlite3.Row]:
+        """Return user stories, optionally limited to a priority and/or a set of features"""
+        clauses = []
+        params: List[Any] = []
+        if priority:
+            clauses.append("s.priority = ?")
+            params.append(priority.upper())
+        if features is None:
+            batches: List[List[str]] = [[]]
+        else:
+            clauses.append("s.feature IN ({})")
+            names = sorted(set(features))
+            batches = [names[i:i + LOOKUP_BATCH] for i in range(0, len(names), LOOKUP_BATCH)]
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        # Batches of sorted names, each ordered by feature, so their rows come out in order
+        return [
+            row
+            for batch in batches
+            for row in self.db.execute(
+                "SELECT s.feature, s.position, s.title, s.priority FROM user_stories s "
+                f"{where.format(', '.join('?' * len(batch)))} ORDER BY s.feature, s.position", params + batch
+            )
+        ]
+
+    def execute(self, sql: str, params: Iterable[Any] = ()) -> List[sqlite3.Row]:
+        """Run a read-only SQL query against the index"""
+        # as_uri() percent-encodes the path, so ?, # and % in it stay part of the file name
+        conn = sqlite3.connect(f"{self.path.resolve().as_uri()}?mode=ro", uri=True)
+        conn.row_factory = sqlite3.Row
+        try:
+            return conn.execute(sql, list(params)).fetchall()
+        finally:
+            conn.close()
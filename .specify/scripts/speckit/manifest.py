@@ -0,0 +1,223 @@
+"""
+Content-hash manifest for incremental plan.md/tasks.md regeneration
+
+The manifest records, per feature, the spec.md fingerprint it was generated
+from and the hashes of the docs the generator wrote. A rerun compares a
+single os.stat() against the recorded size/mtime and only hashes spec.md
+when those differ, so unchanged features cost one syscall. It also carries
+the cached feature directory listings of speckit.scan.
+
+The JSON manifest is loaded whole. --stream runs use ManifestDB instead:
+the same per-feature entries, one SQLite row each, read and written one
+feature at a time, so their memory does not grow with the number of
+features. Whichever of the two was written last is authoritative; the
+generator copies its entries into the other one before using it.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+from speckit.output import atomic_write
+
+MANIFEST_VERSION = 1
+
+def sha256_bytes(data: bytes) -> str:
+    """Return the hex SHA-256 of a byte string"""
+    return hashlib.sha256(data).hexdigest()
+
+def sha256_file(path: Path) -> str:
+    """Return the hex SHA-256 of a file's contents"""
+    with open(path, 'rb') as f:
+        return sha256_bytes(f.read())
+
+def inputs_fingerprint(
+    generator_version: str,
+    template_paths: Iterable[Path],
+    values: Optional[Dict[str, Any]] = None,
+) -> str:
+    """Hash the generator version, template files and other values (JSON-serializable) that shape every output"""
+    digest = hashlib.sha256(generator_version.encode())
+    for path in template_paths:
+        digest.update(b"\0" + path.name.encode() + b"\0")
+        try:
+            digest.update(path.read_bytes())
+        except FileNotFoundError:
+            digest.update(b"<missing>")
+    if values:
+        digest.update(b"\0" + json.dumps(values, sort_keys=True).encode())
+    return digest.hexdigest()
+
+def spec_record(spec_file: Path, st: Optional[os.stat_result] = None) -> Dict[str, Any]:
+    """Build the manifest record for a spec.md file"""
+    st = st or spec_file.stat()
+    return {
+        "sha256": sha256_file(spec_file),
+        "size": st.st_size,
+        "mtime_ns": st.st_mtime_ns,
+    }
+
+def check_spec(entry: Optional[Dict[str, Any]], spec_file: Path) -> Tuple[bool, Dict[str, Any]]:
+    """Return (changed, record) for spec_file against a manifest entry.
+
+    Only hashes the file when its size or mtime differ from the entry, so a
+    touched-but-identical spec is still reported as unchanged.
+    """
+    st = spec_file.stat()
+    recorded = entry.get("spec") if entry else None
+    if recorded and recorded["size"] == st.st_size and recorded["mtime_ns"] == st.st_mtime_ns:
+        return False, recorded
+
+    record = spec_record(spec_file, st)
+    changed = not recorded or recorded["sha256"] != record["sha256"]
+    return changed, record
+
+def check_staged_spec(entry: Optional[Dict[str, Any]], data: bytes) -> Tuple[bool, Dict[str, Any]]:
+    """check_spec() for the index copy of a spec.md (--staged).
+
+    The record has no mtime, so the next run hashes the working-tree file
+    and regenerates if it differs from what was staged.
+    """
+    record = {"sha256": sha256_bytes(data), "size": len(data), "mtime_ns": 0}
+    recorded = entry.get("spec") if entry else None
+    return not recorded or recorded["sha256"] != record["sha256"], record
+
+class Manifest:
+    """Per-feature generator state persisted as JSON under .specify/cache/"""
+
+    def __init__(
+        self,
+        path: Path,
+        inputs: Dict[str, str],
+        features: Optional[Dict[str, Dict[str, Any]]] = None,
+        listings: Optional[Dict[str, Any]] = None,
+    ):
+        self.path = path
+        self.inputs = inputs
+        self.features = features or {}
+        self.listings = listings or {}
+        self.dirty = False
+
+    @classmethod
+    def load(cls, path: Path, inputs: Dict[str, str]) -> "Manifest":
+        """Load the manifest, starting empty if it is missing, unreadable or from another format"""
+        try:
+            with open(path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return cls(path, inputs)
+
+        if data.get("version") != MANIFEST_VERSION:
+            return cls(path, inputs)
+        return cls(path, inputs, data.get("features", {}), data.get("listings", {}))
+
+    def get(self, feature: str) -> Optional[Dict[str, Any]]:
+        """Return the recorded entry for a feature, if any"""
+        return self.features.get(feature)
+
+    def update(self, feature: str, entry: Optional[Dict[str, Any]]):
+        """Replace a feature's entry (None removes it)"""
+        if entry is None:
+            if self.features.pop(feature, None) is not None:
+                self.dirty = True
+        elif self.features.get(feature) != entry:
+            self.features[feature] = entry
+            self.dirty = True
+
+    def replace(self, features: Dict[str, Dict[str, Any]]):
+        """Take over every entry from another manifest (e.g. a ManifestDB written since)"""
+        self.features = features
+        self.dirty = True
+
+    def set_listings(self, listings: Dict[str, Any]):
+        """Replace the cached directory listings"""
+        if listings != self.listings:
+            self.listings = listings
+            self.dirty = True
+
+    def prune(self, present: Iterable[str]):
+        """Drop entries for feature directories that no longer exist"""
+        keep = set(present)
+        for feature in [name for name in self.features if name not in keep]:
+            del self.features[feature]
+            self.dirty = True
+
+    def save(self):
+        """Atomically write the manifest if anything changed"""
+        if not self.dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = {
+            "version": MANIFEST_VERSION,
+            "inputs": self.inputs,
+            "features": {name: self.features[name] for name in sorted(self.features)},
+            "listings": {name: self.listings[name] for name in sorted(self.listings)},
+        }
+        atomic_write(self.path, json.dumps(data, indent=1) + "\n")
+        self.dirty = False
+
+class ManifestDB:
+    """The manifest's per-feature entries in SQLite, for --stream runs"""
+
+    def __init__(self, path: Path, inputs: Dict[str, str]):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.inputs = inputs
+        self.db = sqlite3.connect(str(path))
+        if self.db.execute("PRAGMA user_version").fetchone()[0] != MANIFEST_VERSION:
+            with self.db:
+                self.db.execute("DROP TABLE IF EXISTS entries")
+                self.db.execute("CREATE TABLE entries (feature TEXT PRIMARY KEY, entry TEXT NOT NULL)")
+                self.db.execute(f"PRAGMA user_version = {MANIFEST_VERSION}")
+
+    def close(self):
+        self.db.commit()
+        self.db.close()
+
+    def __enter__(self) -> "ManifestDB":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def get(self, feature: str) -> Optional[Dict[str, Any]]:
+        """Return the recorded entry for a feature, if any"""
+        row = self.db.execute("SELECT entry FROM entries WHERE feature = ?", (feature,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def update(self, feature: str, entry: Optional[Dict[str, Any]]):
+        """Replace a feature's entry (None removes it); kept until save()"""
+        if entry is None:
+            self.db.execute("DELETE FROM entries WHERE feature = ?", (feature,))
+        else:
+            self.db.execute("INSERT OR REPLACE INTO entries (feature, entry) VALUES (?, ?)",
+                            (feature, json.dumps(entry, separators=(",", ":"))))
+
+    def replace(self, entries: Iterable[Tuple[str, Dict[str, Any]]]) -> int:
+        """Replace every entry (e.g. with a JSON manifest written since); returns how many"""
+        count = 0
+        with self.db:
+            self.db.execute("DELETE FROM entries")
+            for feature, entry in entries:
+                self.update(feature, entry)
+                count += 1
+        return count
+
+    def entries(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Every (feature, entry), in feature order, read as they are consumed"""
+        for feature, entry in self.db.execute("SELECT feature, entry FROM entries ORDER BY feature"):
+            yield feature, json.loads(entry)
+
+    def prune_missing(self, specs_dir: Path) -> int:
+        """Drop entries for feature directories that no longer exist; returns how many"""
+        missing = [feature for (feature,) in self.db.execute("SELECT feature FROM entries")
+                   if not (specs_dir / feature).is_dir()]
+        self.db.executemany("DELETE FROM entries WHERE feature = ?", [(feature,) for feature in missing])
+        return len(missing)
+
+    def save(self):
+        """Commit the entries updated so far"""
+        self.db.commit()
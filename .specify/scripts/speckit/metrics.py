@@ -0,0 +1,151 @@
+"""
+Phase timings and counters for generator runs
+
+process_feature() times its own phases with a FeatureTimer and returns the
+laps with its result; main() folds them into a RunMetrics. A disabled
+FeatureTimer only checks a flag, so instrumentation costs essentially
+nothing unless --timings/--metrics-json asked for it.
+
+Phase totals are summed across features, so with --jobs N they add up
+worker time and can exceed the run's wall time. The same holds for runs
+merged from shards (speckit.shard).
+
+The worker_fragment_* counters sum the {% fragment %} cache hits and misses
+of each process's own cache (see speckit.templates). Which features a
+worker renders decides how often it hits, so unlike the run summary they
+differ between identical runs with --jobs N or --shard.
+"""
+
+import json
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+# Phases in pipeline order
+PHASES = ("scan", "check", "read", "parse", "render", "write")
+
+METRICS_VERSION = 1
+
+class FeatureTimer:
+    """Stopwatch that attributes the time since the previous lap to a phase"""
+
+    __slots__ = ("enabled", "laps", "last")
+
+    def __init__(self, enabled: bool):
+        self.enabled = enabled
+        self.laps: Dict[str, float] = {}
+        self.last = time.perf_counter() if enabled else 0.0
+
+    def lap(self, phase: str):
+        """Charge the time since the last lap to phase"""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self.laps[phase] = self.laps.get(phase, 0.0) + (now - self.last)
+        self.last = now
+
+class RunMetrics:
+    """Aggregate and per-feature phase timings and byte counters for one run"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases: Dict[str, float] = dict.fromkeys(PHASES, 0.0)
+        self.counters: Dict[str, int] = {
+            "bytes_read": 0, "bytes_written": 0, "features_timed": 0,
+            "worker_fragment_hits": 0, "worker_fragment_misses": 0,
+        }
+        self.features: Dict[str, Dict[str, Any]] = {}
+        # Fixed wall time of a run restored from JSON, instead of the clock
+        self.wall: Optional[float] = None
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "RunMetrics":
+        """Restore the metrics of a finished run from its --metrics-json data"""
+        metrics = cls()
+        metrics.phases.update(data.get("phases", {}))
+        metrics.counters.update(data.get("counters", {}))
+        metrics.features.update(data.get("features", {}))
+        metrics.wall = data.get("wall_seconds", 0.0)
+        return metrics
+
+    def merge(self, other: "RunMetrics"):
+        """Add another run's totals, e.g. a shard's, keeping the longer wall time"""
+        for phase, seconds in other.phases.items():
+            self.add_phase(phase, seconds)
+        for key, value in other.counters.items():
+            self.counters[key] = self.counters.get(key, 0) + value
+        self.features.update(other.features)
+        self.wall = max(self.wall or 0.0, other.wall_seconds())
+
+    def add_phase(self, phase: str, seconds: float):
+        """Add run-level time (e.g. the directory scan) to a phase"""
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+    def add_feature(self, feature: str, metrics: Optional[Dict[str, Any]]):
+        """Merge one process_feature() metrics record"""
+        if not metrics:
+            return
+        self.features[feature] = metrics
+        self.counters["features_timed"] += 1
+        for key, value in metrics.items():
+            if key in self.counters:
+                self.counters[key] += value
+            else:
+                self.phases[key] = self.phases.get(key, 0.0) + value
+
+    def wall_seconds(self) -> float:
+        if self.wall is not None:
+            return self.wall
+        return time.perf_counter() - self.started
+
+    def to_dict(self, stats: Dict[str, int], **extra: Any) -> Dict[str, Any]:
+        """Return the machine-readable form written by --metrics-json"""
+        data = {
+            "version": METRICS_VERSION,
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "wall_seconds": round(self.wall_seconds(), 6),
+            "stats": dict(stats),
+            "phases": {name: round(seconds, 6) for name, seconds in self.phases.items()},
+            "counters": dict(self.counters),
+            "features": {
+                name: {key: round(value, 6) if isinstance(value, float) else value for key, value in record.items()}
+                for name, record in sorted(self.features.items())
+            },
+        }
+        data.update(extra)
+        return data
+
+    def write_json(self, path: Path, stats: Dict[str, int], **extra: Any):
+        """Write the metrics JSON file"""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(stats, **extra), f, indent=2)
+            f.write("\n")
+
+    def print_summary(self, top: int = 5):
+        """Print the aggregate phase breakdown and the slowest features"""
+        total = sum(self.phases.values()) or 1.0
+        print("\n" + "="*60)
+        print("⏱️  Timing Breakdown")
+        print("="*60)
+        for name, seconds in self.phases.items():
+            print(f"{name:<8} {seconds * 1000:>10.1f} ms  {seconds / total:>6.1%}")
+        print(f"{'wall':<8} {self.wall_seconds() * 1000:>10.1f} ms")
+        print(f"Bytes read: {self.counters['bytes_read']:,}  written: {self.counters['bytes_written']:,}")
+        hits, misses = self.counters["worker_fragment_hits"], self.counters["worker_fragment_misses"]
+        if hits + misses:
+            print(f"Fragment cache, summed over worker processes: {hits} hits, {misses} misses "
+                  f"({hits / (hits + misses):.0%} hit rate)")
+
+        slowest = sorted(
+            self.features.items(),
+            key=lambda item: sum(v for k, v in item[1].items() if k in PHASES),
+            reverse=True,
+        )[:top]
+        if slowest:
+            print(f"Slowest features:")
+            for name, record in slowest:
+                seconds = sum(v for k, v in record.items() if k in PHASES)
+                print(f"  {seconds * 1000:>8.2f} ms  {name}")
+        print("="*60)
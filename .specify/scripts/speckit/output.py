@@ -0,0 +1,182 @@
+"""
+Write-avoiding, atomic output for generated docs
+
+Generated docs carry a `**Created**: YYYY-MM-DD` stamp that changes every
+day. Comparisons ignore that line, so a regeneration that produces the same
+document leaves the file (and its mtime) alone. Changed files are written to
+a temporary file in the same directory and renamed over the target, so
+editors and watchers never observe a partially written doc.
+
+write_chunks_if_changed() does the same for a doc produced in chunks
+(--stream): the chunks go to the temporary file as they come, in
+FLUSH_CHARS batches, and the comparison is made on digests, which are
+computed line by line. Neither the old nor the new doc is ever held in
+memory whole.
+"""
+
+import hashlib
+import os
+import re
+import tempfile
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+
+VOLATILE_RE = re.compile(r'^\*\*Created\*\*: .*$', re.MULTILINE)
+# The same lines found by their literal prefix, which re searches for much
+# faster than it tries ^ at every position; normalize() checks line starts
+CREATED_RE = re.compile(r'\*\*Created\*\*: [^\n]*')
+
+# Characters of streamed output buffered before they are written
+FLUSH_CHARS = 64 * 1024
+
+def _default_mode() -> int:
+    """Return the mode open(path, 'w') would give a new file under the current umask"""
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+NEW_FILE_MODE = _default_mode()
+
+def normalize(text: str) -> str:
+    """Blank out volatile lines so two renders of the same doc compare equal"""
+    parts = []
+    pos = 0
+    for match in CREATED_RE.finditer(text):
+        start = match.start()
+        if start and text[start - 1] != "\n":
+            continue
+        parts.append(text[pos:start])
+        parts.append("**Created**:")
+        pos = match.end()
+    if not parts:
+        return text
+    parts.append(text[pos:])
+    return "".join(parts)
+
+def output_digest(text: str) -> str:
+    """Hash a generated doc, ignoring volatile lines"""
+    return hashlib.sha256(normalize(text).encode()).hexdigest()
+
+def _existing_mode(path: Path) -> int:
+    try:
+        return os.stat(path).st_mode & 0o7777
+    except FileNotFoundError:
+        return NEW_FILE_MODE
+
+def atomic_write(path: Path, text: str, mode: Optional[int] = None, errors: Optional[str] = None):
+    """Write text to path via a temporary file and rename"""
+    if mode is None:
+        mode = _existing_mode(path)
+
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w', errors=errors) as f:
+            f.write(text)
+        os.chmod(tmp, mode)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except FileNotFoundError:
+            pass
+        raise
+
+def write_if_changed(path: Path, text: str) -> Tuple[bool, str]:
+    """Write a generated doc unless the file on disk already matches it.
+
+    Returns (written, digest). When an existing doc is rewritten its
+    `**Created**` stamp is carried over, so only real content changes show
+    up in diffs.
+    """
+    try:
+        with open(path, 'r') as f:
+            existing = f.read()
+    except FileNotFoundError:
+        existing = None
+
+    if existing is not None:
+        if normalize(existing) == normalize(text):
+            return False, output_digest(existing)
+        stamp = VOLATILE_RE.search(existing)
+        if stamp:
+            text = VOLATILE_RE.sub(lambda _: stamp.group(0), text, count=1)
+
+    atomic_write(path, text)
+    return True, output_digest(text)
+
+class _LineDigest:
+    """output_digest() of text fed in arbitrary chunks, optionally copied to a file.
+
+    With stamp, the first volatile line is replaced by it on the way to the
+    file, as write_if_changed() does.
+    """
+
+    def __init__(self, file=None, stamp: Optional[str] = None):
+        self.file = file
+        self.stamp = stamp
+        self.hash = hashlib.sha256()
+        self.partial = ""
+        self.parts: List[str] = []
+        self.size = 0
+
+    def write(self, chunk: str):
+        self.parts.append(chunk)
+        self.size += len(chunk)
+        if self.size >= FLUSH_CHARS:
+            self.flush()
+
+    def flush(self, final: bool = False):
+        text = self.partial + "".join(self.parts)
+        self.parts, self.size = [], 0
+        # Volatile lines are only recognized whole, so a partial last line waits
+        end = len(text) if final else text.rfind("\n") + 1
+        text, self.partial = text[:end], text[end:]
+        if self.stamp is not None and VOLATILE_RE.search(text):
+            text = VOLATILE_RE.sub(lambda _: self.stamp, text, count=1)
+            self.stamp = None
+        if self.file is not None:
+            self.file.write(text)
+        self.hash.update(normalize(text).encode())
+
+    def hexdigest(self) -> str:
+        self.flush(final=True)
+        return self.hash.hexdigest()
+
+def write_chunks_if_changed(path: Path, produce: Callable[[Callable[[str], None]], None]) -> Tuple[bool, str]:
+    """write_if_changed() for a doc that produce(write) emits in chunks.
+
+    Returns (written, digest), with the same digests as write_if_changed().
+    """
+    existing = None
+    stamp = None
+    try:
+        with open(path, 'r') as f:
+            digest = _LineDigest()
+            for line in f:
+                if stamp is None:
+                    match = VOLATILE_RE.match(line)
+                    stamp = match.group(0) if match else None
+                digest.write(line)
+            existing = digest.hexdigest()
+    except FileNotFoundError:
+        pass
+
+    mode = _existing_mode(path)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w') as f:
+            writer = _LineDigest(f, stamp)
+            produce(writer.write)
+            digest = writer.hexdigest()
+        if digest == existing:
+            os.unlink(tmp)
+            return False, digest
+        os.chmod(tmp, mode)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except FileNotFoundError:
+            pass
+        raise
+    return True, digest
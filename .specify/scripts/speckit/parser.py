@@ -0,0 +1,172 @@
+"""
+Single-pass spec.md parser
+
+Reads a spec line by line and fills every field in the same pass, with
+results identical to the original regex-based extract_feature_info(). Each
+line is classified with constant-time substring checks before any regex is
+applied, and no pattern can match across lines, so the running time is
+linear in the size of the spec. When only header fields are requested the
+parser stops reading as soon as they have been found.
+
+parse_feature() wraps the result in a FeatureInfo, the typed record that
+the generator's renderers and the spec index consume (see renderers.py).
+"""
+
+import io
+import re
+from pathlib import Path
+from typing import Any, Dict, Iterable, NamedTuple, Optional, Tuple
+
+FIELDS = ("name", "number", "status", "user_stories", "entities", "requirements")
+
+# Fields that are complete once their first occurrence has been seen
+HEADER_FIELDS = frozenset(("name", "number", "status"))
+
+TITLE_RE = re.compile(r'# Feature Specification: (.+)')
+BRANCH_RE = re.compile(r'\*\*Feature Branch\*\*: `\[(\d+)-')
+STATUS_RE = re.compile(r'\*\*Status\*\*: (.+)')
+USER_STORY_RE = re.compile(r'### User Story \d+ - (.+?) \(Priority: (P\d)\)')
+ENTITY_RE = re.compile(r'- \*\*(\w+)\*\*:')
+FR_RE = re.compile(r'- \*\*FR-\d+\*\*: (.+)')
+
+class UserStory(NamedTuple):
+    """A `### User Story N - Title (Priority: PN)` heading"""
+    title: str
+    priority: str
+
+class FeatureInfo(NamedTuple):
+    """Everything parsed from one feature's spec.md"""
+    feature: str
+    name: str
+    number: str
+    status: str
+    user_stories: Tuple[UserStory, ...]
+    entities: Tuple[str, ...]
+    requirements: Tuple[str, ...]
+
+    @classmethod
+    def from_dict(cls, feature: str, info: Dict[str, Any]) -> "FeatureInfo":
+        """Wrap a parse_lines() dict for the feature directory named feature"""
+        return cls(
+            feature=feature,
+            name=info["name"],
+            number=info["number"],
+            status=info["status"],
+            user_stories=tuple(UserStory(s["title"], s["priority"]) for s in info["user_stories"]),
+            entities=tuple(info["entities"]),
+            requirements=tuple(info["requirements"]),
+        )
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the parse_lines() dict this record was built from"""
+        return {
+            "name": self.name,
+            "number": self.number,
+            "status": self.status,
+            "user_stories": [story._asdict() for story in self.user_stories],
+            "entities": list(self.entities),
+            "requirements": list(self.requirements),
+        }
+
+# Entity collection states
+_BEFORE_HEADING, _AFTER_HEADING, _COLLECTING = range(3)
+
+def empty_info() -> Dict[str, Any]:
+    """Return a feature info dict with every field at its default"""
+    return {
+        "name": "",
+        "number": "",
+        "status": "Pending",
+        "user_stories": [],
+        "entities": [],
+        "requirements": [],
+    }
+
+def parse_lines(lines: Iterable[str], fields: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+    """Parse spec.md lines (each keeping its trailing newline) into a feature info dict.
+
+    The Key Entities rule mirrors the original DOTALL regex: entities are
+    collected from the first `- **Name**:` bullet that follows a blank line
+    after the `### Key Entities` heading, through to the end of the spec.
+    """
+    wanted = set(FIELDS if fields is None else fields)
+    unknown = wanted - set(FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown spec fields: {', '.join(sorted(unknown))}")
+
+    info = empty_info()
+    # Header fields still to find; when nothing else is wanted we can stop
+    # as soon as this empties
+    pending = wanted & HEADER_FIELDS
+    header_only = wanted <= HEADER_FIELDS
+    if header_only and not pending:
+        return info
+
+    want_stories = "user_stories" in wanted
+    want_entities = "entities" in wanted
+    want_requirements = "requirements" in wanted
+    entity_state = _BEFORE_HEADING
+    prev_blank = False
+
+    for line in lines:
+        if pending and ('#' in line or '**' in line):
+            if "name" in pending and "# Feature Specification: " in line:
+                match = TITLE_RE.search(line)
+                if match:
+                    info["name"] = match.group(1)
+                    pending.discard("name")
+            if "number" in pending and "**Feature Branch**: `[" in line:
+                match = BRANCH_RE.search(line)
+                if match:
+                    info["number"] = match.group(1)
+                    pending.discard("number")
+            if "status" in pending and "**Status**: " in line:
+                match = STATUS_RE.search(line)
+                if match:
+                    info["status"] = match.group(1).strip()
+                    pending.discard("status")
+            if header_only and not pending:
+                break
+
+        if want_stories and "### User Story " in line:
+            for match in USER_STORY_RE.finditer(line):
+                info["user_stories"].append({
+                    "title": match.group(1),
+                    "priority": match.group(2)
+                })
+
+        if want_entities:
+            if entity_state == _COLLECTING:
+                if line.startswith("- **"):
+                    match = ENTITY_RE.match(line)
+                    if match:
+                        info["entities"].append(match.group(1))
+            elif entity_state == _AFTER_HEADING:
+                # The first bullet must follow a blank line and carry at
+                # least one more character (the newline counts)
+                if prev_blank and line.startswith("- **"):
+                    match = ENTITY_RE.match(line)
+                    if match and match.end() < len(line):
+                        info["entities"].append(match.group(1))
+                        entity_state = _COLLECTING
+                prev_blank = line == "\n"
+            elif "### Key Entities" in line:
+                entity_state = _AFTER_HEADING
+
+        if want_requirements and "- **FR-" in line:
+            info["requirements"].extend(FR_RE.findall(line))
+
+    return info
+
+def parse_spec_text(content: str, fields: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+    """Parse spec.md content into a feature info dict"""
+    return parse_lines(io.StringIO(content), fields)
+
+def parse_spec(spec_path: Path, fields: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+    """Parse a spec.md file into a feature info dict, reading only as far as needed"""
+    with open(spec_path, 'r') as f:
+        return parse_lines(f, fields)
+
+def parse_feature(feature: str, content: str) -> FeatureInfo:
+    """Parse spec.md content of the feature directory named feature"""
+    return FeatureInfo.from_dict(feature, parse_spec_text(content))
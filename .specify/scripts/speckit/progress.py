@@ -0,0 +1,268 @@
+"""
+Task progress from tasks.md checkboxes (generate_all_docs.py progress)
+
+Both tasks.md layouts are read:
+
+    generated     ### T001: Title headings under ## Phase N: ... headings,
+                  each task with a "- [ ]" acceptance checklist; a task is
+                  done when every box in it is checked
+    hand-written  - [ ] T001 [P] [US1] Description lines, one task per box
+
+Checkboxes outside a task still count towards their phase and feature.
+Every ## heading starts a phase; phases without boxes are not recorded.
+
+The counts per task and per phase are kept in .specify/cache/progress.sqlite.
+refresh() works like SearchIndex.refresh(): one stat() per tasks.md, a
+hash only when size/mtime changed, and only files whose content changed
+are parsed again. Feature and tree totals are sums over the phase rows.
+"""
+
+import re
+import sqlite3
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from speckit.manifest import sha256_bytes
+
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE documents (
+    feature TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    sha256 TEXT NOT NULL
+);
+CREATE TABLE phases (
+    feature TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    tasks INTEGER NOT NULL,
+    done INTEGER NOT NULL,
+    boxes INTEGER NOT NULL,
+    checked INTEGER NOT NULL,
+    PRIMARY KEY (feature, position)
+);
+CREATE TABLE tasks (
+    feature TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    task TEXT NOT NULL,
+    phase INTEGER NOT NULL,
+    title TEXT NOT NULL,
+    boxes INTEGER NOT NULL,
+    checked INTEGER NOT NULL,
+    PRIMARY KEY (feature, position)
+);
+"""
+
+PHASE_RE = re.compile(r'^##\s+(.*?)\s*#*\s*$')
+TASK_HEADING_RE = re.compile(r'^###\s+(T\d+)\b[:.\s-]*(.*?)\s*$')
+HEADING_RE = re.compile(r'^#{1,6}\s')
+BOX_RE = re.compile(r'^\s*[-*]\s+\[([ xX])\]\s+(.*?)\s*$')
+BOX_TASK_RE = re.compile(r'^(T\d+)\b\s*(.*)$')
+FENCE = "```"
+
+class TaskProgress(NamedTuple):
+    """One task and its checkboxes"""
+    task: str
+    phase: int
+    title: str
+    boxes: int
+    checked: int
+
+    @property
+    def done(self) -> bool:
+        """Every box checked"""
+        return self.boxes > 0 and self.checked == self.boxes
+
+class PhaseProgress(NamedTuple):
+    """Checkbox and task counts of one ## section"""
+    name: str
+    tasks: int
+    done: int
+    boxes: int
+    checked: int
+
+class FeatureProgress(NamedTuple):
+    """Totals of one feature's tasks.md"""
+    feature: str
+    tasks: int
+    done: int
+    boxes: int
+    checked: int
+
+def percent(checked: int, boxes: int) -> float:
+    """Share of checked boxes; 0 for none"""
+    return 100.0 * checked / boxes if boxes else 0.0
+
+def parse_progress(text: str) -> List[Tuple[PhaseProgress, List[TaskProgress]]]:
+    """Count the tasks and checkboxes of a tasks.md: each phase with boxes or tasks, and its tasks"""
+    phases: List[List] = []
+    tasks: List[List] = []
+    task: Optional[List] = None
+    in_fence = False
+
+    def phase() -> int:
+        if not phases:
+            phases.append(["", 0, 0])
+        return len(phases) - 1
+
+    for line in text.splitlines():
+        if line.lstrip().startswith(FENCE):
+            in_fence = not in_fence
+            continue
+        if in_fence:
+            continue
+        if line.startswith("#"):
+            match = PHASE_RE.match(line)
+            if match:
+                phases.append([match.group(1), 0, 0])
+                task = None
+                continue
+            match = TASK_HEADING_RE.match(line)
+            if match:
+                task = [match.group(1), phase(), match.group(2), 0, 0]
+                tasks.append(task)
+                continue
+            if HEADING_RE.match(line):
+                task = None
+            continue
+        match = BOX_RE.match(line)
+        if not match:
+            continue
+        checked = match.group(1) != " "
+        index = phase()
+        phases[index][1] += 1
+        phases[index][2] += checked
+        inline = BOX_TASK_RE.match(match.group(2))
+        if inline and task is None:
+            tasks.append([inline.group(1), index, inline.group(2), 1, int(checked)])
+        elif task is not None:
+            task[3] += 1
+            task[4] += checked
+
+    counted = [TaskProgress(*task) for task in tasks]
+    result = []
+    for index, (name, boxes, checked) in enumerate(phases):
+        mine = [task for task in counted if task.phase == index]
+        if boxes or mine:
+            result.append((PhaseProgress(name, len(mine), sum(task.done for task in mine), boxes, checked), mine))
+    return result
+
+class ProgressIndex:
+    """Incrementally maintained task progress of every feature's tasks.md"""
+
+    def __init__(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.db = sqlite3.connect(str(path))
+        self.db.execute("PRAGMA journal_mode = WAL")
+        if self.db.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            self._reset()
+
+    def _reset(self):
+        with self.db:
+            for table in ("tasks", "phases", "documents"):
+                self.db.execute(f"DROP TABLE IF EXISTS {table}")
+            self.db.executescript(SCHEMA)
+            self.db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self) -> "ProgressIndex":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def refresh(self, spec_dirs: Iterable[Path]) -> Dict[str, int]:
+        """Bring the index up to date with the tasks.md of spec_dirs (the whole tree)"""
+        known = {
+            feature: (size, mtime_ns, sha)
+            for feature, size, mtime_ns, sha in self.db.execute(
+                "SELECT feature, size, mtime_ns, sha256 FROM documents")
+        }
+        counts = {"parsed": 0, "unchanged": 0, "removed": 0}
+        seen = set()
+
+        with self.db:
+            for spec_dir in spec_dirs:
+                feature = spec_dir.name
+                path = spec_dir / "tasks.md"
+                try:
+                    st = path.stat()
+                except (FileNotFoundError, NotADirectoryError):
+                    continue
+                seen.add(feature)
+                recorded = known.get(feature)
+                if recorded and recorded[:2] == (st.st_size, st.st_mtime_ns):
+                    counts["unchanged"] += 1
+                    continue
+                data = path.read_bytes()
+                sha = sha256_bytes(data)
+                if recorded and recorded[2] == sha:
+                    self.db.execute("UPDATE documents SET size = ?, mtime_ns = ? WHERE feature = ?",
+                                    (st.st_size, st.st_mtime_ns, feature))
+                    counts["unchanged"] += 1
+                    continue
+                self._store(feature, parse_progress(data.decode("utf-8", errors="replace")),
+                            st.st_size, st.st_mtime_ns, sha)
+                counts["parsed"] += 1
+
+            for feature in known.keys() - seen:
+                self._delete(feature)
+                counts["removed"] += 1
+        return counts
+
+    def _delete(self, feature: str):
+        for table in ("tasks", "phases", "documents"):
+            self.db.execute(f"DELETE FROM {table} WHERE feature = ?", (feature,))
+
+    def _store(
+        self,
+        feature: str,
+        phases: List[Tuple[PhaseProgress, List[TaskProgress]]],
+        size: int,
+        mtime_ns: int,
+        sha: str,
+    ):
+        self._delete(feature)
+        self.db.execute("INSERT INTO documents (feature, size, mtime_ns, sha256) VALUES (?, ?, ?, ?)",
+                        (feature, size, mtime_ns, sha))
+        position = 0
+        for number, (phase, tasks) in enumerate(phases):
+            self.db.execute(
+                "INSERT INTO phases (feature, position, name, tasks, done, boxes, checked) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (feature, number, *phase),
+            )
+            for task in tasks:
+                self.db.execute(
+                    "INSERT INTO tasks (feature, position, task, phase, title, boxes, checked) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (feature, position, task.task, number, task.title, task.boxes, task.checked),
+                )
+                position += 1
+
+    def features(self, names: Optional[List[str]] = None) -> List[FeatureProgress]:
+        """Totals per feature, in directory order (all features, or the given ones)"""
+        query = ("SELECT d.feature, COALESCE(SUM(p.tasks), 0), COALESCE(SUM(p.done), 0), "
+                 "COALESCE(SUM(p.boxes), 0), COALESCE(SUM(p.checked), 0) "
+                 "FROM documents d LEFT JOIN phases p ON p.feature = d.feature")
+        params: List[str] = []
+        if names is not None:
+            query += f" WHERE d.feature IN ({', '.join('?' * len(names))})"
+            params = names
+        query += " GROUP BY d.feature ORDER BY d.feature"
+        return [FeatureProgress(*row) for row in self.db.execute(query, params)]
+
+    def phases(self, feature: str) -> List[PhaseProgress]:
+        """A feature's phases, in document order"""
+        return [PhaseProgress(*row) for row in self.db.execute(
+            "SELECT name, tasks, done, boxes, checked FROM phases WHERE feature = ? ORDER BY position", (feature,))]
+
+    def tasks(self, feature: str) -> List[TaskProgress]:
+        """A feature's tasks, in document order; phase is the position in phases()"""
+        return [TaskProgress(*row) for row in self.db.execute(
+            "SELECT task, phase, title, boxes, checked FROM tasks WHERE feature = ? ORDER BY position", (feature,))]
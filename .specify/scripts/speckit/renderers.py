@@ -0,0 +1,100 @@
+"""
+Renderers: every output the generator derives from a parsed spec
+
+process_feature() reads and parses each spec.md at most once into a
+FeatureInfo and hands that one record to every renderer that needs it, in
+the same pass; nothing downstream reads or regexes the markdown again. The
+same record also feeds the spec index.
+
+There are three kinds of renderer:
+
+    doc     plan.md / tasks.md, written into the feature directory and
+            subject to the manifest's hand-edit protection
+    file    one export file per feature under the export directory
+            (e.g. 001-foo.json), rewritten when the spec or inputs change
+    row     one fragment per feature (e.g. a CSV line), kept in the manifest
+            and joined in directory order into a single summary file, so an
+            unchanged feature's row costs nothing on later runs
+
+generate_all_docs.py registers the template-backed renderers (plan, tasks,
+html); json and csv are defined here. Registering another renderer makes
+it available to --export.
+"""
+
+import csv
+import io
+import json
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+from speckit.parser import FeatureInfo
+
+DOC = "doc"
+FILE = "file"
+ROW = "row"
+
+class Renderer(NamedTuple):
+    """A named output rendered from a FeatureInfo"""
+    name: str
+    # File name; "{feature}" is replaced by the feature directory name
+    output: str
+    render: Callable[[FeatureInfo], str]
+    kind: str = FILE
+    # First line(s) of the summary file, for ROW renderers
+    header: str = ""
+    # Optional render(info, write) that emits the output in chunks (--stream)
+    stream: Optional[Callable[[FeatureInfo, Callable[[str], None]], None]] = None
+
+RENDERERS: Dict[str, Renderer] = {}
+
+def register_renderer(renderer: Renderer) -> Renderer:
+    """Make a renderer available by name (replacing one with the same name)"""
+    if renderer.kind not in (DOC, FILE, ROW):
+        raise ValueError(f"Unknown renderer kind: {renderer.kind}")
+    RENDERERS[renderer.name] = renderer
+    return renderer
+
+def doc_renderers() -> List[Renderer]:
+    """The renderers for the feature's own docs, in registration order"""
+    return [renderer for renderer in RENDERERS.values() if renderer.kind == DOC]
+
+def export_names() -> List[str]:
+    """Names accepted by --export"""
+    return [name for name, renderer in RENDERERS.items() if renderer.kind != DOC]
+
+def export_renderers(names: Optional[List[str]]) -> List[Renderer]:
+    """Resolve --export names, raising ValueError for unknown ones"""
+    renderers = []
+    for name in names or []:
+        renderer = RENDERERS.get(name)
+        if renderer is None or renderer.kind == DOC:
+            raise ValueError(f"Unknown export format '{name}' (choose from {', '.join(export_names())})")
+        if renderer not in renderers:
+            renderers.append(renderer)
+    return renderers
+
+def output_name(renderer: Renderer, feature: str) -> str:
+    return renderer.output.replace("{feature}", feature)
+
+def render_json(info: FeatureInfo) -> str:
+    """The parsed spec as a JSON document"""
+    return json.dumps({"feature": info.feature, **info.as_dict()}, indent=2, ensure_ascii=False) + "\n"
+
+CSV_COLUMNS = ("feature", "number", "name", "status", "user_stories", "p1_stories", "entities", "requirements")
+
+def render_csv_row(info: FeatureInfo) -> str:
+    """One line of the features.csv summary"""
+    row = io.StringIO()
+    csv.writer(row, lineterminator="\n").writerow((
+        info.feature,
+        info.number,
+        info.name,
+        info.status,
+        len(info.user_stories),
+        sum(1 for story in info.user_stories if story.priority == "P1"),
+        len(info.entities),
+        len(info.requirements),
+    ))
+    return row.getvalue()
+
+register_renderer(Renderer("json", "{feature}.json", render_json))
+register_renderer(Renderer("csv", "features.csv", render_csv_row, ROW, ",".join(CSV_COLUMNS) + "\n"))
@@ -0,0 +1,278 @@
+"""
+Task DAG, critical paths and list scheduling (generate_all_docs.py schedule)
+
+Every tasks.md contributes its tasks and their dependencies to one graph:
+
+    tasks         ### T001: Title headings (with **Time Estimate**: 1.5 days)
+                  and hand-written - [ ] T001 ... lines; a task without an
+                  estimate counts as DEFAULT_DAYS
+    dependencies  "- T012 depends on T009, T010, T011" lines and
+                  **Dependencies**: T009, T010 fields. A reference may name
+                  another feature's task by number, e.g. 002:T004, which is
+                  what makes the graph cross-feature.
+
+analyze() orders the graph topologically (Kahn's algorithm) and computes,
+in O(tasks + dependencies):
+
+    earliest   earliest start with unlimited workers
+    latest     latest start that does not delay the end of the tree
+    rank       length of the longest path from the start of the task to
+               the end of the tree (the task's own duration included)
+
+Tasks with no slack (latest == earliest) are on a critical path; one
+longest chain is reported as the critical path.
+
+list_schedule() assigns tasks to N workers with critical-path list
+scheduling: whenever a worker is free, it takes the ready task with the
+highest rank. Finding an optimal schedule is NP-hard; this greedy one is
+never longer than twice the optimum (Graham) and is compared against the
+lower bound max(critical path, total work / N). It runs in
+O((tasks + dependencies) log tasks), so tens of thousands of tasks take
+well under a second.
+
+Tasks in a dependency cycle, and the tasks depending on them, cannot be
+ordered; they are reported and left out. Dependencies on unknown tasks
+are reported and ignored.
+"""
+
+import heapq
+import re
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from speckit.progress import BOX_RE, BOX_TASK_RE, FENCE, HEADING_RE, TASK_HEADING_RE
+
+DEFAULT_DAYS = 1.0
+HOURS_PER_DAY = 8
+
+DEPENDS_RE = re.compile(r'^\s*[-*]\s+(?:\*\*)?(T\d+)(?:\*\*)?\s+depends\s+on\s+(.*)$', re.IGNORECASE)
+DEPENDENCIES_FIELD_RE = re.compile(r'^\*\*Dependencies\*\*:\s*(.*)$')
+ESTIMATE_FIELD_RE = re.compile(r'^\*\*Time Estimate\*\*:\s*(.*)$')
+ESTIMATE_RE = re.compile(r'(\d+(?:\.\d+)?)(?:\s*[-–]\s*(\d+(?:\.\d+)?))?\s*(d|day|days|h|hr|hrs|hour|hours)\b',
+                         re.IGNORECASE)
+REFERENCE_RE = re.compile(r'\b(?:(\d{3})[:/])?(T\d+)\b')
+
+class Task(NamedTuple):
+    """One task of the graph"""
+    feature: str
+    task: str
+    title: str
+    days: float
+
+    @property
+    def key(self) -> str:
+        return f"{self.feature}:{self.task}"
+
+class TaskGraph(NamedTuple):
+    """Tasks and, per task, the indexes of the tasks it depends on"""
+    tasks: List[Task]
+    preds: List[List[int]]
+    problems: List[str]
+
+class Analysis(NamedTuple):
+    """Timing of every ordered task, in days from the start"""
+    order: List[int]              # topological order; tasks in or after a cycle are missing
+    earliest: List[float]
+    latest: List[float]
+    rank: List[float]
+    length: float                 # the critical path
+    critical_path: List[int]
+    cyclic: List[int]
+
+class Assignment(NamedTuple):
+    task: int
+    worker: int
+    start: float
+    end: float
+
+class Schedule(NamedTuple):
+    """Tasks assigned to workers, in order of start"""
+    workers: int
+    assignments: List[Assignment]
+    makespan: float
+    lower_bound: float
+
+def parse_days(text: str) -> Optional[float]:
+    """'1.5 days' -> 1.5, '4 hours' -> 0.5, '2-3 days' -> 3 (the upper end); None if unreadable"""
+    match = ESTIMATE_RE.search(text)
+    if not match:
+        return None
+    value = float(match.group(2) or match.group(1))
+    return value / HOURS_PER_DAY if match.group(3).lower().startswith("h") else value
+
+def parse_tasks(text: str) -> Tuple[List[Tuple[str, str, float]], List[Tuple[str, str]]]:
+    """Tasks (id, title, days) and dependencies (task, reference) of a tasks.md, in document order"""
+    tasks: List[List] = []
+    edges: List[Tuple[str, str]] = []
+    current: Optional[List] = None
+    in_fence = False
+    for line in text.splitlines():
+        if line.lstrip().startswith(FENCE):
+            in_fence = not in_fence
+            continue
+        if in_fence:
+            continue
+        if line.startswith("#"):
+            match = TASK_HEADING_RE.match(line)
+            if match:
+                current = [match.group(1), match.group(2), None]
+                tasks.append(current)
+            elif HEADING_RE.match(line):
+                current = None
+            continue
+        match = DEPENDS_RE.match(line)
+        if match:
+            edges.extend((match.group(1), ref) for ref in _references(match.group(2)))
+            continue
+        if current is not None:
+            match = DEPENDENCIES_FIELD_RE.match(line)
+            if match:
+                edges.extend((current[0], ref) for ref in _references(match.group(1)))
+                continue
+            match = ESTIMATE_FIELD_RE.match(line)
+            if match:
+                current[2] = parse_days(match.group(1))
+                continue
+        match = BOX_RE.match(line)
+        if match and current is None:
+            inline = BOX_TASK_RE.match(match.group(2))
+            if inline:
+                tasks.append([inline.group(1), inline.group(2), None])
+    return [(task, title, DEFAULT_DAYS if days is None else days) for task, title, days in tasks], edges
+
+def _references(text: str) -> List[str]:
+    # "T009, T010 (test after implementation)" -> T009, T010; "002:T004" -> 002:T004
+    text = text.split("(", 1)[0]
+    return [f"{number}:{task}" if number else task for number, task in REFERENCE_RE.findall(text)]
+
+def build_graph(documents: Iterable[Tuple[str, str]]) -> TaskGraph:
+    """Build the graph from (feature directory name, tasks.md text) pairs"""
+    tasks: List[Task] = []
+    index: Dict[str, int] = {}
+    by_number: Dict[str, str] = {}
+    pending: List[Tuple[str, str, str]] = []
+    problems: List[str] = []
+    for feature, text in documents:
+        number = feature.split("-", 1)[0]
+        if number.isdigit():
+            by_number.setdefault(number, feature)
+        found, edges = parse_tasks(text)
+        for task, title, days in found:
+            key = f"{feature}:{task}"
+            if key in index:
+                problems.append(f"{key} is defined twice; the first definition is used")
+                continue
+            index[key] = len(tasks)
+            tasks.append(Task(feature, task, title, days))
+        pending.extend((feature, task, ref) for task, ref in edges)
+
+    preds: List[List[int]] = [[] for _ in tasks]
+    for feature, task, ref in pending:
+        if ":" in ref:
+            number, ref_task = ref.split(":", 1)
+            ref_key = f"{by_number.get(number, number)}:{ref_task}"
+        else:
+            ref_key = f"{feature}:{ref}"
+        after = index.get(f"{feature}:{task}")
+        before = index.get(ref_key)
+        if after is None or before is None:
+            missing = f"{feature}:{task}" if after is None else ref_key
+            problems.append(f"{feature}:{task} depends on {ref}: {missing} is not a task")
+            continue
+        if before not in preds[after]:
+            preds[after].append(before)
+    return TaskGraph(tasks, preds, problems)
+
+def analyze(graph: TaskGraph) -> Analysis:
+    """Topological order, earliest/latest starts, ranks and the critical path"""
+    count = len(graph.tasks)
+    succs: List[List[int]] = [[] for _ in range(count)]
+    indegree = [len(preds) for preds in graph.preds]
+    for task, preds in enumerate(graph.preds):
+        for pred in preds:
+            succs[pred].append(task)
+
+    order = [task for task in range(count) if indegree[task] == 0]
+    for task in order:
+        for succ in succs[task]:
+            indegree[succ] -= 1
+            if indegree[succ] == 0:
+                order.append(succ)
+    ordered = set(order)
+    cyclic = [task for task in range(count) if task not in ordered]
+
+    days = [task.days for task in graph.tasks]
+    earliest = [0.0] * count
+    for task in order:
+        for pred in graph.preds[task]:
+            earliest[task] = max(earliest[task], earliest[pred] + days[pred])
+    length = max((earliest[task] + days[task] for task in order), default=0.0)
+
+    rank = [0.0] * count
+    for task in reversed(order):
+        rank[task] = days[task] + max((rank[succ] for succ in succs[task] if succ in ordered), default=0.0)
+    latest = [length - rank[task] for task in range(count)]
+
+    # Follow the highest-ranked successor from the highest-ranked start
+    path: List[int] = []
+    starts = [task for task in order if not graph.preds[task]]
+    task = max(starts, key=lambda t: rank[t], default=None)
+    while task is not None:
+        path.append(task)
+        remaining = rank[task] - days[task]
+        task = next((succ for succ in succs[task] if succ in ordered and abs(rank[succ] - remaining) < 1e-9), None)
+    return Analysis(order, earliest, latest, rank, length, path, cyclic)
+
+def list_schedule(graph: TaskGraph, analysis: Analysis, workers: int) -> Schedule:
+    """Assign the ordered tasks to workers, highest rank first whenever a worker is free"""
+    ordered = set(analysis.order)
+    waiting = {task: sum(1 for pred in graph.preds[task] if pred in ordered) for task in analysis.order}
+    succs: Dict[int, List[int]] = {}
+    for task in analysis.order:
+        for pred in graph.preds[task]:
+            succs.setdefault(pred, []).append(task)
+
+    # Ties on rank go to the task that can start earliest, then to document order
+    ready = [(-analysis.rank[task], analysis.earliest[task], task) for task, count in waiting.items() if count == 0]
+    heapq.heapify(ready)
+    idle = list(range(workers - 1, -1, -1))
+    running: List[Tuple[float, int, int]] = []
+    assignments: List[Assignment] = []
+    now = 0.0
+    while ready or running:
+        while ready and idle:
+            _, _, task = heapq.heappop(ready)
+            worker = idle.pop()
+            end = now + graph.tasks[task].days
+            assignments.append(Assignment(task, worker, now, end))
+            heapq.heappush(running, (end, worker, task))
+        if not running:
+            break
+        now = running[0][0]
+        while running and running[0][0] == now:
+            _, worker, task = heapq.heappop(running)
+            idle.append(worker)
+            for succ in succs.get(task, ()):
+                waiting[succ] -= 1
+                if waiting[succ] == 0:
+                    heapq.heappush(ready, (-analysis.rank[succ], analysis.earliest[succ], succ))
+        idle.sort(reverse=True)
+
+    work = sum(graph.tasks[task].days for task in analysis.order)
+    makespan = max((assignment.end for assignment in assignments), default=0.0)
+    return Schedule(workers, assignments, makespan, max(analysis.length, work / workers))
+
+def prerequisites(graph: TaskGraph, features: Iterable[str]) -> TaskGraph:
+    """The tasks of the given features and every task they depend on, directly or not"""
+    wanted = set(features)
+    keep = set()
+    stack = [task for task, found in enumerate(graph.tasks) if found.feature in wanted]
+    while stack:
+        task = stack.pop()
+        if task not in keep:
+            keep.add(task)
+            stack.extend(graph.preds[task])
+    kept = sorted(keep)
+    position = {task: number for number, task in enumerate(kept)}
+    problems = [problem for problem in graph.problems if problem.split(":", 1)[0] in wanted]
+    return TaskGraph([graph.tasks[task] for task in kept],
+                     [[position[pred] for pred in graph.preds[task]] for task in kept], problems)
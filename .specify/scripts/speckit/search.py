@@ -0,0 +1,312 @@
+"""
+Full-text search over spec.md, plan.md and tasks.md (generate_all_docs.py search)
+
+Every document is split at its markdown headings (outside code fences) and
+each section becomes one row of an SQLite FTS5 table in
+.specify/cache/search.sqlite, with three columns:
+
+    heading   the section's heading, e.g. "Functional Requirements"
+    fields    FR-### requirement lines and Key Entity bullets
+    body      everything else
+
+FTS5 keeps the inverted index (porter-stemmed, so "pacing" finds "paced")
+and ranks with BM25; the columns are weighted by COLUMN_WEIGHTS, so a term
+in a heading or a requirement counts more than the same term in prose.
+A feature's score is the sum of its matching sections' scores, and its
+best section supplies the highlighted snippet.
+
+Lines of plan.md and tasks.md that appear as they are in the generator's
+templates (template_lines()) are not indexed: they are the same in every
+generated doc, so common stems would match every feature ("attribution"
+finds "Accessible (ARIA attributes)" in each tasks.md). Such a heading
+still starts a section and is shown with its hits, but is not searched.
+Most generated docs predate the manifest, so the lines are recognized by
+their text rather than by which docs the generator owns. The index is
+rebuilt when the templates' lines change.
+
+refresh() works like SpecIndex.refresh(): one stat() per document, a hash
+only when size/mtime changed, and only documents whose content changed are
+re-split and re-indexed. The database is opened with a large mmap_size,
+so index pages are read through the page cache by memory mapping instead
+of read() calls and a cold query touches only the pages it needs.
+"""
+
+import re
+import sqlite3
+from pathlib import Path
+from typing import Dict, FrozenSet, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from speckit.manifest import sha256_bytes
+
+SCHEMA_VERSION = 2
+
+DOCS = ("spec.md", "plan.md", "tasks.md")
+
+# Documents the generator writes, whose template lines are not indexed
+GENERATED_DOCS = ("plan.md", "tasks.md")
+
+# bm25() weights of the heading, fields and body columns
+COLUMN_WEIGHTS = (5.0, 3.0, 1.0)
+
+MMAP_SIZE = 256 * 1024 * 1024
+
+SCHEMA = """
+CREATE TABLE documents (
+    feature TEXT NOT NULL,
+    doc TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    sha256 TEXT NOT NULL,
+    PRIMARY KEY (feature, doc)
+);
+CREATE TABLE sections (
+    id INTEGER PRIMARY KEY,
+    feature TEXT NOT NULL,
+    doc TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    -- as shown, even when the indexed heading is left empty as template text
+    heading TEXT NOT NULL
+);
+CREATE TABLE settings (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE INDEX sections_document ON sections(feature, doc);
+CREATE VIRTUAL TABLE section_text USING fts5(heading, fields, body, tokenize = 'porter unicode61');
+"""
+
+HEADING_RE = re.compile(r'^#{1,6}\s+(.*?)\s*#*\s*$')
+FIELD_RE = re.compile(r'^\s*- \*\*(?:FR-\d+|\w+)\*\*:')
+FENCE = "```"
+QUERY_TERM_RE = re.compile(r'\w+\*?')
+TEMPLATE_TAGS = ("{{", "{%", "{#", "#}")
+
+class Section(NamedTuple):
+    """A heading and the text up to the next heading"""
+    heading: str
+    fields: str
+    body: str
+    # The heading as shown; heading is empty when it is template text
+    title: str = ""
+
+class Hit(NamedTuple):
+    """One feature matching a search, with its best section"""
+    feature: str
+    score: float
+    sections: int
+    doc: str
+    heading: str
+    snippet: str
+
+def template_lines(templates: Iterable[Path]) -> FrozenSet[str]:
+    """The lines of the templates without tags or comments, stripped: text every generated doc has"""
+    lines = set()
+    for template in templates:
+        try:
+            text = template.read_text()
+        except FileNotFoundError:
+            continue
+        lines.update(line.strip() for line in text.splitlines() if not any(tag in line for tag in TEMPLATE_TAGS))
+    lines.discard("")
+    return frozenset(lines)
+
+def split_sections(text: str, skip: FrozenSet[str] = frozenset()) -> List[Section]:
+    """Split a markdown document at its headings.
+
+    Text before the first heading is a section with an empty heading.
+    Requirement lines (- **FR-001**: ...) and Key Entity bullets
+    (- **Name**: ...) go to the fields column. Lines in skip (stripped)
+    are left out, and a heading in skip is kept as the title only.
+    """
+    sections = []
+    title, title_line, fields, body = "", "", [], []
+    in_fence = False
+
+    def section() -> Section:
+        heading = "" if title_line.strip() in skip else title
+        return Section(heading, "\n".join(fields), "\n".join(body), title)
+
+    for line in text.splitlines():
+        if line.lstrip().startswith(FENCE):
+            in_fence = not in_fence
+        elif not in_fence and line.startswith("#"):
+            match = HEADING_RE.match(line)
+            if match:
+                if title or fields or body:
+                    sections.append(section())
+                # "Requirements *(mandatory)*" -> "Requirements"
+                title, title_line, fields, body = match.group(1).split(" *(", 1)[0], line, [], []
+                continue
+        if skip and line.strip() in skip:
+            continue
+        if not in_fence and FIELD_RE.match(line) and (line.lstrip().startswith("- **FR-")
+                                                      or title.startswith("Key Entities")):
+            fields.append(line)
+        else:
+            body.append(line)
+    if title or fields or body:
+        sections.append(section())
+    return sections
+
+def match_expression(query: str, any_term: bool = False) -> Optional[str]:
+    """Turn free text into an FTS5 query: quoted terms (trailing * = prefix), AND or OR"""
+    terms = []
+    for term in QUERY_TERM_RE.findall(query):
+        prefix = term.endswith("*")
+        word = term.rstrip("*")
+        if word:
+            terms.append(f'"{word}"' + ("*" if prefix else ""))
+    if not terms:
+        return None
+    return (" OR " if any_term else " ").join(terms)
+
+class SearchIndex:
+    """Incrementally maintained full-text index of every feature's documents"""
+
+    def __init__(self, path: Path, skip: FrozenSet[str] = frozenset()):
+        """skip: the template_lines() left out of generated docs"""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.skip = skip
+        self.db = sqlite3.connect(str(path))
+        self.db.execute(f"PRAGMA mmap_size = {MMAP_SIZE}")
+        self.db.execute("PRAGMA journal_mode = WAL")
+        skip_sha = sha256_bytes("\n".join(sorted(skip)).encode())
+        if self.db.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            self._reset(skip_sha)
+        elif self.db.execute("SELECT value FROM settings WHERE key = 'skip'").fetchone() != (skip_sha,):
+            # Other template lines: every generated doc would be split differently
+            self._reset(skip_sha)
+
+    def _reset(self, skip_sha: str):
+        with self.db:
+            for table in ("section_text", "sections", "documents", "settings"):
+                self.db.execute(f"DROP TABLE IF EXISTS {table}")
+            self.db.executescript(SCHEMA)
+            self.db.execute("INSERT INTO settings (key, value) VALUES ('skip', ?)", (skip_sha,))
+            self.db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self) -> "SearchIndex":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def refresh(self, spec_dirs: Iterable[Path]) -> Dict[str, int]:
+        """Bring the index up to date with the documents of spec_dirs (the whole tree)"""
+        known = {
+            (feature, doc): (size, mtime_ns, sha)
+            for feature, doc, size, mtime_ns, sha in self.db.execute(
+                "SELECT feature, doc, size, mtime_ns, sha256 FROM documents")
+        }
+        counts = {"indexed": 0, "unchanged": 0, "removed": 0}
+        seen = set()
+
+        with self.db:
+            for spec_dir in spec_dirs:
+                for doc in DOCS:
+                    key = (spec_dir.name, doc)
+                    path = spec_dir / doc
+                    try:
+                        st = path.stat()
+                    except (FileNotFoundError, NotADirectoryError):
+                        continue
+                    seen.add(key)
+                    recorded = known.get(key)
+                    if recorded and recorded[:2] == (st.st_size, st.st_mtime_ns):
+                        counts["unchanged"] += 1
+                        continue
+                    data = path.read_bytes()
+                    sha = sha256_bytes(data)
+                    if recorded and recorded[2] == sha:
+                        self.db.execute(
+                            "UPDATE documents SET size = ?, mtime_ns = ? WHERE feature = ? AND doc = ?",
+                            (st.st_size, st.st_mtime_ns, *key),
+                        )
+                        counts["unchanged"] += 1
+                        continue
+                    text = data.decode("utf-8", errors="replace")
+                    sections = split_sections(text, self.skip if doc in GENERATED_DOCS else frozenset())
+                    self._store(key, sections, st.st_size, st.st_mtime_ns, sha)
+                    counts["indexed"] += 1
+
+            for key in known.keys() - seen:
+                self._delete(key)
+                counts["removed"] += 1
+        return counts
+
+    def _delete(self, key: Tuple[str, str]):
+        self.db.execute(
+            "DELETE FROM section_text WHERE rowid IN (SELECT id FROM sections WHERE feature = ? AND doc = ?)", key)
+        self.db.execute("DELETE FROM sections WHERE feature = ? AND doc = ?", key)
+        self.db.execute("DELETE FROM documents WHERE feature = ? AND doc = ?", key)
+
+    def _store(self, key: Tuple[str, str], sections: List[Section], size: int, mtime_ns: int, sha: str):
+        self._delete(key)
+        self.db.execute(
+            "INSERT INTO documents (feature, doc, size, mtime_ns, sha256) VALUES (?, ?, ?, ?, ?)",
+            (*key, size, mtime_ns, sha),
+        )
+        for position, section in enumerate(sections):
+            cursor = self.db.execute(
+                "INSERT INTO sections (feature, doc, position, heading) VALUES (?, ?, ?, ?)",
+                (*key, position, section.title),
+            )
+            self.db.execute(
+                "INSERT INTO section_text (rowid, heading, fields, body) VALUES (?, ?, ?, ?)",
+                (cursor.lastrowid, section.heading, section.fields, section.body),
+            )
+
+    def search(
+        self,
+        query: str,
+        limit: int = 10,
+        any_term: bool = False,
+        highlight: Tuple[str, str] = ("[", "]"),
+    ) -> Tuple[List[Hit], int]:
+        """Return the best-ranked features for query and the number of features matching.
+
+        Raises ValueError for a query without searchable terms.
+        """
+        expression = match_expression(query, any_term)
+        if expression is None:
+            raise ValueError(f"No searchable terms in '{query}'")
+        weights = ", ".join(map(str, COLUMN_WEIGHTS))
+        # Rank on scores alone and build snippets only for the features shown;
+        # bm25() is negative, more negative = better
+        # [total score, sections, best score, best section's rowid] per feature
+        totals: Dict[str, List] = {}
+        for feature, rowid, score in self.db.execute(
+            f"SELECT s.feature, t.rowid, bm25(section_text, {weights}) "
+            "FROM section_text t JOIN sections s ON s.id = t.rowid WHERE section_text MATCH ?",
+            (expression,),
+        ):
+            total = totals.get(feature)
+            if total is None:
+                totals[feature] = [-score, 1, -score, rowid]
+                continue
+            total[0] -= score
+            total[1] += 1
+            if -score > total[2]:
+                total[2:] = [-score, rowid]
+        ranked = sorted(totals.items(), key=lambda item: (-item[1][0], item[0]))
+        hits = []
+        for feature, (score, sections, _, rowid) in ranked[:limit]:
+            doc, heading, snippet = self.db.execute(
+                "SELECT s.doc, s.heading, snippet(section_text, -1, ?, ?, '…', 16) "
+                "FROM section_text t JOIN sections s ON s.id = t.rowid "
+                "WHERE section_text MATCH ? AND t.rowid = ?",
+                (*highlight, expression, rowid),
+            ).fetchone()
+            hits.append(Hit(feature, score, sections, doc, heading, " ".join(snippet.split())))
+        return hits, len(ranked)
+
+def iter_hits_text(hits: List[Hit]) -> Iterator[str]:
+    """Human-readable lines for search results"""
+    for rank, hit in enumerate(hits, 1):
+        location = f"{hit.doc} › {hit.heading}" if hit.heading else hit.doc
+        yield f"{rank:>2}. {hit.feature}  (score {hit.score:.1f}, {hit.sections} section(s))"
+        yield f"    {location}: {hit.snippet}"
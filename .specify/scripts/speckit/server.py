@@ -0,0 +1,154 @@
+"""
+JSON-RPC over a Unix socket (generate_all_docs.py serve, speckit_client.py)
+
+Editors and agents call the generator per feature, often several times a
+minute. Each fresh process pays interpreter start-up, imports, the specs/
+scan, template compilation and spec parsing before doing a millisecond of
+useful work. `serve` does that set-up once and answers requests on
+.specify/cache/speckit.sock. Each request and each response is one line
+of JSON-RPC 2.0:
+
+    -> {"jsonrpc": "2.0", "id": 1, "method": "parse", "params": {"feature": "001"}}
+    <- {"jsonrpc": "2.0", "id": 1, "result": {...}}
+
+Each connection has its own thread, so a client that stays connected
+does not hold up the others. A connection may send several requests in
+a row. Requests still run one at a time, under a lock, so handlers never
+race on the warm caches, the manifest or the index.
+
+call() is the client half. It only imports socket and json, so a client
+starts in a few milliseconds. It raises ServerUnavailable when no server
+is listening, and the caller then runs the request in process instead.
+"""
+
+import json
+import os
+import socket
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+# JSON-RPC 2.0 error codes
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+SERVER_ERROR = -32000
+
+CALL_TIMEOUT = 60.0
+
+class ServerUnavailable(Exception):
+    """Raised by call() when nothing is listening on the socket"""
+
+class RPCError(Exception):
+    """An error response, raised by call() and by handlers"""
+
+    def __init__(self, code: int, message: str):
+        super().__init__(message)
+        self.code = code
+
+def _response(request_id: Any, result: Any = None, error: Optional[RPCError] = None) -> bytes:
+    message: Dict[str, Any] = {"jsonrpc": "2.0", "id": request_id}
+    if error is None:
+        message["result"] = result
+    else:
+        message["error"] = {"code": error.code, "message": str(error)}
+    return json.dumps(message, ensure_ascii=False).encode("utf-8") + b"\n"
+
+def handle_line(line: bytes, dispatch: Callable[[str, Dict[str, Any]], Any]) -> bytes:
+    """Answer one request line; dispatch(method, params) returns the result or raises RPCError"""
+    try:
+        request = json.loads(line)
+    except ValueError as e:
+        return _response(None, error=RPCError(PARSE_ERROR, f"invalid JSON: {e}"))
+    if not isinstance(request, dict) or not isinstance(request.get("method"), str):
+        return _response(None, error=RPCError(INVALID_REQUEST, "expected an object with a method"))
+    request_id = request.get("id")
+    params = request.get("params") or {}
+    if not isinstance(params, dict):
+        return _response(request_id, error=RPCError(INVALID_PARAMS, "params must be an object"))
+    try:
+        return _response(request_id, dispatch(request["method"], params))
+    except RPCError as e:
+        return _response(request_id, error=e)
+    except Exception as e:
+        return _response(request_id, error=RPCError(SERVER_ERROR, f"{type(e).__name__}: {e}"))
+
+def is_listening(path: Path) -> bool:
+    """Whether a server accepts connections on path"""
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(str(path))
+        return True
+    except OSError:
+        return False
+
+def serve(path: Path, dispatch: Callable[[str, Dict[str, Any]], Any], ready: Optional[Callable[[], None]] = None):
+    """Answer requests on the Unix socket at path until interrupted.
+
+    A socket file left behind by a server that died is replaced; raises
+    OSError if another server is already listening there.
+    """
+    # Imported on use, so clients do not pay for them
+    import socketserver
+    import threading
+
+    if is_listening(path):
+        raise OSError(f"a server is already listening on {path}")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        path.unlink()
+    except FileNotFoundError:
+        pass
+
+    lock = threading.Lock()
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            for line in self.rfile:
+                if line.strip():
+                    with lock:
+                        response = handle_line(line, dispatch)
+                    self.wfile.write(response)
+                    self.wfile.flush()
+
+    class Server(socketserver.ThreadingUnixStreamServer):
+        # Connections left open do not keep the process alive on Ctrl-C
+        daemon_threads = True
+
+    with Server(str(path), Handler) as server:
+        os.chmod(path, 0o600)
+        if ready:
+            ready()
+        try:
+            server.serve_forever()
+        finally:
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+
+def call(path: Path, method: str, params: Optional[Dict[str, Any]] = None, timeout: float = CALL_TIMEOUT) -> Any:
+    """Send one request and return its result.
+
+    Raises ServerUnavailable if no server is listening on path, and
+    RPCError for an error response.
+    """
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(timeout)
+        try:
+            sock.connect(str(path))
+        except (FileNotFoundError, ConnectionRefusedError) as e:
+            raise ServerUnavailable(str(e)) from None
+        request = {"jsonrpc": "2.0", "id": 1, "method": method, "params": params or {}}
+        sock.sendall(json.dumps(request).encode("utf-8") + b"\n")
+        with sock.makefile("rb") as reader:
+            line = reader.readline()
+    finally:
+        sock.close()
+    if not line:
+        raise RPCError(SERVER_ERROR, "the server closed the connection without answering")
+    response = json.loads(line)
+    if "error" in response:
+        raise RPCError(response["error"]["code"], response["error"]["message"])
+    return response["result"]
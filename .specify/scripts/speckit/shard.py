@@ -0,0 +1,101 @@
+"""
+Sharded generation across CI runners (--shard i/N, merge-results)
+
+Every feature directory belongs to exactly one of N shards, chosen by a
+hash of its name: blake2b, not Python's hash(), which is salted per
+process. Runners that check out the same tree therefore agree on the
+partition without talking to each other. A feature keeps its shard when
+other features are added or removed, so a runner's cache stays warm
+across commits.
+
+Each shard run writes its stats and metrics with --metrics-json, and
+merge-results folds those files into the summary of a single
+unsharded run. Counters and phase times are summed. The merged wall
+time is the slowest shard's, which is what the fanned-out run took.
+"""
+
+import json
+from hashlib import blake2b
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, NamedTuple
+
+from speckit.metrics import RunMetrics
+
+class Shard(NamedTuple):
+    """Shard index (1-based, as in --shard 2/4) out of count"""
+    index: int
+    count: int
+
+    def __str__(self) -> str:
+        return f"{self.index}/{self.count}"
+
+    def owns(self, feature: str) -> bool:
+        return shard_of(feature, self.count) == self.index
+
+class MergedResults(NamedTuple):
+    """The combined --metrics-json files of a sharded run"""
+    stats: Dict[str, int]
+    # Spec index counts (parsed, unchanged, removed)
+    indexed: Dict[str, int]
+    exports: List[str]
+    metrics: RunMetrics
+    # Missing, repeated or mismatched shards
+    problems: List[str]
+
+def parse_shard(value: str) -> Shard:
+    """Parse 'i/N'; raises ValueError unless 1 <= i <= N"""
+    try:
+        index, count = (int(part) for part in value.split("/"))
+    except ValueError:
+        raise ValueError(f"invalid shard '{value}' (expected i/N, e.g. 1/4)") from None
+    if not 1 <= index <= count:
+        raise ValueError(f"invalid shard '{value}' (need 1 <= i <= N)")
+    return Shard(index, count)
+
+def shard_of(feature: str, count: int) -> int:
+    """The 1-based shard a feature directory name belongs to"""
+    digest = blake2b(feature.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big") % count + 1
+
+def merge_results(paths: Iterable[Path]) -> MergedResults:
+    """Combine per-shard --metrics-json files.
+
+    Stats, spec index counts and metrics are summed. A missing or repeated
+    shard, or files written with different shard counts, are reported as
+    problems. Raises ValueError for a file that is not a shard's metrics file.
+    """
+    stats: Dict[str, int] = {}
+    indexed: Dict[str, int] = {}
+    exports: List[str] = []
+    metrics = RunMetrics()
+    metrics.wall = 0.0
+    seen: Dict[int, Path] = {}
+    counts = set()
+    problems = []
+    for path in paths:
+        try:
+            with open(path) as f:
+                data: Dict[str, Any] = json.load(f)
+            shard = parse_shard(data["shard"])
+            shard_stats, shard_indexed = dict(data["stats"]), dict(data["indexed"])
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            raise ValueError(f"{path}: not a shard's --metrics-json file ({e})") from None
+        counts.add(shard.count)
+        if shard.index in seen:
+            problems.append(f"shard {shard} appears twice ({seen[shard.index]}, {path})")
+            continue
+        seen[shard.index] = path
+        for key, value in shard_stats.items():
+            stats[key] = stats.get(key, 0) + value
+        for key, value in shard_indexed.items():
+            indexed[key] = indexed.get(key, 0) + value
+        exports.extend(name for name in data.get("exports", []) if name not in exports)
+        metrics.merge(RunMetrics.from_dict(data))
+    if len(counts) > 1:
+        problems.append(f"files come from different shard counts ({', '.join(map(str, sorted(counts)))})")
+    elif counts:
+        count = counts.pop()
+        missing = [str(Shard(i, count)) for i in range(1, count + 1) if i not in seen]
+        if missing:
+            problems.append(f"missing shard(s) {', '.join(missing)}")
+    return MergedResults(stats, indexed, exports, metrics, problems)
@@ -0,0 +1,244 @@
+"""
+Compiled templates for generated docs
+
+Templates are plain markdown with a deliberately small syntax:
+
+    {{ name }}                 value from the render context
+    {{ story.title|lower }}    dict key / attribute lookup, then filters
+                               (lower, upper, escape)
+    {% for x in items %}       loop (closed by {% endfor %})
+    {% if value %}             conditional ({% else %} optional, {% endif %})
+    {% fragment entity %}      block rendered once per value of entity and
+                               then reused (closed by {% endfragment %})
+    {# comment #}              dropped from the output
+
+A block tag or comment that is alone on its line removes the whole line,
+so templates can be laid out like the documents they produce.
+
+Each template is compiled once into a Python render function that appends
+to a single list and joins it at the end, or hands each chunk to a write
+callback instead (render(context, write)), so a caller can stream a large
+document to disk. Compiled templates are cached per process and recompiled
+only when the file's mtime changes.
+
+Fragments are for blocks repeated verbatim across documents, such as the
+TypeORM snippet for an entity named Config that dozens of features
+declare. A fragment body may only refer to its key variable (the compiler
+enforces this), so its output depends on nothing but the key's value and
+the template text. Each fragment compiles to its own function behind a
+bounded functools.lru_cache keyed on the key's value; a new template
+version compiles to new functions with empty caches, so an edited template
+never serves stale text. The caches live as long as the compiled template
+in each process, so a pool worker reuses them for every feature it
+renders; fragment_counts() sums their hits and misses for --timings and
+--metrics-json.
+"""
+
+import html
+import os
+import re
+import weakref
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+FILTERS: Dict[str, Callable[[Any], Any]] = {
+    "lower": lambda value: str(value).lower(),
+    "upper": lambda value: str(value).upper(),
+    "escape": lambda value: html.escape(str(value)),
+}
+
+TOKEN_RE = re.compile(r'{{(.*?)}}|{%(.*?)%}|{#.*?#}', re.DOTALL)
+NAME_RE = re.compile(r'[A-Za-z_][A-Za-z0-9_]*$')
+
+# Rendered values kept per fragment; a plan's entity block is ~600 bytes
+FRAGMENT_CACHE_SIZE = 1024
+
+# The lru_cache-wrapped fragment functions of every live compiled template
+_FRAGMENTS: "weakref.WeakSet[Any]" = weakref.WeakSet()
+
+class TemplateError(ValueError):
+    """Raised when a template cannot be compiled or rendered"""
+
+def fragment_counts() -> Dict[str, int]:
+    """Total fragment cache hits and misses in this process"""
+    infos = [fragment.cache_info() for fragment in list(_FRAGMENTS)]
+    return {"hits": sum(info.hits for info in infos), "misses": sum(info.misses for info in infos)}
+
+def _lookup(value: Any, key: str) -> Any:
+    """Resolve one dotted segment against a dict or object"""
+    if isinstance(value, dict):
+        return value[key]
+    return getattr(value, key)
+
+class _Compiler:
+    """Translates template source into the source of a Python render function"""
+
+    def __init__(self, source: str, name: str):
+        self.source = source
+        self.name = name
+        self.lines: List[str] = []
+        self.indent = 1
+        self.scopes: List[Dict[str, str]] = []
+        self.blocks: List[Tuple[str, int]] = []
+        # Finished fragment functions, and the state saved while one is open:
+        # (key variable, scope depth, enclosing lines, indent, key expression)
+        self.functions: List[List[str]] = []
+        self.fragment: Optional[Tuple[str, int, List[str], int, str]] = None
+
+    def error(self, message: str, pos: int) -> TemplateError:
+        line = self.source.count("\n", 0, pos) + 1
+        return TemplateError(f"{self.name}:{line}: {message}")
+
+    def emit(self, code: str):
+        self.lines.append("    " * self.indent + code)
+
+    def expression(self, text: str, pos: int) -> str:
+        """Compile `name.attr|filter` into a Python expression"""
+        parts = [part.strip() for part in text.split("|")]
+        path = parts[0].split(".")
+        for segment in path + parts[1:]:
+            if not NAME_RE.match(segment):
+                raise self.error(f"invalid expression {text.strip()!r}", pos)
+
+        head = path[0]
+        if self.fragment is not None and head != self.fragment[0] \
+                and not any(head in scope for scope in self.scopes[self.fragment[1]:]):
+            raise self.error(f"fragment body may only use {self.fragment[0]!r}, not {head!r}", pos)
+        for scope in reversed(self.scopes):
+            if head in scope:
+                code = scope[head]
+                break
+        else:
+            code = f"_ctx[{head!r}]"
+        for segment in path[1:]:
+            code = f"_lookup({code}, {segment!r})"
+        for name in parts[1:]:
+            if name not in FILTERS:
+                raise self.error(f"unknown filter {name!r}", pos)
+            code = f"_filters[{name!r}]({code})"
+        return code
+
+    def tag(self, text: str, pos: int):
+        words = text.split()
+        keyword = words[0] if words else ""
+        if keyword == "for" and len(words) == 4 and words[2] == "in" and NAME_RE.match(words[1]):
+            var = f"_v{len(self.blocks)}_{words[1]}"
+            self.emit(f"for {var} in {self.expression(words[3], pos)}:")
+            self.scopes.append({words[1]: var})
+            self.blocks.append(("for", pos))
+            self.indent += 1
+        elif keyword == "if" and len(words) == 2:
+            self.emit(f"if {self.expression(words[1], pos)}:")
+            self.scopes.append({})
+            self.blocks.append(("if", pos))
+            self.indent += 1
+        elif keyword == "fragment" and len(words) == 2 and NAME_RE.match(words[1]):
+            if self.fragment is not None:
+                raise self.error("fragments cannot be nested", pos)
+            key = self.expression(words[1], pos)
+            self.fragment = (words[1], len(self.scopes) + 1, self.lines, self.indent, key)
+            self.lines = [f"def _fragment{len(self.functions)}(_key):", "    _out = []", "    _write = _out.append"]
+            self.indent = 1
+            self.scopes.append({words[1]: "_key"})
+            self.blocks.append(("fragment", pos))
+        elif keyword == "else" and len(words) == 1:
+            if not self.blocks or self.blocks[-1][0] != "if":
+                raise self.error("else outside if", pos)
+            self.emit("pass")
+            self.indent -= 1
+            self.emit("else:")
+            self.indent += 1
+            self.blocks[-1] = ("else", pos)
+        elif keyword == "endfragment" and len(words) == 1:
+            if not self.blocks or self.blocks[-1][0] != "fragment":
+                raise self.error("unexpected endfragment", pos)
+            self.lines.append("    return ''.join(_out)")
+            self.functions.append(self.lines)
+            _, _, self.lines, self.indent, key = self.fragment
+            self.fragment = None
+            self.emit(f"_write(_fragment{len(self.functions) - 1}({key}))")
+            self.blocks.pop()
+            self.scopes.pop()
+        elif keyword in ("endfor", "endif") and len(words) == 1:
+            expected = ("for",) if keyword == "endfor" else ("if", "else")
+            if not self.blocks or self.blocks[-1][0] not in expected:
+                raise self.error(f"unexpected {keyword}", pos)
+            self.emit("pass")
+            self.blocks.pop()
+            self.scopes.pop()
+            self.indent -= 1
+        else:
+            raise self.error(f"unknown tag {{% {text.strip()} %}}", pos)
+
+    def compile(self) -> str:
+        source = self.source
+        self.lines = ["def render(_ctx, _write=None):", "    _out = []", "    if _write is None:",
+                      "        _write = _out.append"]
+        pos = 0
+        for match in TOKEN_RE.finditer(source):
+            start, end = match.start(), match.end()
+            if match.group(1) is None:
+                # A block tag or comment alone on its line swallows the line
+                line_start = source.rfind("\n", 0, start) + 1
+                line_end = source.find("\n", end)
+                line_end = len(source) if line_end == -1 else line_end + 1
+                if line_start >= pos and not source[line_start:start].strip(" \t") \
+                        and not source[end:line_end].strip(" \t\n"):
+                    start, end = line_start, line_end
+            if start > pos:
+                self.emit(f"_write({source[pos:start]!r})")
+            if match.group(1) is not None:
+                self.emit(f"_write(str({self.expression(match.group(1), match.start())}))")
+            elif match.group(2) is not None:
+                self.tag(match.group(2), match.start())
+            pos = end
+        if pos < len(source):
+            self.emit(f"_write({source[pos:]!r})")
+        if self.blocks:
+            kind, start = self.blocks[-1]
+            raise self.error(f"unclosed {kind} block", start)
+        self.lines.append("    return ''.join(_out)")
+        return "\n".join(line for function in (*self.functions, self.lines) for line in function) + "\n"
+
+def compile_template(source: str, name: str = "<template>") -> Callable[..., str]:
+    """Compile template source into a render(context, write=None) -> str function.
+
+    With write, chunks are passed to it as they are produced and "" is returned.
+    """
+    compiler = _Compiler(source, name)
+    code = compiler.compile()
+    namespace = {"_lookup": _lookup, "_filters": FILTERS}
+    exec(compile(code, name, "exec"), namespace)
+    for i in range(len(compiler.functions)):
+        # render() looks the fragment up in its globals, so it gets the cached one
+        cached = lru_cache(maxsize=FRAGMENT_CACHE_SIZE)(namespace[f"_fragment{i}"])
+        namespace[f"_fragment{i}"] = cached
+        _FRAGMENTS.add(cached)
+    render = namespace["render"]
+
+    def render_checked(context: Dict[str, Any], write: Optional[Callable[[str], Any]] = None) -> str:
+        try:
+            return render(context, write)
+        except (KeyError, AttributeError, TypeError) as e:
+            raise TemplateError(f"{name}: cannot render: {e!r}") from e
+
+    return render_checked
+
+# path -> (mtime_ns, render function)
+_CACHE: Dict[Path, Tuple[int, Callable[..., str]]] = {}
+
+def load_template(path: Path) -> Callable[..., str]:
+    """Return the compiled render function for a template file, recompiling if it changed"""
+    mtime = os.stat(path).st_mtime_ns
+    cached = _CACHE.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    with open(path, 'r') as f:
+        render = compile_template(f.read(), str(path))
+    _CACHE[path] = (mtime, render)
+    return render
+
+def render_template(path: Path, context: Dict[str, Any], write: Optional[Callable[[str], Any]] = None) -> str:
+    """Render a template file with the given context (into write, if given)"""
+    return load_template(path)(context, write)
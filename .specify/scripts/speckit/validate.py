@@ -0,0 +1,220 @@
+"""
+Spec compliance checks (generate_all_docs.py validate)
+
+Each feature is checked in one pass over its three documents, using the
+same parser as the generator:
+
+    files        spec.md, plan.md and tasks.md exist and are not empty
+    headings     spec.md has the mandatory headings of spec-template.md
+    branch       the **Feature Branch** number matches the directory number
+    requirements Functional Requirements lists at least one FR-### entry
+    entities     a Key Entities section lists at least one - **Name** entry
+                 and no template placeholders
+    consistency  every Key Entity is mentioned in plan.md and tasks.md
+
+Key Entities are read section by section here rather than with the
+generator's rule (which needs a blank line before the first bullet), so
+bullets directly under the heading count too.
+
+Errors fail validation; warnings (placeholder branches and Key Entities,
+entities missing from plan/tasks) are reported but only fail with
+strict=True.
+"""
+
+import re
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from speckit.parser import parse_spec_text
+from speckit.scan import FeatureScan
+from speckit.stream import process_pool
+
+ERROR = "error"
+WARNING = "warning"
+
+RESULTS_VERSION = 1
+
+# Mandatory headings of spec-template.md, matched after dropping the
+# "*(mandatory)*" style suffix
+REQUIRED_HEADINGS = (
+    "# Feature Specification:",
+    "## User Scenarios & Testing",
+    "## Requirements",
+    "### Functional Requirements",
+    "## Success Criteria",
+)
+
+HEADING_RE = re.compile(r'^#[^\n]*', re.M)
+BRANCH_LINE_RE = re.compile(r'^\*\*Feature Branch\*\*(?:: `\[?([^`\]\n]*))?', re.M)
+# "- **Name**: ..." or "- **Name** (new): ..."
+ENTITY_BULLET_RE = re.compile(r'^- \*\*([^*\n]+)\*\*', re.M)
+NUMBER_RE = re.compile(r'(\d+)-')
+
+# Below this many features per worker a pool costs more than it saves
+MIN_FEATURES_PER_JOB = 100
+
+class SpecCheck(NamedTuple):
+    """The spec.md part of a feature's result, valid as long as spec.md is unchanged"""
+    issues: Tuple[Dict[str, str], ...]
+    # Key Entity names, checked against plan.md and tasks.md; None when spec.md is empty
+    entities: Optional[List[str]]
+
+def _issue(check: str, severity: str, message: str) -> Dict[str, str]:
+    return {"check": check, "severity": severity, "message": message}
+
+def _read(feature: FeatureScan, name: str, present: bool, issues: List[Dict[str, str]]) -> Optional[str]:
+    """Return a document's text, recording a files issue if it is missing or empty"""
+    if not present:
+        issues.append(_issue("files", ERROR, f"{name} is missing"))
+        return None
+    with open(feature.path / name, 'r') as f:
+        content = f.read()
+    if not content.strip():
+        issues.append(_issue("files", ERROR, f"{name} is empty"))
+        return None
+    return content
+
+def check_spec_text(
+    dir_name: str,
+    content: str,
+    issues: List[Dict[str, str]],
+    requirements: Optional[Sequence[str]] = None,
+) -> List[str]:
+    """Run the spec.md checks, append issues and return the Key Entity names.
+
+    requirements are the FR-### entries when the caller has parsed them
+    already; otherwise they are parsed from content.
+    """
+    headings = set()
+    entities = []
+    matches = list(HEADING_RE.finditer(content))
+    for i, match in enumerate(matches):
+        heading = match.group().split(" *(", 1)[0].rstrip()
+        headings.add(heading)
+        if heading == "### Key Entities":
+            end = matches[i + 1].start() if i + 1 < len(matches) else len(content)
+            entities.extend(ENTITY_BULLET_RE.findall(content, match.end(), end))
+
+    match = BRANCH_LINE_RE.search(content)
+    branch = None if match is None else (match.group(1) or "").strip()
+
+    for required in REQUIRED_HEADINGS:
+        if required.endswith(":"):
+            found = any(heading.startswith(required) for heading in headings)
+        else:
+            found = required in headings
+        if not found:
+            issues.append(_issue("headings", ERROR, f"spec.md is missing the '{required}' heading"))
+
+    number = NUMBER_RE.match(dir_name)
+    if branch is None:
+        issues.append(_issue("branch", ERROR, "spec.md has no **Feature Branch** line"))
+    elif branch.startswith("###"):
+        issues.append(_issue("branch", WARNING, f"Feature Branch is still the template placeholder '{branch}'"))
+    elif number:
+        branch_number = NUMBER_RE.match(branch)
+        if not branch_number:
+            issues.append(_issue("branch", WARNING, f"Feature Branch '{branch}' has no feature number"))
+        elif int(branch_number.group(1)) != int(number.group(1)):
+            issues.append(_issue(
+                "branch", ERROR,
+                f"Feature Branch '{branch}' does not match directory number {number.group(1)}",
+            ))
+
+    if requirements is None:
+        requirements = parse_spec_text(content, ("requirements",))["requirements"]
+    if "### Functional Requirements" in headings and not requirements:
+        issues.append(_issue("requirements", ERROR, "Functional Requirements has no - **FR-###**: entries"))
+
+    placeholders = [entity for entity in entities if entity.startswith("[")]
+    if placeholders:
+        issues.append(_issue(
+            "entities", WARNING,
+            f"Key Entities still has template placeholders: {', '.join(placeholders)}",
+        ))
+        return [entity for entity in entities if not entity.startswith("[")]
+    if "### Key Entities" in headings and not entities:
+        issues.append(_issue("entities", ERROR, "Key Entities has no - **Name** entries"))
+    return entities
+
+def check_spec(dir_name: str, content: str, requirements: Optional[Sequence[str]] = None) -> SpecCheck:
+    """Run the spec.md checks on its content (see check_spec_text())"""
+    issues: List[Dict[str, str]] = []
+    if not content.strip():
+        issues.append(_issue("files", ERROR, "spec.md is empty"))
+        return SpecCheck(tuple(issues), None)
+    entities = check_spec_text(dir_name, content, issues, requirements)
+    return SpecCheck(tuple(issues), entities)
+
+def validate_feature(feature: FeatureScan, spec_check: Optional[SpecCheck] = None) -> Dict[str, Any]:
+    """Check one feature directory and return its result record.
+
+    spec_check is check_spec() of the current spec.md when the caller has
+    it already (the server keeps one per parsed spec); spec.md is then not
+    read.
+    """
+    issues: List[Dict[str, str]] = []
+    try:
+        if spec_check is None and feature.has_spec:
+            with open(feature.path / "spec.md", 'r') as f:
+                spec_check = check_spec(feature.name, f.read())
+        if spec_check is None:
+            issues.append(_issue("files", ERROR, "spec.md is missing"))
+        elif spec_check.entities is None:
+            issues.extend(spec_check.issues)
+        plan = _read(feature, "plan.md", feature.has_plan, issues)
+        tasks = _read(feature, "tasks.md", feature.has_tasks, issues)
+
+        if spec_check is not None and spec_check.entities is not None:
+            issues.extend(spec_check.issues)
+            entities = spec_check.entities
+            for name, doc in (("plan.md", plan), ("tasks.md", tasks)):
+                if doc is None:
+                    continue
+                # Most entities appear verbatim; only lowercase the doc when one doesn't
+                missing = [entity for entity in entities if entity not in doc]
+                if missing:
+                    lowered = doc.lower()
+                    missing = [entity for entity in missing if entity.lower() not in lowered]
+                if missing:
+                    issues.append(_issue(
+                        "consistency", WARNING,
+                        f"{name} does not mention Key Entities: {', '.join(missing)}",
+                    ))
+    except (OSError, UnicodeDecodeError) as e:
+        issues.append(_issue("files", ERROR, str(e)))
+
+    return {"feature": feature.name, "issues": issues}
+
+def validate_features(features: List[FeatureScan], jobs: int = 1) -> Iterator[Dict[str, Any]]:
+    """Yield validate_feature() results in features order, in a process pool when worthwhile"""
+    jobs = min(jobs, len(features) // MIN_FEATURES_PER_JOB)
+    if jobs <= 1:
+        for feature in features:
+            yield validate_feature(feature)
+        return
+
+    chunksize = max(1, len(features) // (jobs * 4))
+    with process_pool(jobs) as executor:
+        yield from executor.map(validate_feature, features, chunksize=chunksize)
+
+def passed(result: Dict[str, Any], strict: bool = False) -> bool:
+    """Return whether a feature result has no failing issues"""
+    failing = (ERROR, WARNING) if strict else (ERROR,)
+    return not any(issue["severity"] in failing for issue in result["issues"])
+
+def summarize(results: List[Dict[str, Any]], strict: bool = False) -> Dict[str, Any]:
+    """Build the machine-readable report for a validation run"""
+    severities = [issue["severity"] for result in results for issue in result["issues"]]
+    failed = [result["feature"] for result in results if not passed(result, strict)]
+    return {
+        "version": RESULTS_VERSION,
+        "strict": strict,
+        "summary": {
+            "features": len(results),
+            "passed": len(results) - len(failed),
+            "failed": len(failed),
+            "errors": severities.count(ERROR),
+            "warnings": severities.count(WARNING),
+        },
+        "features": results,
+    }
@@ -0,0 +1,230 @@
+"""
+Change notification for specs/ (generate_all_docs.py --watch)
+
+Watchers report which feature directories need another look. On Linux the
+inotify backend (via ctypes, no extra dependencies) watches specs/, every
+feature directory and the generator templates; elsewhere, or when inotify
+is unavailable (e.g. some network filesystems), a polling backend compares
+stat snapshots instead. Both report the same thing: a set of feature
+directory names, or ALL_FEATURES when everything must be rechecked.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+# Sentinel meaning "recheck every feature" (template change, event overflow)
+ALL_FEATURES = "*"
+
+# Generated docs only matter when they disappear; their creation and
+# rewrites are the generator's own doing
+GENERATED_DOCS = ("plan.md", "tasks.md")
+
+# inotify(7) constants
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+FEATURE_MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_MOVED_FROM | IN_CREATE | IN_DELETE | IN_DELETE_SELF
+SPECS_MASK = IN_CREATE | IN_DELETE | IN_MOVED_TO | IN_MOVED_FROM | IN_ONLYDIR
+TEMPLATES_MASK = IN_CLOSE_WRITE | IN_MOVED_TO
+
+EVENT_HEADER = struct.Struct("iIII")
+
+class PollingWatcher:
+    """Detects changes by comparing stat snapshots every `interval` seconds"""
+
+    backend = "polling"
+
+    def __init__(self, specs_dir: Path, extra_files: Iterable[Path] = (), interval: float = 0.5):
+        self.specs_dir = specs_dir
+        self.extra_files = list(extra_files)
+        self.interval = interval
+        self.snapshot, self.extra = self._scan()
+        self.next_poll = time.monotonic() + interval
+
+    @staticmethod
+    def _stat(path: str) -> Optional[Tuple[int, int]]:
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def _scan(self) -> Tuple[Dict[str, tuple], List[Optional[Tuple[int, int]]]]:
+        snapshot = {}
+        with os.scandir(self.specs_dir) as entries:
+            for entry in entries:
+                if entry.is_dir() and not entry.name.startswith('.'):
+                    snapshot[entry.name] = (self._stat(os.path.join(entry.path, "spec.md")),) + tuple(
+                        os.path.exists(os.path.join(entry.path, doc)) for doc in GENERATED_DOCS
+                    )
+        extra = [self._stat(str(path)) for path in self.extra_files]
+        return snapshot, extra
+
+    @staticmethod
+    def _differs(old: Optional[tuple], new: Optional[tuple]) -> bool:
+        if old is None or new is None or old[0] != new[0]:
+            return True
+        # A generated doc appearing is the generator's own write
+        return any(before and not after for before, after in zip(old[1:], new[1:]))
+
+    def read(self, timeout: Optional[float]) -> Set[str]:
+        """Wait up to timeout seconds (None = forever) and return changed features"""
+        while True:
+            now = time.monotonic()
+            wait = max(0.0, self.next_poll - now)
+            if timeout is not None and wait > timeout:
+                time.sleep(timeout)
+                return set()
+            time.sleep(wait)
+            self.next_poll = time.monotonic() + self.interval
+
+            snapshot, extra = self._scan()
+            changed = set()
+            if extra != self.extra:
+                changed.add(ALL_FEATURES)
+            for name in snapshot.keys() | self.snapshot.keys():
+                if self._differs(self.snapshot.get(name), snapshot.get(name)):
+                    changed.add(name)
+            self.snapshot, self.extra = snapshot, extra
+            if changed or timeout is not None:
+                return changed
+
+    def close(self):
+        pass
+
+class InotifyWatcher:
+    """Linux inotify backend: one watch on specs/, one per feature directory"""
+
+    backend = "inotify"
+
+    def __init__(self, specs_dir: Path, extra_files: Iterable[Path] = ()):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self._rm_watch = libc.inotify_rm_watch
+        self._rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+        self.specs_dir = specs_dir
+        self.features: Dict[int, str] = {}
+        self.templates: Dict[int, Set[str]] = {}
+        try:
+            self.specs_wd = self._watch(specs_dir, SPECS_MASK)
+            for path in extra_files:
+                wd = self._watch(path.parent, TEMPLATES_MASK)
+                self.templates.setdefault(wd, set()).add(path.name)
+            with os.scandir(specs_dir) as entries:
+                for entry in entries:
+                    if entry.is_dir() and not entry.name.startswith('.'):
+                        self._watch_feature(entry.name)
+        except OSError:
+            os.close(self.fd)
+            raise
+
+    def _watch(self, path: Path, mask: int) -> int:
+        wd = self._add_watch(self.fd, os.fsencode(str(path)), mask)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, f"inotify_add_watch failed: {os.strerror(errno)}", str(path))
+        return wd
+
+    def _watch_feature(self, name: str):
+        try:
+            self.features[self._watch(self.specs_dir / name, FEATURE_MASK)] = name
+        except FileNotFoundError:
+            pass
+
+    def _unwatch_feature(self, name: str):
+        # A renamed directory keeps its watch, which must not report the old name
+        for wd in [wd for wd, feature in self.features.items() if feature == name]:
+            self._rm_watch(self.fd, wd)
+            del self.features[wd]
+
+    def read(self, timeout: Optional[float]) -> Set[str]:
+        """Wait up to timeout seconds (None = forever) and return changed features"""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return set()
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return set()
+
+        changed = set()
+        offset = 0
+        while offset < len(data):
+            wd, mask, _cookie, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b"\0").decode(errors="replace")
+            offset += length
+
+            if mask & IN_Q_OVERFLOW:
+                changed.add(ALL_FEATURES)
+            elif wd == self.specs_wd:
+                if mask & IN_ISDIR and not name.startswith('.'):
+                    if mask & (IN_CREATE | IN_MOVED_TO):
+                        self._watch_feature(name)
+                    elif mask & IN_MOVED_FROM:
+                        self._unwatch_feature(name)
+                    changed.add(name)
+            elif wd in self.templates:
+                if name in self.templates[wd]:
+                    changed.add(ALL_FEATURES)
+            elif wd in self.features:
+                feature = self.features[wd]
+                if mask & IN_IGNORED:
+                    del self.features[wd]
+                elif mask & IN_DELETE_SELF or name == "spec.md":
+                    changed.add(feature)
+                elif name in GENERATED_DOCS and mask & (IN_DELETE | IN_MOVED_FROM):
+                    changed.add(feature)
+        return changed
+
+    def close(self):
+        os.close(self.fd)
+
+def open_watcher(specs_dir: Path, extra_files: Iterable[Path] = (), poll: bool = False, interval: float = 0.5):
+    """Return an inotify watcher when available, otherwise a polling one"""
+    extra_files = list(extra_files)
+    if not poll:
+        try:
+            return InotifyWatcher(specs_dir, extra_files)
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(specs_dir, extra_files, interval)
+
+def watch(watcher, handle: Callable[[Set[str]], None], debounce: float = 0.05):
+    """Call handle(changed) for every debounced burst of changes until interrupted.
+
+    After the first event, further events are merged into the same batch
+    until the tree has been quiet for `debounce` seconds, so an editor's
+    write/rename/chmod sequence triggers one regeneration.
+    """
+    while True:
+        changed = watcher.read(None)
+        while changed:
+            more = watcher.read(debounce)
+            if not more:
+                break
+            changed |= more
+        if changed:
+            handle(changed)
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Thin client for `generate_all_docs.py serve`
+
+Sends one request to the server on .specify/cache/speckit.sock and prints
+the JSON result. The client only imports socket and json, so with a server
+running a call costs interpreter start-up plus the request. Without a
+server, or with --in-process, the same request runs in this process and
+gives the same result, with cold caches.
+
+Usage:
+    python3 .specify/scripts/speckit_client.py parse FEATURE
+    python3 .specify/scripts/speckit_client.py render FEATURE [--output plan|tasks|html|json|csv]
+    python3 .specify/scripts/speckit_client.py validate [FEATURE...] [--strict]
+    python3 .specify/scripts/speckit_client.py regenerate FEATURE [--force] [--adopt]
+    python3 .specify/scripts/speckit_client.py status
+
+Exits 1 on an error response, a failed validation or a regeneration error.
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from speckit.server import RPCError, ServerUnavailable, call
+
+# generate_all_docs.SOCKET_PATH, without importing the generator
+SOCKET_PATH = Path(__file__).resolve().parent.parent / "cache" / "speckit.sock"
+
+METHODS = ("parse", "render", "validate", "regenerate", "status")
+
+def build_params(args: argparse.Namespace) -> Dict[str, Any]:
+    """The request params for the parsed command line"""
+    if args.method == "status":
+        return {}
+    if args.method == "validate":
+        params: Dict[str, Any] = {"strict": args.strict}
+        if args.features:
+            params["features"] = args.features
+        return params
+    if len(args.features) != 1:
+        raise ValueError(f"{args.method} takes exactly one FEATURE")
+    params = {"feature": args.features[0]}
+    if args.method == "render":
+        params["output"] = args.output
+    if args.method == "regenerate":
+        params["force"] = args.force
+        params["adopt"] = args.adopt
+    return params
+
+def run_in_process(method: str, params: Dict[str, Any]) -> Any:
+    """Answer the request without a server"""
+    from generate_all_docs import SpecService
+    return SpecService().dispatch(method, params)
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Send the request to the server, or run it in process"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("method", choices=METHODS)
+    parser.add_argument("features", nargs="*", metavar="FEATURE", help="feature number or directory name")
+    parser.add_argument("--output", default="plan", help="with render, what to render (default: plan)")
+    parser.add_argument("--force", action="store_true", help="with regenerate, overwrite generated docs")
+    parser.add_argument("--adopt", action="store_true",
+                        help="with regenerate, overwrite and take over docs the generator does not own")
+    parser.add_argument("--strict", action="store_true", help="with validate, fail on warnings too")
+    parser.add_argument("--socket", type=Path, default=SOCKET_PATH, help="server socket")
+    parser.add_argument("--in-process", action="store_true", help="do not contact the server")
+    args = parser.parse_args(argv)
+    try:
+        params = build_params(args)
+    except ValueError as e:
+        parser.error(str(e))
+
+    try:
+        if args.in_process:
+            raise ServerUnavailable("in process")
+        result = call(args.socket, args.method, params)
+    except ServerUnavailable:
+        try:
+            result = run_in_process(args.method, params)
+        except RPCError as e:
+            print(f"❌ {e}", file=sys.stderr)
+            return 1
+    except RPCError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+
+    print(json.dumps(result, indent=2, ensure_ascii=False))
+    if args.method == "validate":
+        return 0 if result["summary"]["failed"] == 0 else 1
+    if args.method == "regenerate":
+        return 0 if result["stats"]["errors"] == 0 else 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())